@@ -0,0 +1,155 @@
+# ================================
+# Appointment Store
+# ================================
+# All appointment reads and writes go through here. Lookups use the indexed
+# name_key column (sql/004_appointments_name_key.sql), a normalized form of
+# the name, so "View My Appointments" finds bookings regardless of case or
+# stray spaces and stays an index lookup as the table grows. Results are
+# cached per name and the entry is dropped when a booking for that name goes
+# through book(). Bookings still waiting in the write spool are merged into
+# lookups from this process, so users see their booking immediately.
+#
+# The store also owns the SlotIndex of booked teleconsult slots. It is loaded
+# from appointments dated today or later and then kept current with id > last
+# queries (throttled to one every slot_sync_interval seconds), and book()
+# refuses a slot that overlaps an existing booking before anything is written.
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from slot_index import SlotIndex
+from supabase_client import SupabaseError
+
+HIDDEN_COLUMNS = ("id", "timestamp", "idempotency_key", "name_key")
+
+
+def normalize_name(name):
+    """Same normalization as the name_key generated column."""
+    return " ".join((name or "").split()).lower()
+
+
+class AppointmentStore:
+    def __init__(self, client, writer, ttl=60.0, maxsize=1024, table="appointments",
+                 slots=None, slot_sync_interval=5.0, page_size=1000):
+        self.client = client
+        self.writer = writer
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.table = table
+        self.slots = slots if slots is not None else SlotIndex()
+        self.slot_sync_interval = slot_sync_interval
+        self.page_size = page_size
+        self._slot_lock = threading.Lock()
+        self._slots_last_id = None
+        self._slots_synced_at = 0.0
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()     # name_key -> (fetched_at, rows)
+        self._pending = {}              # name_key -> {idempotency_key: record}
+        # Falls back to exact name matching if name_key is not deployed yet
+        self._use_name_key = True
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self, name):
+        with self._lock:
+            if self._cache.pop(normalize_name(name), None) is not None:
+                self.invalidations += 1
+
+    def sync_slots(self, force=False):
+        """Pull appointments added since the last sync into the slot index."""
+        with self._slot_lock:
+            if not force and time.monotonic() - self._slots_synced_at < self.slot_sync_interval:
+                return self.slots
+            today = date.today()
+            while True:
+                params = {"select": "id,date,time,idempotency_key", "order": "id.asc",
+                          "date": f"gte.{today.isoformat()}"}
+                if self._slots_last_id is not None:
+                    params["id"] = f"gt.{self._slots_last_id}"
+                page = self.client.select(self.table, params, headers={
+                    "Range-Unit": "items",
+                    "Range": f"0-{self.page_size - 1}",
+                })
+                self.slots.add_rows(page)
+                if page:
+                    self._slots_last_id = page[-1]["id"]
+                if len(page) < self.page_size:
+                    break
+            self.slots.prune_before(today)
+            self._slots_synced_at = time.monotonic()
+            return self.slots
+
+    def book(self, record):
+        """Queue a booking through the write spool; returns its idempotency key.
+
+        Raises SlotConflict, carrying the next free slots, if the requested
+        slot overlaps an existing booking.
+        """
+        with self._slot_lock:
+            self.slots.check(record["date"], record["time"])
+            key = self.writer.submit(self.table, record)
+            self.slots.add(record["date"], record["time"], key)
+        name_key = normalize_name(record.get("name"))
+        with self._lock:
+            self._pending.setdefault(name_key, {})[key] = dict(record, idempotency_key=key)
+        self.invalidate(record.get("name"))
+        return key
+
+    def _fetch(self, name):
+        if self._use_name_key:
+            try:
+                return self.client.select(self.table, {"name_key": f"eq.{normalize_name(name)}"})
+            except SupabaseError as e:
+                # 400: column name_key does not exist
+                if e.status_code != 400:
+                    raise
+                self._use_name_key = False
+        return self.client.select(self.table, {"name": f"eq.{name.strip()}"})
+
+    def lookup(self, name):
+        """Appointments booked under name, including ones not yet replayed."""
+        name_key = normalize_name(name)
+        with self._lock:
+            entry = self._cache.get(name_key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._cache.move_to_end(name_key)
+                self.hits += 1
+                rows = entry[1]
+            else:
+                rows = None
+                self.misses += 1
+
+        if rows is None:
+            rows = self._fetch(name)
+            with self._lock:
+                self._cache[name_key] = (time.monotonic(), rows)
+                self._cache.move_to_end(name_key)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+
+        with self._lock:
+            pending = self._pending.get(name_key)
+            if pending:
+                # Bookings that have reached Supabase no longer need the overlay
+                for row in rows:
+                    pending.pop(row.get("idempotency_key"), None)
+                if not pending:
+                    del self._pending[name_key]
+                    pending = None
+            extra = list(pending.values()) if pending else []
+        return rows + extra
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cached_names": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "pending_bookings": sum(len(p) for p in self._pending.values()),
+                **{f"slot_{k}": v for k, v in self.slots.stats().items()},
+            }
@@ -0,0 +1,351 @@
+# ================================
+# Load test: concurrent sessions against local stand-ins
+# ================================
+# Usage: python benchmarks/bench_app_load.py [--sessions 1,4,16] [--journeys 5]
+#            [--supabase-latency 0.02] [--supabase-fail-rate 0.0]
+#            [--youtube-latency 0.1] [--youtube-fail-rate 0.0] [--youtube-quota N]
+#
+# Runs app.py in this process, as one Streamlit server process would, with
+# the Supabase and YouTube APIs replaced by the local stand-ins
+# (local_supabase.py, local_youtube.py) and their latency/failures injected.
+# Each simulated user is a fresh AppTest session that goes
+#
+#   intro -> assessment (random answers) -> result -> one of
+#       playlist    pick a mood, refresh the playlist
+#       teleconsult book a random half-hour slot (conflicts are expected)
+#       dashboard   staff login, records table and charts
+#
+# and N users run concurrently, one thread each, repeating the journey.
+# For every concurrency level it reports script runs per second, journeys
+# per second, per-run latency percentiles and errors; then a per-action
+# latency breakdown, memory per idle session, and the server-side hot-path
+# spans from metrics.py.
+#
+# AppTest installs a mock Runtime and st.secrets for the length of each run
+# and removes them afterwards, which breaks any other session's run in
+# progress. SessionAppTest installs them once for the whole process instead,
+# like a real server, so sessions can run concurrently.
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from datetime import date, time as time_cls, timedelta
+from unittest.mock import MagicMock
+from urllib import parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit import config  # noqa: E402
+from streamlit import logger as streamlit_logger  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.pages_manager import PagesManager  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+from streamlit.testing.v1.util import build_mock_config_get_option  # noqa: E402
+
+from local_supabase import LocalSupabase, sample_user_records  # noqa: E402
+from local_youtube import LocalYouTube  # noqa: E402
+from model_registry import rss_bytes  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+STAFF_PASSWORD = "tellmewai"
+
+ANSWERS = {
+    "Gender": ["Male", "Female"],
+    "Sleep Duration": ["less than 5 hours", "5 - 6 hours", "7 - 8 hours", "more than 8 hours"],
+    "Dietary Habits": ["unhealthy", "moderate", "healthy"],
+    "Suicidal Thoughts": ["yes", "no"],
+    "Family History of Mental Illness": ["yes", "no"],
+    "Depression": ["yes", "no"],
+}
+SLIDERS = ("Academic Pressure (1-5)", "Study Satisfaction (1-5)", "Financial Stress (1-5)")
+MOODS = ["Stress", "Sad", "Anxious", "Low Energy"]
+BRANCHES = [("playlist", 0.4), ("teleconsult", 0.3), ("dashboard", 0.3)]
+
+
+def install_shared_runtime(secrets):
+    """Process-wide mock Runtime, secrets and config, as AppTest sets per run."""
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    shared = Secrets()
+    shared._secrets = dict(secrets)
+    st.secrets = shared
+    # Quiet, or every cached getter called between runs warns about a
+    # missing ScriptRunContext
+    config.get_option = build_mock_config_get_option({"global.appTest": True, "logger.level": "error"})
+    streamlit_logger.set_log_level("error")
+
+
+# One compiled app.py for every session, as the server keeps it. Compiling
+# it from several threads at once also trips a CPython 3.11 AST bug
+# ("SystemError: AST constructor recursion depth mismatch").
+SCRIPT_CACHE = ScriptCache()
+
+
+class SessionAppTest(AppTest):
+    """AppTest whose runs may overlap with other sessions' runs in this process."""
+
+    def _run(self, widget_state=None, timeout=None):
+        pages_manager = PagesManager(self._script_path, SCRIPT_CACHE, setup_watcher=False)
+        runner = LocalScriptRunner(self._script_path, self.session_state, pages_manager,
+                                   args=self.args, kwargs=self.kwargs)
+        self._tree = runner.run(widget_state, self.query_params,
+                                timeout or self.default_timeout, self._page_hash)
+        self._tree._runner = self
+        self.query_params = parse.parse_qs(runner.event_data[-1]["client_state"].query_string)
+        return self
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Results:
+    def __init__(self):
+        self.timings = []           # (action, seconds)
+        self.exceptions = []
+        self.error_messages = 0
+        self.journeys = 0
+        self.outcomes = {}
+        self._lock = threading.Lock()
+
+    def record(self, action, seconds, at):
+        with self._lock:
+            self.timings.append((action, seconds))
+            if at.exception:
+                self.exceptions.append(f"{action}: {at.exception[0].value}")
+            # The high-risk result is itself drawn with st.error
+            self.error_messages += sum(1 for e in at.error if not e.value.startswith("🔴"))
+
+    def outcome(self, name):
+        with self._lock:
+            self.outcomes[name] = self.outcomes.get(name, 0) + 1
+
+
+class Session:
+    def __init__(self, results, rng, timeout=60):
+        self.at = SessionAppTest(APP_PATH, default_timeout=timeout)
+        self.results = results
+        self.rng = rng
+
+    def run(self, action):
+        start = time.perf_counter()
+        self.at.run()
+        self.results.record(action, time.perf_counter() - start, self.at)
+
+    def widget(self, kind, label):
+        for w in getattr(self.at, kind):
+            if w.label == label:
+                return w
+        raise LookupError(f"no {kind} {label!r}")
+
+    def click(self, label, action, follow=True):
+        # Buttons change session state during the run, so the new page is
+        # only drawn by the next run, exactly as in the browser
+        self.widget("button", label).click()
+        self.run(action)
+        if follow:
+            self.run(action + " (rerun)")
+
+    def to_result(self):
+        self.run("open")
+        self.click("Start", "start")
+        for label, options in ANSWERS.items():
+            self.widget("selectbox", label).set_value(self.rng.choice(options))
+        for label in SLIDERS:
+            self.widget("slider", label).set_value(self.rng.randint(1, 5))
+        self.widget("number_input", "Age").set_value(self.rng.randint(17, 35))
+        self.widget("number_input", "Study Hours per Day").set_value(self.rng.randint(0, 12))
+        self.click("Submit", "submit")
+
+    def playlist(self):
+        self.click("🎵 Music Therapy", "music")
+        self.widget("selectbox", "💙 How are you feeling?").set_value(self.rng.choice(MOODS))
+        self.run("choose mood")
+        self.click("🔄 Refresh Playlist", "refresh playlist", follow=False)
+        self.results.outcome("videos shown" if self.at.get("video") else "no video")
+        self.click("🏠 Back to Main Page", "main page")
+
+    def teleconsult(self, user):
+        self.click("📅 Teleconsultant", "teleconsult")
+        self.widget("text_input", "Your Name").set_value(f"user {user}")
+        self.widget("text_input", "Email Address").set_value(f"user{user}@example.com")
+        self.widget("date_input", "Preferred Date").set_value(date.today() + timedelta(days=self.rng.randint(1, 14)))
+        minutes = 9 * 60 + 30 * self.rng.randrange(16)
+        self.widget("time_input", "Preferred Time").set_value(time_cls(minutes // 60, minutes % 60))
+        self.run("fill booking")
+        self.click("Book Appointment", "book", follow=False)
+        self.results.outcome("booked" if self.at.success else "slot taken" if self.at.error else "not booked")
+        self.click("🏠 Back to Main Page", "main page")
+
+    def dashboard(self):
+        self.click("⬅ Back to Main Page", "main page")
+        self.click("📊 Staff Dashboard", "dashboard")
+        self.widget("text_input", "Enter Staff Password:").set_value(STAFF_PASSWORD)
+        self.click("Login", "login")
+        self.widget("number_input", "Page").set_value(2)
+        self.run("dashboard page 2")
+        self.click("⬅ Logout", "logout")
+
+    def journey(self, user):
+        self.to_result()
+        branch = self.rng.choices([b for b, _ in BRANCHES], [w for _, w in BRANCHES])[0]
+        if branch == "playlist":
+            self.playlist()
+        elif branch == "teleconsult":
+            self.teleconsult(user)
+        else:
+            self.dashboard()
+        with self.results._lock:
+            self.results.journeys += 1
+
+
+def run_level(n_sessions, journeys, seed):
+    results = Results()
+
+    def user(k):
+        rng = random.Random(seed * 1000 + k)
+        for j in range(journeys):
+            try:
+                Session(results, rng).journey(f"{n_sessions}-{k}-{j}")
+            except Exception as e:
+                with results._lock:
+                    results.exceptions.append(f"journey: {e!r}")
+
+    threads = [threading.Thread(target=user, args=(k,)) for k in range(n_sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+
+def session_memory(n, seed):
+    """Python heap held per idle session left on the result page."""
+    rng = random.Random(seed)
+    results = Results()
+    sessions = []
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(n):
+        session = Session(results, rng)
+        session.to_result()
+        sessions.append(session)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py")
+    parser.add_argument("--sessions", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--journeys", type=int, default=5, help="journeys per session and level")
+    parser.add_argument("--supabase-latency", type=float, default=0.02)
+    parser.add_argument("--supabase-fail-rate", type=float, default=0.0)
+    parser.add_argument("--youtube-latency", type=float, default=0.1)
+    parser.add_argument("--youtube-fail-rate", type=float, default=0.0)
+    parser.add_argument("--youtube-quota", type=int, default=None)
+    parser.add_argument("--seed-records", type=int, default=2000, help="user_records rows to start with")
+    parser.add_argument("--idle-sessions", type=int, default=50, help="sessions for the memory estimate")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",")]
+
+    warnings.filterwarnings("ignore")
+
+    supabase = LocalSupabase(latency=args.supabase_latency, fail_rate=args.supabase_fail_rate,
+                             seed=args.seed).start()
+    youtube = LocalYouTube(latency=args.youtube_latency, fail_rate=args.youtube_fail_rate,
+                           quota=args.youtube_quota, seed=args.seed).start()
+    supabase.insert("user_records", sample_user_records(args.seed_records, args.seed))
+
+    work = tempfile.mkdtemp()
+    install_shared_runtime({
+        "SUPABASE_URL": supabase.url,
+        "SUPABASE_KEY": "local",
+        "YOUTUBE_API_KEY": "local",
+        "YOUTUBE_SEARCH_URL": youtube.url,
+        "SPOOL_PATH": os.path.join(work, "spool.db"),
+        "RECORDS_CACHE_DIR": os.path.join(work, "cache"),
+        "METRICS_PORT": 0,
+    })
+    rss_start = rss_bytes()
+
+    # One journey down every branch first, so model load, client set-up and
+    # first-view imports are not charged to the first level
+    warm = Results()
+    for branch in ("playlist", "teleconsult", "dashboard"):
+        session = Session(warm, random.Random(0))
+        session.to_result()
+        getattr(session, branch)(*(("warmup",) if branch == "teleconsult" else ()))
+    if warm.exceptions:
+        print("warm-up failed:", *warm.exceptions[:5], sep="\n  ")
+        sys.exit(1)
+
+    print(f"stand-ins: Supabase +{args.supabase_latency * 1000:.0f}ms "
+          f"(fail {args.supabase_fail_rate:.0%}), YouTube +{args.youtube_latency * 1000:.0f}ms "
+          f"(fail {args.youtube_fail_rate:.0%}); {args.journeys} journeys per session")
+    print(f"{'sessions':>8} {'runs':>6} {'runs/s':>8} {'journeys/s':>10} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'max':>8} {'exceptions':>10} {'st.error':>8}")
+    last = None
+    for n in levels:
+        results, elapsed = run_level(n, args.journeys, args.seed + n)
+        seconds = [s for _, s in results.timings]
+        print(f"{n:>8} {len(seconds):>6} {len(seconds) / elapsed:>8.1f} {results.journeys / elapsed:>10.2f} "
+              + " ".join(f"{percentile(seconds, q) * 1000:>6.0f}ms" for q in (0.5, 0.95, 0.99, 1.0))
+              + f" {len(results.exceptions):>10} {results.error_messages:>8}")
+        for message in results.exceptions[:3]:
+            print(f"         {message}")
+        last = (n, results)
+
+    n, results = last
+    print(f"\nper action at {n} sessions (ms):")
+    actions = {}
+    for action, seconds in results.timings:
+        actions.setdefault(action, []).append(seconds)
+    for action, seconds in sorted(actions.items(), key=lambda kv: -percentile(kv[1], 0.95)):
+        print(f"  {action:<26} n={len(seconds):<5} p50 {percentile(seconds, 0.5) * 1000:7.1f} "
+              f"p95 {percentile(seconds, 0.95) * 1000:7.1f}  max {max(seconds) * 1000:7.1f}")
+    print("  outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(results.outcomes.items())))
+
+    per_session = session_memory(args.idle_sessions, args.seed)
+    rss_end = rss_bytes()
+    print(f"\nmemory: {per_session / 1024:.0f} KiB of Python heap per idle session "
+          f"({args.idle_sessions} sessions)", end="")
+    if rss_start is not None and rss_end is not None:
+        print(f"; process RSS {rss_start / 2**20:.0f} -> {rss_end / 2**20:.0f} MiB", end="")
+    print()
+    print(f"stand-in requests: Supabase {supabase.request_count}, YouTube {youtube.request_count}")
+
+    from resources import get_metrics
+    spans = sorted(get_metrics().summary(), key=lambda s: -s["mean"] * s["count"])
+    print("\nserver-side spans by total time:")
+    for s in spans[:12]:
+        labels = "".join(f" {k}={v}" for k, v in s["labels"].items())
+        print(f"  {s['span'] + labels:<40} n={s['count']:<6} mean {s['mean'] * 1000:7.2f}ms "
+              f"p99 <= {s['p99'] * 1000:g}ms errors {s['errors']}")
+
+
+if __name__ == "__main__":
+    main()
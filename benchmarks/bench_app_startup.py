@@ -0,0 +1,156 @@
+# ================================
+# Benchmark: app cold start and per-page reruns
+# ================================
+# Usage: python benchmarks/bench_app_startup.py [baseline git ref] [reruns]
+#
+# Runs app.py under Streamlit's AppTest in a fresh interpreter, against the
+# local Supabase and YouTube stand-ins (seeded with user_records),
+# and reports:
+#   cold start  first run of the intro page, after importing streamlit
+#   first view  first run of each page (includes its imports)
+#   rerun       median of repeated reruns of each page
+# plus which heavy libraries are loaded after the intro page. With a git ref
+# (e.g. HEAD~1) the same measurements are made on that revision, extracted
+# to a temporary directory, and shown side by side.
+#
+# AppTest compiles app.py again on every run, while `streamlit run` compiles
+# it once per edit; that compile time is reported on its own line and taken
+# out of the rerun figures, so they show what a server rerun costs.
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pandas", "plotly.express", "requests", "pytz", "joblib", "sklearn", "pyarrow")
+
+# (page, session state to set before running it)
+PAGES = [
+    ("intro", {"step": "intro", "solution": None}),
+    ("predictor", {"step": "predictor", "solution": None}),
+    ("result", {"step": "result", "solution": None, "risk": "High"}),
+    ("chatbot", {"step": "result", "solution": "chatbot"}),
+    ("playlist", {"step": "result", "solution": "playlist"}),
+    ("teleconsult", {"step": "result", "solution": "teleconsult"}),
+    ("appointments", {"step": "appointments", "solution": None}),
+    ("dashboard", {"step": "dashboard", "solution": None, "dashboard_logged_in": True}),
+]
+
+
+def child(tree, supabase_url, youtube_url, reruns):
+    """Measure one tree; runs in its own interpreter and prints JSON."""
+    os.chdir(tree)
+    sys.path.insert(0, tree)
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_import = time.perf_counter() - start
+
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    compiles = []
+    for _ in range(5):
+        start = time.perf_counter()
+        ScriptCache().get_bytecode(os.path.join(tree, "app.py"))
+        compiles.append(time.perf_counter() - start)
+    compile_seconds = sorted(compiles)[len(compiles) // 2]
+
+    work = tempfile.mkdtemp()
+    at = AppTest.from_file(os.path.join(tree, "app.py"), default_timeout=120)
+    at.secrets["SUPABASE_URL"] = supabase_url
+    at.secrets["SUPABASE_KEY"] = "local"
+    at.secrets["YOUTUBE_API_KEY"] = "local"
+    at.secrets["YOUTUBE_SEARCH_URL"] = youtube_url
+    at.secrets["SPOOL_PATH"] = os.path.join(work, "spool.db")
+    at.secrets["RECORDS_CACHE_DIR"] = os.path.join(work, "cache")
+
+    start = time.perf_counter()
+    at.run()
+    cold_start = time.perf_counter() - start
+    loaded_at_start = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    pages = {}
+    for name, state in PAGES:
+        for key, value in state.items():
+            at.session_state[key] = value
+        start = time.perf_counter()
+        at.run()
+        first = time.perf_counter() - start
+        if at.exception:
+            raise SystemExit(f"{name}: {at.exception}")
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        pages[name] = {"first": first, "rerun": max(timings[len(timings) // 2] - compile_seconds, 0.0)}
+
+    print(json.dumps({
+        "streamlit_import": streamlit_import,
+        "compile": compile_seconds,
+        "cold_start": cold_start,
+        "loaded_at_start": loaded_at_start,
+        "loaded_at_end": [m for m in HEAVY_MODULES if m in sys.modules],
+        "pages": pages,
+    }))
+
+
+def measure(tree, supabase_url, youtube_url, reruns):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", tree, supabase_url, youtube_url, str(reruns)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def extract(ref, dest):
+    archive = subprocess.run(["git", "-C", ROOT, "archive", ref], capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", dest], input=archive, check=True)
+    return dest
+
+
+def main():
+    baseline = sys.argv[1] if len(sys.argv) > 1 else None
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    sys.path.insert(0, ROOT)
+    from local_supabase import LocalSupabase, sample_user_records
+    from local_youtube import LocalYouTube
+
+    supabase = LocalSupabase().start()
+    supabase.insert("user_records", sample_user_records(2000))
+    youtube = LocalYouTube().start()
+    youtube_url = youtube.url
+
+    runs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if baseline:
+            runs[baseline] = measure(extract(baseline, tmp), supabase.url, youtube_url, reruns)
+        runs["working tree"] = measure(ROOT, supabase.url, youtube_url, reruns)
+
+    names = list(runs)
+    print(f"{'':<24}" + "".join(f"{n:>16}" for n in names))
+    print(f"{'import streamlit':<24}" + "".join(f"{runs[n]['streamlit_import'] * 1000:14.0f}ms" for n in names))
+    print(f"{'compile app.py':<24}" + "".join(f"{runs[n]['compile'] * 1000:14.1f}ms" for n in names))
+    print(f"{'cold start (intro)':<24}" + "".join(f"{runs[n]['cold_start'] * 1000:14.0f}ms" for n in names))
+    for page, _ in PAGES:
+        print(f"{page + ' first view':<24}" + "".join(f"{runs[n]['pages'][page]['first'] * 1000:14.1f}ms" for n in names))
+        print(f"{page + ' rerun':<24}" + "".join(f"{runs[n]['pages'][page]['rerun'] * 1000:14.1f}ms" for n in names))
+    for n in names:
+        print(f"{n}: heavy modules after intro: {', '.join(runs[n]['loaded_at_start']) or 'none'}; "
+              f"after all pages: {', '.join(runs[n]['loaded_at_end'])}")
+    supabase.stop()
+    youtube.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,130 @@
+# ================================
+# Benchmark: out-of-core batch scoring
+# ================================
+# Usage: python benchmarks/bench_batch_scoring.py [n_rows] [workers]
+#
+# Writes n synthetic user_records rows (default 1M, with a few unusable
+# answers mixed in) as CSV and Parquet, scores both with score_batch, checks
+# a sample against the predictor page's single-row path (encode_row + flat
+# engine) and reports rows/s and peak RSS. Then publishes the bundled model
+# as a version and checks that score_batch picks it up from the manifest
+# and records it in model_version. Finally scores a small file in small
+# chunks whose first chunk is all unscorable, with no ids or timestamps,
+# and whose last one uses legacy 0/1 answer codes.
+
+import os
+import resource
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import joblib  # noqa: E402
+
+from feature_encoding import RECORD_FEATURES, FeatureEncoder, encoder_path  # noqa: E402
+from forest_artifact import forest_path, load_forest  # noqa: E402
+from model_deploy import publish  # noqa: E402
+from risk_labels import RISK_LABELS  # noqa: E402
+from score_batch import score_file  # noqa: E402
+
+MODEL_PATH = os.path.join(ROOT, "suicide_risk_model.pkl")
+
+
+def synthetic_records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    yes_no = np.array(["yes", "no"], dtype=object)
+    df = pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "gender": rng.choice(np.array(["Male", "Female"], dtype=object), n),
+        "age": rng.integers(17, 40, n),
+        "academic_pressure": rng.integers(1, 6, n),
+        "study_satisfaction": rng.integers(1, 6, n),
+        "sleep_duration": rng.choice(np.array(["less than 5 hours", "5 - 6 hours", "7 - 8 hours",
+                                               "more than 8 hours"], dtype=object), n),
+        "dietary_habits": rng.choice(np.array(["unhealthy", "moderate", "healthy"], dtype=object), n),
+        "suicidal_thoughts": rng.choice(yes_no, n),
+        "study_hours": rng.integers(0, 13, n),
+        "financial_stress": rng.integers(1, 6, n),
+        "family_history": rng.choice(yes_no, n),
+        "depression": rng.choice(yes_no, n),
+        "timestamp": "2025-09-20T10:00:00",
+    })
+    df.loc[::5000, "sleep_duration"] = "unknown"
+    return df
+
+
+def check_edge_chunks(tmp, models_dir):
+    df = synthetic_records(300).astype({"id": "float64", "timestamp": object})
+    df.loc[:99, "sleep_duration"] = "unknown"
+    df.loc[:99, ["id", "timestamp"]] = np.nan
+    df.loc[200:, "gender"] = np.where(df.loc[200:, "gender"] == "Male", "0", "1")
+    df.loc[200:, "depression"] = np.where(df.loc[200:, "depression"] == "yes", "1", "0")
+    path = os.path.join(tmp, "edge.csv")
+    out = os.path.join(tmp, "scored-edge.parquet")
+    df.to_csv(path, index=False)
+    rows, unscored, _ = score_file(path, out, MODEL_PATH, 1, chunk_size=100, log=lambda msg: None,
+                                   models_dir=models_dir)
+    if unscored != 100:
+        sys.exit(f"edge chunks: {unscored} unscorable rows, expected the 100 unknown answers")
+    types = {field.name: str(field.type) for field in pq.read_schema(out)}
+    print(f"edge    : {rows} rows in chunks of 100, {unscored} unscorable; "
+          f"id {types['id']}, timestamp {types['timestamp']}, predicted_risk {types['predicted_risk']}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = os.path.join(tmp, "models")
+        df = synthetic_records(n)
+        csv_path = os.path.join(tmp, "records.csv")
+        parquet_path = os.path.join(tmp, "records.parquet")
+        df.to_csv(csv_path, index=False)
+        df.to_parquet(parquet_path, index=False)
+
+        for name, path in (("csv", csv_path), ("parquet", parquet_path)):
+            out = os.path.join(tmp, f"scored-{name}.parquet")
+            rows, unscored, elapsed = score_file(path, out, MODEL_PATH, workers, log=lambda msg: None,
+                                                 models_dir=models_dir)
+            print(f"{name:<8}: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s, "
+                  f"{workers} worker(s)), {unscored:,} unscorable")
+
+        scored = pq.read_table(out).to_pandas()
+        encoder = FeatureEncoder.load(encoder_path(MODEL_PATH))
+        engine = load_forest(forest_path(MODEL_PATH))
+        sample = df.sample(2000, random_state=1).rename(columns=RECORD_FEATURES)
+        mismatches = 0
+        for i, row in sample.iterrows():
+            expected = None
+            if row["Sleep_Duration"] != "unknown":
+                expected = RISK_LABELS[int(engine.predict(encoder.encode_row(row)[None, :])[0])]
+            mismatches += scored.at[i, "predicted_risk"] != expected
+        print(f"check   : {mismatches} mismatches against the single-row path (2000 sampled rows)")
+        versions = set(scored["model_version"])
+        if versions != {f"{os.path.basename(forest_path(MODEL_PATH))}@{os.stat(forest_path(MODEL_PATH)).st_mtime_ns}"}:
+            sys.exit(f"unversioned model recorded as {versions}")
+
+        # Published: scored by the manifest's current version
+        version = publish(joblib.load(MODEL_PATH), encoder, models_dir)
+        sample_path = os.path.join(tmp, "sample.parquet")
+        df.iloc[:20_000].to_parquet(sample_path, index=False)
+        published_out = os.path.join(tmp, "scored-published.parquet")
+        score_file(sample_path, published_out, MODEL_PATH, workers, log=lambda msg: None, models_dir=models_dir)
+        published = pq.read_table(published_out).to_pandas()
+        if set(published["model_version"]) != {version}:
+            sys.exit(f"published model recorded as {set(published['model_version'])}, not {version}")
+        if not published["predicted_risk"].equals(scored["predicted_risk"].iloc[:20_000]):
+            sys.exit("the published version scores differently from the model file")
+        print(f"publish : 20,000 rows scored by published version {version}, same risk levels")
+        check_edge_chunks(tmp, os.path.join(tmp, "no-models"))
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"memory  : parent peak RSS {peak:.0f} MiB (includes the {n:,}-row synthetic frame)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# ================================
+# Benchmark: typed dataset ingestion and Parquet snapshot
+# ================================
+# Usage: python benchmarks/bench_dataset_ingestion.py [rows]
+#
+# On the bundled dataset, checks that student_dataset.load_dataset() gives
+# the labels the app uses, the encoder codes the shipped model was trained
+# with and the same encoded features as the raw CSV, and reports how many
+# risk labels the normalized sleep labels change. Then writes a synthetic
+# survey CSV (default 1M rows, mixed label spellings) and compares the old
+# pd.read_csv load with the typed parse and with the Parquet snapshot:
+# load time and in-memory size. Also checks that two CSVs with the same
+# name in different directories keep separate snapshots.
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_encoding import CATEGORICAL, FeatureEncoder  # noqa: E402
+from risk_labels import assign_risk, risk_levels  # noqa: E402
+from student_dataset import load_dataset, read_dataset, snapshot_path  # noqa: E402
+
+DATASET = os.path.join(ROOT, "Depression Student Dataset.csv")
+ENCODER = os.path.join(ROOT, "suicide_risk_model.encoder.json")
+
+YES_NO = np.array(["Yes", "No", "yes", "no"], dtype=object)
+SLEEP = np.array(["Less than 5 hours", "5-6 hours", "7-8 hours", "More than 8 hours",
+                  "less than 5 hours", "5 - 6 hours"], dtype=object)
+DIET = np.array(["Healthy", "Moderate", "Unhealthy"], dtype=object)
+
+
+def synthetic(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Gender": rng.choice(np.array(["Male", "Female"], dtype=object), n),
+        "Age": rng.integers(18, 35, n),
+        "Academic_Pressure": rng.integers(1, 6, n),
+        "Study_Satisfaction": rng.integers(1, 6, n),
+        "Sleep_Duration": rng.choice(SLEEP, n),
+        "Dietary_Habits": rng.choice(DIET, n),
+        "Suicidal_Thoughts": rng.choice(YES_NO, n),
+        "Study_Hours": rng.integers(0, 13, n),
+        "Financial_Stress": rng.integers(1, 6, n),
+        "Family_History_of_Mental_Illness": rng.choice(YES_NO, n),
+        "Depression": rng.choice(YES_NO, n),
+    })
+
+
+def timed(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def size(df):
+    return df.memory_usage(deep=True).sum()
+
+
+def check_bundled(snapshot_dir):
+    raw = pd.read_csv(DATASET)
+    df = load_dataset(DATASET, snapshot_dir)
+    with open(ENCODER, encoding="utf-8") as f:
+        shipped = json.load(f)["codes"]
+
+    for col in CATEGORICAL:
+        unknown = set(df[col].cat.categories) - set(shipped[col])
+        if unknown:
+            sys.exit(f"{col}: labels {sorted(unknown)} are not the app's")
+    if FeatureEncoder.fit(df).codes != shipped:
+        sys.exit("encoder fitted on the typed dataset differs from the shipped one")
+    encoder = FeatureEncoder(shipped)
+    if not np.array_equal(encoder.transform(raw).to_numpy(np.float64), encoder.transform(df).to_numpy(np.float64)):
+        sys.exit("typed dataset encodes differently from the raw CSV")
+    if not (risk_levels(df) == df.apply(assign_risk, axis=1)).all():
+        sys.exit("risk_levels() disagrees with assign_risk() on the typed dataset")
+
+    before, after = risk_levels(raw), risk_levels(df)
+    changed = pd.crosstab(before[before != after], after[before != after])
+    print(f"bundled dataset: {len(df)} rows, {size(raw) / 1024:.0f} KiB -> {size(df) / 1024:.1f} KiB in memory; "
+          f"labels, encoder codes and features match the app")
+    print(f"risk labels changed by the normalized sleep labels: {int((before != after).sum())} "
+          f"(rows: old label, columns: new)")
+    print(changed.to_string())
+
+
+def check_same_name(tmp, snapshot_dir):
+    paths = []
+    for i, folder in enumerate(("2024", "2025")):
+        os.makedirs(os.path.join(tmp, folder))
+        paths.append(os.path.join(tmp, folder, "survey.csv"))
+        synthetic(1000, seed=i).to_csv(paths[-1], index=False)
+    first = [load_dataset(path, snapshot_dir) for path in paths]
+    again = [load_dataset(path, snapshot_dir) for path in paths]
+    for path, df, cached in zip(paths, first, again):
+        if not os.path.exists(snapshot_path(path, snapshot_dir)):
+            sys.exit(f"snapshot of {path} was removed by the other survey.csv")
+        pd.testing.assert_frame_equal(df, cached)
+    print("same file name in two directories: two snapshots, each loads its own rows")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_dir = os.path.join(tmp, "snapshots")
+        check_bundled(snapshot_dir)
+        check_same_name(tmp, snapshot_dir)
+
+        path = os.path.join(tmp, "survey.csv")
+        synthetic(n).to_csv(path, index=False)
+        print(f"\nsynthetic survey: {n:,} rows, {os.path.getsize(path) / 2**20:.1f} MiB CSV")
+
+        old, old_seconds = timed(lambda: pd.read_csv(path))
+        new, new_seconds = timed(lambda: read_dataset(path))
+        start = time.perf_counter()
+        load_dataset(path, snapshot_dir)
+        first_seconds = time.perf_counter() - start
+        cached, cached_seconds = timed(lambda: load_dataset(path, snapshot_dir))
+        pd.testing.assert_frame_equal(new, cached)
+
+        print(f"{'load':<28} {'seconds':>8} {'memory':>10}")
+        print(f"{'pd.read_csv (object)':<28} {old_seconds:8.3f} {size(old) / 2**20:8.1f} MiB")
+        print(f"{'typed parse + normalize':<28} {new_seconds:8.3f} {size(new) / 2**20:8.1f} MiB")
+        print(f"{'first load (+ snapshot)':<28} {first_seconds:8.3f}")
+        print(f"{'Parquet snapshot':<28} {cached_seconds:8.3f} {size(cached) / 2**20:8.1f} MiB")
+        print(f"memory {size(old) / size(new):.0f}x smaller, snapshot load "
+              f"{old_seconds / cached_seconds:.1f}x faster than pd.read_csv")
+
+
+if __name__ == "__main__":
+    main()
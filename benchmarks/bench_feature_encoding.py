@@ -0,0 +1,86 @@
+# ================================
+# Benchmark: form answers -> model input
+# ================================
+# Usage: python benchmarks/bench_feature_encoding.py
+#
+# Checks that FeatureEncoder.encode_row() on the app's form labels gives the
+# same codes as training (FeatureEncoder.transform on the dataset), then
+# times the old per-rerun path (encode dict + one-row DataFrame + predict)
+# against encode_row into a preallocated row + predict.
+
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_encoding import FeatureEncoder, encoder_path  # noqa: E402
+from forest_engine import ForestEngine  # noqa: E402
+
+MODEL_PATH = os.path.join(ROOT, "suicide_risk_model.pkl")
+
+# The app's form labels
+ANSWERS = {
+    "Gender": "Male", "Age": 20, "Academic_Pressure": 4, "Study_Satisfaction": 2,
+    "Sleep_Duration": "less than 5 hours", "Dietary_Habits": "unhealthy",
+    "Suicidal_Thoughts": "yes", "Study_Hours": 8, "Financial_Stress": 4,
+    "Family_History_of_Mental_Illness": "no", "Depression": "yes",
+}
+
+OLD_ENCODE_DICT = {
+    "Gender": {"Male": 1, "Female": 0},
+    "Sleep_Duration": {"less than 5 hours": 0, "5 - 6 hours": 1, "7 - 8 hours": 2, "more than 8 hours": 3},
+    "Dietary_Habits": {"unhealthy": 0, "moderate": 1, "healthy": 2},
+    "Suicidal_Thoughts": {"no": 0, "yes": 1},
+    "Family_History_of_Mental_Illness": {"no": 0, "yes": 1},
+    "Depression": {"no": 0, "yes": 1},
+}
+
+
+def timed(fn, n=2000):
+    t = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t) / n
+
+
+def main():
+    encoder = FeatureEncoder.load(encoder_path(MODEL_PATH))
+    df = pd.read_csv(os.path.join(ROOT, "Depression Student Dataset.csv"))
+    trained = encoder.transform(df).to_numpy()
+    served = np.stack([encoder.encode_row(row) for row in df.to_dict("records")])
+    print(f"check   : served codes match training codes on {len(df)} rows: {(trained == served).all()}")
+
+    stale = [col for col, codes in OLD_ENCODE_DICT.items()
+             if any(encoder.code(col, label) != code for label, code in codes.items())]
+    print(f"check   : columns the old hand-written encode_dict got wrong: {stale}")
+    for col in stale:
+        print(f"          {col}: old {OLD_ENCODE_DICT[col]}, "
+              f"trained {{{', '.join(f'{k!r}: {encoder.code(col, k)}' for k in OLD_ENCODE_DICT[col])}}}")
+
+    model = joblib.load(MODEL_PATH)
+    engine = ForestEngine.from_sklearn(model)
+
+    def old_path():
+        row = {col: OLD_ENCODE_DICT[col][v] if col in OLD_ENCODE_DICT else v for col, v in ANSWERS.items()}
+        return engine.predict(pd.DataFrame([row]))
+
+    row = encoder.new_batch(1)
+
+    def new_path():
+        encoder.encode_row(ANSWERS, out=row[0])
+        return engine.predict(row)
+
+    old, new = timed(old_path), timed(new_path)
+    print(f"encode  : DataFrame path {old * 1e6:.0f} us, encode_row path {new * 1e6:.0f} us "
+          f"({old / new:.1f}x)")
+    print(f"encode  : encode_row alone {timed(lambda: encoder.encode_row(ANSWERS, out=row[0]), 20000) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# ================================
+# Benchmark: ForestEngine vs model.predict
+# ================================
+# Usage: python benchmarks/bench_forest_engine.py [path/to/model.pkl]
+#
+# Checks that the compiled engine reproduces model.predict and
+# model.predict_proba exactly, then times both at batch sizes 1, 100 and 100k.
+
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from forest_engine import ForestEngine  # noqa: E402
+
+BATCH_SIZES = [1, 100, 100_000]
+
+# Encoded value ranges of each form input, in model column order
+FEATURE_RANGES = {
+    "Gender": (0, 1),
+    "Age": (10, 100),
+    "Academic_Pressure": (1, 5),
+    "Study_Satisfaction": (1, 5),
+    "Sleep_Duration": (0, 3),
+    "Dietary_Habits": (0, 2),
+    "Suicidal_Thoughts": (0, 1),
+    "Study_Hours": (0, 24),
+    "Financial_Stress": (1, 5),
+    "Family_History_of_Mental_Illness": (0, 1),
+    "Depression": (0, 1),
+}
+
+
+def random_inputs(n, rng):
+    return pd.DataFrame({
+        col: rng.integers(low, high + 1, size=n)
+        for col, (low, high) in FEATURE_RANGES.items()
+    })
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    model_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "suicide_risk_model.pkl")
+    model = joblib.load(model_path)
+
+    start = time.perf_counter()
+    engine = ForestEngine.from_sklearn(model)
+    compile_seconds = time.perf_counter() - start
+    print(f"Compiled {engine.n_trees} trees, {engine.feature.size} nodes, "
+          f"max depth {engine.max_depth} in {compile_seconds * 1000:.1f} ms")
+
+    rng = np.random.default_rng(42)
+    print(f"{'batch':>8} {'sklearn':>12} {'engine':>12} {'speedup':>8}  identical")
+    for n in BATCH_SIZES:
+        X = random_inputs(n, rng)
+        identical = (
+            np.array_equal(model.predict(X), engine.predict(X))
+            and np.array_equal(model.predict_proba(X), engine.predict_proba(X))
+        )
+        repeats = 20 if n <= 100 else 3
+        t_sklearn = best_of(lambda: model.predict(X), repeats)
+        t_engine = best_of(lambda: engine.predict(X), repeats)
+        print(f"{n:>8} {t_sklearn * 1000:>10.3f}ms {t_engine * 1000:>10.3f}ms "
+              f"{t_sklearn / t_engine:>7.1f}x  {identical}")
+        if not identical:
+            sys.exit(f"Engine output differs from sklearn at batch size {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# ================================
+# Benchmark: cost of the hot-path metrics
+# ================================
+# Usage: python benchmarks/bench_metrics.py [iterations]
+#
+# Measures what the instrumentation adds to a rerun: the cost of one span
+# (alone, and around a single-row predict on the bundled flat forest), of a
+# counter increment, and of spans recorded from several threads at once.
+# Then renders the Prometheus text for a realistic number of series, checks
+# every sample line parses, and times a scrape.
+
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from forest_artifact import load_forest  # noqa: E402
+from metrics import Metrics  # noqa: E402
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? '
+                         r'(-?[0-9.e+-]+|\+Inf|NaN)$')
+
+
+def per_call(fn, n, repeats=5):
+    """Best of repeats, per call."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(n // repeats):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / (n // repeats)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    metrics = Metrics()
+
+    def bare():
+        pass
+
+    def spanned():
+        with metrics.span("noop"):
+            pass
+
+    def labelled():
+        with metrics.span("page", page="dashboard"):
+            pass
+
+    base = per_call(bare, n)
+    print(f"span        : {(per_call(spanned, n) - base) * 1e9:6.0f} ns, "
+          f"with a label {(per_call(labelled, n) - base) * 1e9:6.0f} ns")
+    print(f"counter inc : {per_call(lambda: metrics.inc('assessments', risk='High'), n) * 1e9:6.0f} ns")
+
+    engine = load_forest(os.path.join(ROOT, "suicide_risk_model.forest"))
+    row = np.zeros((1, engine.n_features), dtype=np.float32)
+    m = min(n, 20_000)
+
+    def predict():
+        engine.predict(row)
+
+    def predict_spanned():
+        with metrics.span("predict"):
+            engine.predict(row)
+
+    # Interleaved, so clock-speed drift hits both equally
+    plain = timed = float("inf")
+    for _ in range(10):
+        plain = min(plain, per_call(predict, m // 10, repeats=1))
+        timed = min(timed, per_call(predict_spanned, m // 10, repeats=1))
+    print(f"predict     : {plain * 1e6:6.1f} us, with span {timed * 1e6:6.1f} us "
+          f"({(timed - plain) * 1e6:+.1f} us)")
+
+    threads = 8
+    per_thread = n // threads
+
+    def worker():
+        for _ in range(per_thread):
+            with metrics.span("contended"):
+                pass
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(f"contended   : {threads} threads, {elapsed / (per_thread * threads) * 1e9:6.0f} ns per span")
+
+    # About as many series as a busy app process exports
+    for page in ("intro", "predictor", "result", "chatbot", "playlist", "teleconsult", "appointments", "dashboard"):
+        metrics.observe("page", 0.01, page=page)
+    for endpoint in ("GET user_records", "POST user_records", "GET appointments", "POST appointments",
+                     "POST rpc/dashboard_counts"):
+        metrics.observe("supabase", 0.05, error=True, endpoint=endpoint)
+    metrics.add_collector("cache", lambda: {"hits": 10, "misses": 2, "size": 12, "last_error": None},
+                          counters=("hits", "misses"))
+
+    text = metrics.render()
+    lines = [line for line in text.splitlines() if line and not line.startswith("#")]
+    bad = [line for line in lines if not SAMPLE_LINE.match(line)]
+    print(f"render      : {len(lines)} samples, {len(text) / 1024:.1f} KiB, "
+          f"{per_call(metrics.render, 2000) * 1e6:.0f} us per scrape, {len(bad)} malformed")
+    if bad:
+        print("\n".join(bad[:5]))
+        sys.exit(1)
+    count = int(re.search(r'tellmewai_span_seconds_count\{span="contended"\} (\d+)', text).group(1))
+    if count != per_thread * threads:
+        print(f"lost observations: {count} of {per_thread * threads}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ================================
+# Benchmark: pickle vs memory-mapped flat forest
+# ================================
+# Usage: python benchmarks/bench_model_artifact.py [n_processes]
+#
+# Exports the bundled model as a flat .forest artifact (to a temp dir) and
+# checks its predictions against the pickle. Then, for each format, starts
+# n_processes fresh interpreters that load the model and predict, and
+# reports artifact size, cold-load time and memory: RSS growth per process
+# and PSS (proportional set size, shared pages split between the processes
+# mapping them) while all of them are alive. The pickle's load time
+# includes importing scikit-learn, which unpickling pulls in and which the
+# flat artifact never needs.
+
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+import joblib
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from forest_artifact import export_forest, load_forest  # noqa: E402
+
+MODEL_PATH = os.path.join(ROOT, "suicide_risk_model.pkl")
+
+CHILD = r"""
+import os, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def pss():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+
+from forest_engine import ForestEngine
+from forest_artifact import load_forest
+import joblib
+X = np.random.default_rng(0).integers(0, 6, (1000, 11)).astype(np.float32)
+before_rss, before_pss = rss(), pss()
+start = time.perf_counter()
+if {fmt!r} == "pickle":
+    model = ForestEngine.from_sklearn(joblib.load({path!r}))
+else:
+    model = load_forest({path!r})
+loaded = time.perf_counter() - start
+model.predict(X)
+print(loaded, rss() - before_rss, pss() - before_pss, flush=True)
+sys.stdin.readline()
+"""
+
+
+def run(fmt, path, n):
+    procs = [subprocess.Popen([sys.executable, "-c", CHILD.format(root=ROOT, fmt=fmt, path=path)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for _ in range(n)]
+    results = [tuple(float(v) for v in p.stdout.readline().split()) for p in procs]
+    # PSS again now that every process has the model mapped
+    total_pss = 0
+    for p in procs:
+        with open(f"/proc/{p.pid}/smaps_rollup") as f:
+            total_pss += next(int(line.split()[1]) * 1024 for line in f if line.startswith("Pss:"))
+        p.stdin.write("\n")
+        p.stdin.flush()
+    for p in procs:
+        p.wait()
+    load = np.median([r[0] for r in results])
+    rss = np.median([r[1] for r in results])
+    print(f"{fmt:<7}: {os.path.getsize(path) / 1024:7.0f} KiB, cold load {load * 1e3:6.1f} ms, "
+          f"RSS +{rss / 2**20:5.1f} MiB per process, "
+          f"total PSS of {n} processes {total_pss / 2**20:6.1f} MiB")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        flat_path = export_forest(joblib.load(MODEL_PATH), os.path.join(tmp, "model.forest"))
+
+        model = joblib.load(MODEL_PATH)
+        # The forest was fitted on a DataFrame; plain arrays are fine here
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        engine = load_forest(flat_path)
+        X = np.random.default_rng(1).normal(2.5, 2, (20000, model.n_features_in_)).astype(np.float32)
+        same = np.array_equal(engine.predict_proba(X), model.predict_proba(X.astype(np.float64)))
+        print(f"check  : flat artifact predict_proba identical to the pickle on {len(X)} rows: {same}")
+
+        for fmt, path in (("pickle", MODEL_PATH), ("flat", flat_path)):
+            run(fmt, path, n)
+
+
+if __name__ == "__main__":
+    main()
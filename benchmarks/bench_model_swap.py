@@ -0,0 +1,128 @@
+# ================================
+# Benchmark: hot model swap under load
+# ================================
+# Usage: python benchmarks/bench_model_swap.py [seconds]
+#
+# Publishes the bundled model into a temporary models/ directory and serves
+# it with ModelDeployment while a thread makes single-row predictions
+# non-stop. Meanwhile it publishes retrained versions: good ones must be
+# swapped in, and one deliberately broken version (shuffled labels) must be
+# rejected by the holdout check. Reports per-request latency outside and
+# around the swaps. Then leaves a broken version as the manifest's current
+# one and checks that a newly started process serves the last good version
+# instead, and that `model_deploy.py promote` makes running processes retry
+# a rejected version and accept a rollback to an older one.
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_encoding import FeatureEncoder, encoder_path  # noqa: E402
+from model_deploy import ModelDeployment, main as deploy_cli, publish, read_manifest  # noqa: E402
+from risk_labels import risk_levels  # noqa: E402
+
+MODEL_PATH = os.path.join(ROOT, "suicide_risk_model.pkl")
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 6
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    df = pd.read_csv(os.path.join(ROOT, "Depression Student Dataset.csv"))
+    df["Risk_Level"] = risk_levels(df).map({"Low": 0, "Medium": 1, "High": 2})
+    encoder = FeatureEncoder.load(encoder_path(MODEL_PATH))
+    X = encoder.transform(df)
+    holdout = df.sample(150, random_state=0)
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        publish(joblib.load(MODEL_PATH), encoder, models_dir, holdout=holdout)
+        deployment = ModelDeployment(models_dir, watch=False)
+        row = X.to_numpy(dtype=np.float32)[:1]
+
+        samples = []        # (time, latency, version)
+        stop = threading.Event()
+
+        def serve():
+            while not stop.is_set():
+                t = time.perf_counter()
+                loaded = deployment.get()
+                loaded.predictor.predict(row)
+                samples.append((t, time.perf_counter() - t, loaded.version))
+
+        server = threading.Thread(target=serve)
+        server.start()
+        swaps = []
+        plan = ["good", "broken", "good"]
+        for i, kind in enumerate(plan):
+            time.sleep(seconds / (len(plan) + 1))
+            y = df["Risk_Level"].to_numpy()
+            if kind == "broken":
+                y = np.random.default_rng(i).permutation(y)
+            model = RandomForestClassifier(n_estimators=100, random_state=i + 1).fit(X, y)
+            version = publish(model, encoder, models_dir)
+            t = time.perf_counter()
+            swapped = deployment.check()
+            swaps.append((t, time.perf_counter()))
+            outcome = "swapped in" if swapped else f"rejected ({deployment.rejected.get(version)})"
+            print(f"publish : {kind:<6} version {version}: {outcome} "
+                  f"after {(time.perf_counter() - t) * 1e3:.0f} ms")
+        time.sleep(seconds / (len(plan) + 1))
+        stop.set()
+        server.join()
+
+        # Broken version left as current: new processes must not serve it
+        y = np.random.default_rng(99).permutation(df["Risk_Level"].to_numpy())
+        good = deployment.get().version
+        broken = publish(RandomForestClassifier(n_estimators=100, random_state=99).fit(X, y), encoder, models_dir)
+        deployment.check()
+        restarted = ModelDeployment(models_dir, watch=False)
+        print(f"restart : current {broken} ({restarted.rejected.get(broken)}), "
+              f"serving {restarted.get().version}")
+        if restarted.get().version != good:
+            sys.exit("a restarted process did not fall back to the last good version")
+
+        def promote(version):
+            time.sleep(0.05)        # a new manifest mtime
+            deploy_cli(["--models-dir", models_dir, "promote", version])
+            deployment.last_error = None
+            swapped = deployment.check()
+            # A rejected version that is validated again fails again
+            return swapped, (deployment.last_error or "").startswith(version)
+
+        swapped, retried = promote(broken)
+        print(f"promote : {broken} retried={retried}, swapped in={swapped}")
+        if not retried or swapped:
+            sys.exit("promoting a rejected version must retry it, and the broken one must still fail")
+        first = read_manifest(models_dir)["versions"][0]["version"]
+        swapped, _ = promote(first)
+        print(f"rollback: {first} swapped in={swapped}")
+        if not swapped:
+            sys.exit("an explicit rollback to an older good version was refused")
+
+        near = [lat for t, lat, _ in samples if any(a - 0.05 <= t <= b + 0.05 for a, b in swaps)]
+        far = [lat for t, lat, _ in samples if not any(a - 0.05 <= t <= b + 0.05 for a, b in swaps)]
+        versions = len({v for _, _, v in samples})
+        print(f"serving : {len(samples)} predictions across {versions} versions")
+        for label, values in (("steady", far), ("swapping", near)):
+            print(f"{label:<8}: p50 {percentile(values, 0.5) * 1e3:.2f} ms, "
+                  f"p99 {percentile(values, 0.99) * 1e3:.2f} ms, max {max(values) * 1e3:.2f} ms "
+                  f"({len(values)} requests)")
+
+
+if __name__ == "__main__":
+    main()
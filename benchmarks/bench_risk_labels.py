@@ -0,0 +1,86 @@
+# ================================
+# Benchmark: vectorized risk labelling
+# ================================
+# Usage: python benchmarks/bench_risk_labels.py [sizes...]
+#
+# Checks that risk_levels() gives exactly the labels of
+# df.apply(assign_risk, axis=1), on the bundled dataset and on synthetic
+# rows that mix label spellings and cases, then times both on synthetic
+# datasets (default 1M and 10M rows). The per-row version is timed on a
+# 200k-row sample and extrapolated.
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from risk_labels import RECORD_COLUMNS, assign_risk, risk_levels  # noqa: E402
+
+YES_NO = np.array(["Yes", "No", "yes", "no", "YES"], dtype=object)
+SLEEP = np.array(["Less than 5 hours", "less than 5 hours", "5-6 hours", "5 - 6 hours",
+                  "7-8 hours", "7 - 8 hours", "More than 8 hours"], dtype=object)
+DIET = np.array(["Healthy", "Moderate", "Unhealthy", "unhealthy", "moderate"], dtype=object)
+
+
+def synthetic(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Gender": rng.choice(np.array(["Male", "Female"], dtype=object), n),
+        "Age": rng.integers(18, 35, n),
+        "Academic_Pressure": rng.integers(1, 6, n),
+        "Study_Satisfaction": rng.integers(1, 6, n),
+        "Sleep_Duration": rng.choice(SLEEP, n),
+        "Dietary_Habits": rng.choice(DIET, n),
+        "Suicidal_Thoughts": rng.choice(YES_NO, n),
+        "Study_Hours": rng.integers(0, 13, n),
+        "Financial_Stress": rng.integers(1, 6, n),
+        "Family_History_of_Mental_Illness": rng.choice(YES_NO, n),
+        "Depression": rng.choice(YES_NO, n),
+    })
+
+
+def check(name, df):
+    expected = df.apply(assign_risk, axis=1)
+    actual = risk_levels(df)
+    mismatches = int((expected != actual).sum())
+    print(f"check     : {name}: {len(df)} rows, {mismatches} mismatches, "
+          f"{actual.value_counts().to_dict()}")
+    return mismatches
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000_000, 10_000_000]
+
+    mismatches = check("bundled dataset", pd.read_csv(os.path.join(ROOT, "Depression Student Dataset.csv")))
+    sample = synthetic(200_000, seed=1)
+    mismatches += check("synthetic", sample)
+    categorical = sample.astype({c: "category" for c in ("Sleep_Duration", "Dietary_Habits", "Depression")})
+    mismatches += check("synthetic, categorical columns", categorical)
+    records = sample.rename(columns={v: k for k, v in RECORD_COLUMNS.items()})
+    same = risk_levels(records, columns=RECORD_COLUMNS).equals(risk_levels(sample))
+    print(f"check     : user_records column names give the same labels: {same}")
+    if mismatches or not same:
+        sys.exit("labels differ")
+
+    t = time.perf_counter()
+    sample.apply(assign_risk, axis=1)
+    per_row = (time.perf_counter() - t) / len(sample)
+
+    for n in sizes:
+        df = synthetic(n)
+        t = time.perf_counter()
+        risk_levels(df)
+        vectorized = time.perf_counter() - t
+        print(f"{n:>10,} rows: vectorized {vectorized:.2f}s "
+              f"({n / vectorized / 1e6:.1f}M rows/s), apply ~{per_row * n:.0f}s (extrapolated), "
+              f"speedup ~{per_row * n / vectorized:.0f}x")
+        del df
+
+
+if __name__ == "__main__":
+    main()
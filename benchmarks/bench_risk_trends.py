@@ -0,0 +1,150 @@
+# ================================
+# Benchmark: incremental risk trends
+# ================================
+# Usage: python benchmarks/bench_risk_trends.py [sizes...]
+#
+# Feeds typed user_records to RiskTrends through a growing stand-in for
+# the records cache and checks that the totals built in many small updates
+# equal a one-shot build and a plain pandas group-by of the whole table,
+# daily and weekly. Then, for tables of each size (default 100k and 1M
+# rows), times an update that adds 100 new rows plus rebuilding the daily
+# table against recomputing everything from scratch, with RiskTrends and
+# with a pandas group-by of the whole table. Finally checks that
+# alert() fires on a one-day High risk spike and stays quiet on steady data.
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from risk_trends import RISK_LEVELS, SHORT_SLEEP, RiskTrends  # noqa: E402
+
+SLEEP = ["less than 5 hours", "5 - 6 hours", "7 - 8 hours", "more than 8 hours"]
+
+
+def synthetic(n, days=365, high_share=None, seed=0):
+    """n typed user_records rows, as RecordsCache holds them, ids ascending."""
+    rng = np.random.default_rng(seed)
+    p = None if high_share is None else [(1 - high_share) / 2, (1 - high_share) / 2, high_share]
+    start = np.datetime64("2025-01-01T00:00:00")
+    return pd.DataFrame({
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "academic_pressure": rng.integers(1, 6, n).astype(np.int8),
+        "financial_stress": rng.integers(1, 6, n).astype(np.int8),
+        "sleep_duration": pd.Categorical(rng.choice(SLEEP, n), categories=SLEEP),
+        "predicted_risk": pd.Categorical(rng.choice(list(RISK_LEVELS), n, p=p), categories=list(RISK_LEVELS)),
+        # Not in id order: late records for earlier days are common
+        "timestamp": (start + rng.integers(0, days * 86400, n).astype("timedelta64[s]")).astype("datetime64[ns]"),
+    })
+
+
+class GrowingCache:
+    """The records cache as seen by RiskTrends: sync() returns the first n rows."""
+
+    def __init__(self, frame, n=0):
+        self.frame = frame
+        self.n = n
+
+    def sync(self, force=False):
+        return self.frame.iloc[:self.n]
+
+
+def reference(df, period):
+    """Plain pandas: risk counts, mean pressure and short-sleep share per period."""
+    days = df["timestamp"].dt.normalize()
+    keys = days.dt.to_period("W").dt.start_time if period == "W" else days
+    grouped = df.assign(
+        short=df["sleep_duration"].isin(SHORT_SLEEP),
+        **{level: df["predicted_risk"] == level for level in RISK_LEVELS},
+    ).groupby(keys.rename(None))
+    out = pd.DataFrame({
+        "records": grouped.size(),
+        **{level: grouped[level].sum() for level in RISK_LEVELS},
+        "academic_pressure": grouped["academic_pressure"].mean(),
+        "short_sleep_share": grouped["short"].mean(),
+    })
+    return out.astype(np.float64)
+
+
+def check(table, expected, what):
+    table = table[table["records"] > 0][list(expected.columns)]
+    table.index.name = None
+    try:
+        pd.testing.assert_frame_equal(table, expected, check_freq=False)
+    except AssertionError as e:
+        sys.exit(f"{what}: {e}")
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or [100_000, 1_000_000]
+
+    df = synthetic(200_000)
+    cache = GrowingCache(df)
+    incremental = RiskTrends(cache)
+    rng = np.random.default_rng(1)
+    while cache.n < len(df):
+        cache.n = min(len(df), cache.n + int(rng.integers(1, 5000)))
+        incremental.update()
+    oneshot = RiskTrends(GrowingCache(df, len(df)))
+    oneshot.update()
+    for period in ("D", "W"):
+        pd.testing.assert_frame_equal(incremental.table(period), oneshot.table(period))
+        check(incremental.table(period), reference(df, period), f"period {period}")
+    print(f"{len(df):,} rows in {incremental.updates} updates: daily and weekly totals match "
+          f"a one-shot build and a pandas group-by")
+
+    print(f"\n{'rows':>10} {'update +100 rows':>17} {'daily table':>12} {'full recompute':>15} "
+          f"{'pandas group-by':>16} {'speedup':>8}")
+    for n in sizes:
+        df = synthetic(n + 100, seed=n)
+        cache = GrowingCache(df, n)
+        trends = RiskTrends(cache)
+        trends.update()
+        trends.table("D")
+
+        cache.n = n + 100
+        start = time.perf_counter()
+        trends.update()
+        update_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        trends.table("D")
+        table_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = RiskTrends(cache)
+        full.update()
+        full.table("D")
+        full_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        reference(df, "D")
+        pandas_seconds = time.perf_counter() - start
+        incremental_seconds = update_seconds + table_seconds
+        print(f"{n:>10,} {update_seconds * 1000:>14.2f} ms {table_seconds * 1000:>9.2f} ms "
+              f"{full_seconds * 1000:>12.1f} ms {pandas_seconds * 1000:>13.1f} ms "
+              f"{full_seconds / incremental_seconds:>7.0f}x")
+
+    # 60 days at a steady 30% High share, then one day at 70%
+    steady = synthetic(60 * 40, days=60, high_share=0.3, seed=2)
+    spike = synthetic(40, days=1, high_share=0.7, seed=3)
+    spike["id"] += len(steady)
+    spike["timestamp"] += np.timedelta64(60, "D")
+    trends = RiskTrends(GrowingCache(steady, len(steady)))
+    trends.update()
+    if trends.alert() is not None:
+        sys.exit(f"alert on steady data: {trends.alert()}")
+    trends.records_cache = GrowingCache(pd.concat([steady, spike], ignore_index=True), len(steady) + len(spike))
+    trends.update()
+    alert = trends.alert()
+    if alert is None:
+        sys.exit("no alert for the spike")
+    print(f"\nspike alert: {alert['share']:.0%} High on {alert['start']} ({alert['records']} assessments) "
+          f"vs {alert['baseline_share']:.0%} baseline, z = {alert['z']:.1f}; no alert on steady data")
+
+
+if __name__ == "__main__":
+    main()
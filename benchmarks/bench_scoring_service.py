@@ -0,0 +1,82 @@
+# ================================
+# Benchmark: micro-batching scoring service
+# ================================
+# Usage: python benchmarks/bench_scoring_service.py [clients] [requests_per_client]
+#
+# Serves scoring_service on a local port and drives it with concurrent
+# clients, once with batching disabled (max_batch=1) and once with the
+# default micro-batching. Reports throughput, client-side p50/p99 latency
+# and the service's batch-size histogram.
+
+import logging
+import os
+import sys
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from scoring_service import create_app  # noqa: E402
+
+ANSWERS = {
+    "gender": "Female", "age": 20, "academic_pressure": 4, "study_satisfaction": 2,
+    "sleep_duration": "less than 5 hours", "dietary_habits": "unhealthy",
+    "suicidal_thoughts": "yes", "study_hours": 8, "financial_stress": 4,
+    "family_history": "no", "depression": "yes",
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def run(label, clients, per_client, **options):
+    app = create_app(**options)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/score"
+    latencies = []
+    lock = threading.Lock()
+
+    def client(i):
+        session = requests.Session()
+        mine = []
+        for j in range(per_client):
+            t = time.perf_counter()
+            response = session.post(url, json=dict(ANSWERS, age=17 + (i + j) % 20))
+            response.raise_for_status()
+            mine.append(time.perf_counter() - t)
+        with lock:
+            latencies.extend(mine)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    stats = app.config["batcher"].stats()
+    print(f"{label:<14}: {len(latencies) / elapsed:7.0f} req/s, "
+          f"p50 {percentile(latencies, 0.5) * 1e3:6.1f} ms, p99 {percentile(latencies, 0.99) * 1e3:6.1f} ms, "
+          f"{stats['batches']} predict calls, batch sizes {stats['batch_sizes']}")
+    server.shutdown()
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    run("no batching", clients, per_client, max_batch=1, max_wait=0)
+    run("micro-batched", clients, per_client, max_batch=64, max_wait=0.005)
+
+
+if __name__ == "__main__":
+    main()
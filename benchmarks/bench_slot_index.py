@@ -0,0 +1,118 @@
+# ================================
+# Benchmark: teleconsult slot index
+# ================================
+# Usage: python benchmarks/bench_slot_index.py [n_appointments]
+#
+# Loads n synthetic appointments (default 100k) into a SlotIndex, checks
+# is_free() against a linear scan over all bookings on random queries, and
+# reports build time and per-call latency of is_free, next_free and add.
+# Finally syncs an AppointmentStore from the local Supabase stand-in to show
+# the incremental (id > last) refresh.
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from appointment_store import AppointmentStore  # noqa: E402
+from local_supabase import LocalSupabase  # noqa: E402
+from record_writer import RecordWriter  # noqa: E402
+from slot_index import SlotConflict, SlotIndex  # noqa: E402
+from spool import Spool  # noqa: E402
+from supabase_client import SupabaseClient  # noqa: E402
+
+SLOT_MINUTES = 30
+
+
+def synthetic(n, days, seed=0):
+    rng = random.Random(seed)
+    start = date.today()
+    rows = []
+    for i in range(n):
+        day = start + timedelta(days=rng.randrange(days))
+        minute = rng.randrange(8 * 4, 20 * 4) * 15
+        rows.append({"id": i + 1, "date": day.isoformat(),
+                     "time": f"{minute // 60:02d}:{minute % 60:02d}:00"})
+    return rows
+
+
+def linear_is_free(rows, day, minute):
+    for row in rows:
+        if row["date"] == day:
+            hour, mins = row["time"].split(":")[:2]
+            if abs(int(hour) * 60 + int(mins) - minute) < SLOT_MINUTES:
+                return False
+    return True
+
+
+def timed(fn, calls):
+    t = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - t) / len(calls)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    days = max(n // 40, 1)
+    rows = synthetic(n, days)
+    rng = random.Random(1)
+    queries = []
+    for _ in range(10_000):
+        day = (date.today() + timedelta(days=rng.randrange(days))).isoformat()
+        minute = rng.randrange(8 * 4, 20 * 4) * 15
+        queries.append((day, f"{minute // 60:02d}:{minute % 60:02d}", minute))
+
+    index = SlotIndex(slot_minutes=SLOT_MINUTES)
+    t = time.perf_counter()
+    index.add_rows(rows)
+    build = time.perf_counter() - t
+    print(f"build    : {n} appointments over {days} days in {build:.2f}s")
+
+    mismatches = sum(index.is_free(d, s) != linear_is_free(rows, d, m) for d, s, m in queries[:200])
+    print(f"check    : {mismatches} mismatches against a linear scan (200 queries)")
+
+    free_calls = [(d, s) for d, s, _ in queries]
+    print(f"is_free  : {timed(index.is_free, free_calls) * 1e6:.1f} us/call "
+          f"(linear scan {timed(lambda d, s, m: linear_is_free(rows, d, m), queries[:20]) * 1e3:.1f} ms/call)")
+    print(f"next_free: {timed(lambda d, s: index.next_free(d, s, n=5), free_calls[:2000]) * 1e6:.1f} us/call (n=5)")
+    extra = [(d, s, f"new-{i}") for i, (d, s, _) in enumerate(queries[:2000])]
+    print(f"add      : {timed(index.add, extra) * 1e6:.1f} us/call")
+
+    server = LocalSupabase().start()
+    try:
+        server.insert("appointments", rows[:5000])
+        client = SupabaseClient(server.url, "local")
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = RecordWriter(client, Spool(os.path.join(tmp, "spool.db")))
+            store = AppointmentStore(client, writer, slot_sync_interval=0)
+            t = time.perf_counter()
+            store.sync_slots()
+            first = time.perf_counter() - t
+            server.insert("appointments", synthetic(100, days, seed=2))
+            before = server.request_count
+            t = time.perf_counter()
+            store.sync_slots()
+            print(f"sync     : initial 5000 rows {first * 1e3:.0f} ms, incremental 100 rows "
+                  f"{(time.perf_counter() - t) * 1e3:.1f} ms in {server.request_count - before} request(s)")
+
+            day, start = store.slots.next_free(date.today())[0]
+            record = {"name": "bench", "date": day.isoformat(), "time": start.strftime("%H:%M:%S")}
+            store.book(record)
+            try:
+                store.book(dict(record, name="other"))
+                print("conflict : double booking was NOT rejected")
+            except SlotConflict as e:
+                print(f"conflict : rejected, suggested {[f'{d} {s:%H:%M}' for d, s in e.suggestions]}")
+            writer.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ================================
+# Benchmark: spooled write-behind against a flaky backend
+# ================================
+# Usage: python benchmarks/bench_spool_replay.py [n_records]
+#
+# Runs the RecordWriter against the local Supabase stand-in through three
+# phases (healthy, full outage, flaky recovery), then checks that every
+# submitted record arrived exactly once. Reports submit latency, backlog
+# depth during the outage and time to drain.
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from local_supabase import LocalSupabase  # noqa: E402
+from record_writer import RecordWriter  # noqa: E402
+from spool import Spool  # noqa: E402
+from supabase_client import SupabaseClient  # noqa: E402
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def submit_many(writer, n, start):
+    latencies = []
+    for i in range(start, start + n):
+        t = time.perf_counter()
+        writer.submit("user_records", {"seq": i, "predicted_risk": "Low"})
+        latencies.append(time.perf_counter() - t)
+    return latencies
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    phase = n // 3
+
+    server = LocalSupabase(latency=0.02, seed=1).start()
+    client = SupabaseClient(server.url, "local", timeout=(1, 2), retries=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        spool = Spool(os.path.join(tmp, "spool.db"))
+        writer = RecordWriter(client, spool, batch_size=100, max_wait=0.2,
+                              retry_backoff=0.1, max_backoff=0.5)
+
+        latencies = submit_many(writer, phase, 0)
+        writer.flush(30)
+        print(f"healthy : {phase} records in {writer.batches} batches, "
+              f"{server.request_count} HTTP requests")
+
+        server.fail_rate = 1.0
+        latencies += submit_many(writer, phase, phase)
+        time.sleep(1.0)
+        print(f"outage  : backlog depth {writer.stats()['pending']}, "
+              f"oldest {writer.stats()['oldest_pending_seconds']:.2f}s")
+
+        server.fail_rate = 0.3
+        latencies += submit_many(writer, n - 2 * phase, 2 * phase)
+        start = time.perf_counter()
+        drained = writer.flush(60)
+        print(f"recovery: drained={drained} in {time.perf_counter() - start:.2f}s "
+              f"after {writer.failed_attempts} failed attempts")
+        writer.close()
+
+        seqs = [r["seq"] for r in server.tables.get("user_records", [])]
+        exactly_once = sorted(seqs) == list(range(n))
+        print(f"submit latency p50 {percentile(latencies, 0.5) * 1e3:.3f}ms, "
+              f"p99 {percentile(latencies, 0.99) * 1e3:.3f}ms")
+        print(f"delivered {len(seqs)}/{n}, exactly once: {exactly_once}")
+        spool.close()
+    server.stop()
+    if not exactly_once:
+        sys.exit("Records were lost or duplicated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# ================================
+# Dashboard Charts
+# ================================
+# Builds the Staff Dashboard figures from the chart count tables and caches
+# them per data version, the (row count, latest timestamp) pair of
+# user_records. Reruns and other staff sessions reuse the built figures until
+# the version changes or someone presses refresh; the version itself is only
+# re-checked every `ttl` seconds.
+#
+# Built Figure objects are cached rather than their JSON: st.plotly_chart
+# re-validates figures passed as dicts/JSON, while a Figure goes straight to
+# serialization. The cached figures are shared and must not be mutated.
+#
+# The risk trend figures (risk_trends.py) are cached the same way, per
+# version of the incrementally updated trend totals.
+
+import threading
+import time
+
+import plotly.express as px
+
+from risk_trends import RISK_LEVELS
+
+RISK_COLORS = {"Low": "green", "Medium": "orange", "High": "red"}
+YES_NO_COLORS = {"No": "blue", "Yes": "red"}
+
+
+def build_figures(counts):
+    """Plotly figures for every chart that has a count table."""
+    figures = {}
+
+    if "risk" in counts:
+        figures["risk"] = px.bar(
+            counts["risk"],
+            x="predicted_risk",
+            y="count",
+            title="Suicide Risk Distribution",
+            labels={"predicted_risk": "Risk Level", "count": "Count"},
+            color="predicted_risk",
+            color_discrete_map=RISK_COLORS
+        )
+
+    if "gender" in counts:
+        figures["gender"] = px.pie(
+            counts["gender"],
+            names="gender",
+            values="count",
+            title="Gender Distribution",
+            color="gender",
+            color_discrete_map={"Male": "blue", "Female": "pink"}
+        )
+
+    if "pressure_risk" in counts:
+        figures["pressure_risk"] = px.bar(
+            counts["pressure_risk"],
+            x="academic_pressure",
+            y="count",
+            color="predicted_risk",
+            title="Academic Pressure by Risk Level",
+            labels={"count": "Count"},
+            barmode="stack",
+            color_discrete_map=RISK_COLORS
+        )
+
+    if "depression" in counts:
+        figures["depression"] = px.bar(
+            counts["depression"],
+            x="depression",
+            y="count",
+            title="Depression Distribution",
+            labels={"depression": "Depression", "count": "Count"},
+            color="depression",
+            color_discrete_map=YES_NO_COLORS
+        )
+
+    if "suicidal_thoughts" in counts:
+        figures["suicidal_thoughts"] = px.bar(
+            counts["suicidal_thoughts"],
+            x="suicidal_thoughts",
+            y="count",
+            title="Suicidal Thoughts Distribution",
+            labels={"suicidal_thoughts": "Suicidal Thoughts", "count": "Count"},
+            color="suicidal_thoughts",
+            color_discrete_map=YES_NO_COLORS
+        )
+
+    return figures
+
+
+class ChartCache:
+    def __init__(self, aggregates, ttl=15.0):
+        self.aggregates = aggregates
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = None
+        self._figures = None
+        self._checked_at = 0.0
+        self.builds = 0
+        self.built_at = None
+
+    def figures(self, refresh=False):
+        """Return (data version, figures), rebuilding only when data changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not refresh and self._figures is not None and now - self._checked_at < self.ttl:
+                return self._version, self._figures
+
+            version = self.aggregates.data_version()
+            self._checked_at = now
+            if refresh or self._figures is None or version != self._version:
+                self._figures = build_figures(self.aggregates.counts())
+                self._version = version
+                self.builds += 1
+                self.built_at = time.time()
+            return self._version, self._figures
+
+
+# ================================
+# Risk Trend Charts
+# ================================
+PERIOD_LABELS = {"D": "Day", "W": "Week"}
+
+
+def build_trend_figures(table, period="D"):
+    """Risk level counts, High share and answer trends per day or week."""
+    x = table.index.name
+    data = table.reset_index()
+    label = PERIOD_LABELS[period]
+    figures = {}
+
+    figures["risk_counts"] = px.bar(
+        data,
+        x=x,
+        y=list(RISK_LEVELS),
+        title=f"Assessments per {label} by Risk Level",
+        labels={x: label, "value": "Assessments", "variable": "Risk Level"},
+        color_discrete_map=RISK_COLORS
+    )
+
+    shares = ["high_share", "high_share_7d"] if "high_share_7d" in data else ["high_share"]
+    figures["high_share"] = px.line(
+        data,
+        x=x,
+        y=shares,
+        title="High Risk Share",
+        labels={x: label, "value": "Share", "variable": ""},
+    )
+    figures["high_share"].update_yaxes(tickformat=".0%", rangemode="tozero")
+    figures["high_share"].for_each_trace(lambda t: t.update(
+        name={"high_share": f"per {label.lower()}", "high_share_7d": "rolling 7 days"}[t.name]))
+
+    figures["factors"] = px.line(
+        data,
+        x=x,
+        y=["academic_pressure", "financial_stress"],
+        title="Mean Academic Pressure and Financial Stress (1-5)",
+        labels={x: label, "value": "Mean", "variable": ""},
+    )
+    figures["factors"].update_yaxes(range=[1, 5])
+
+    figures["short_sleep"] = px.line(
+        data,
+        x=x,
+        y="short_sleep_share",
+        title="Share Sleeping Under 7 Hours",
+        labels={x: label, "short_sleep_share": "Share"},
+    )
+    figures["short_sleep"].update_yaxes(tickformat=".0%", rangemode="tozero")
+    return figures
+
+
+class TrendCharts:
+    def __init__(self, trends):
+        self.trends = trends
+        self._lock = threading.Lock()
+        self._figures = {}      # period -> (trends version, table, figures)
+        self.builds = 0
+
+    def figures(self, period="D", refresh=False):
+        """Return (table, figures) for the period, updating the trends first."""
+        version = self.trends.update(force=refresh)
+        with self._lock:
+            cached = self._figures.get(period)
+            if cached is not None and cached[0] == version:
+                return cached[1], cached[2]
+            table = self.trends.table(period)
+            figures = build_trend_figures(table, period) if len(table) else {}
+            self._figures[period] = (version, table, figures)
+            self.builds += 1
+            return table, figures
@@ -0,0 +1,486 @@
+# ================================
+# Dashboard Data Layer
+# ================================
+# Keeps a local, typed copy of user_records for the Staff Dashboard instead
+# of downloading the whole table on every rerun. Each sync asks Supabase only
+# for rows with an id above the last one seen, a page at a time through
+# PostgREST Range requests, and appends them as a new Parquet part file.
+# Opening the dashboard with no new data costs one small request at most
+# (none within min_interval of the previous sync).
+#
+# Several app processes can share the cache directory. Reading the parts
+# and writing or compacting them happen under a lock file in the directory,
+# and rows that more than one process fetched are dropped on load.
+
+import glob
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+from supabase_client import SupabaseError
+
+CATEGORIES = {
+    "gender": ["Male", "Female"],
+    "sleep_duration": ["less than 5 hours", "5 - 6 hours", "7 - 8 hours", "more than 8 hours"],
+    "dietary_habits": ["unhealthy", "moderate", "healthy"],
+    "suicidal_thoughts": ["No", "Yes"],
+    "family_history": ["No", "Yes"],
+    "depression": ["No", "Yes"],
+    "predicted_risk": ["Low", "Medium", "High"],
+}
+
+INTEGERS = {
+    "id": "int64",
+    "age": "int16",
+    "academic_pressure": "int8",
+    "study_satisfaction": "int8",
+    "study_hours": "int8",
+    "financial_stress": "int8",
+}
+
+# Early records stored some answers as 0/1 codes
+LEGACY_LABELS = {
+    "gender": {0: "Male", 1: "Female", "0": "Male", "1": "Female"},
+    "suicidal_thoughts": {0: "No", 1: "Yes", "no": "No", "yes": "Yes"},
+    "family_history": {0: "No", 1: "Yes", "no": "No", "yes": "Yes"},
+    "depression": {0: "No", 1: "Yes", "no": "No", "yes": "Yes"},
+}
+
+# Compact the part files into one once there are more than this many
+MAX_PARTS = 20
+
+
+def normalize_records(rows):
+    """Turn raw user_records rows into a DataFrame with compact dtypes."""
+    df = pd.DataFrame(rows)
+    for col, labels in LEGACY_LABELS.items():
+        if col in df.columns:
+            df[col] = df[col].replace(labels)
+    for col, categories in CATEGORIES.items():
+        if col in df.columns:
+            extra = [v for v in pd.unique(df[col].dropna()) if v not in categories]
+            df[col] = pd.Categorical(df[col], categories=categories + sorted(map(str, extra)))
+    for col, dtype in INTEGERS.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors="coerce")
+            df[col] = values.astype(dtype) if values.notna().all() else values.astype("Int64")
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce", format="ISO8601")
+    return df
+
+
+def concat_records(frames):
+    """Concatenate typed frames, merging categorical columns' categories."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        df = frames[0].reset_index(drop=True)
+    else:
+        for col in CATEGORIES:
+            present = [f[col] for f in frames if col in f.columns]
+            if len(present) == len(frames):
+                merged = pd.api.types.union_categoricals(present, ignore_order=True)
+                categories = list(merged.categories)
+                frames = [f.assign(**{col: f[col].cat.set_categories(categories)}) for f in frames]
+        df = pd.concat(frames, ignore_index=True)
+    # Dashboard tables are numbered from 1
+    df.index = pd.RangeIndex(1, len(df) + 1)
+    return df
+
+
+def unique_records(df):
+    """Records in id order, one row per id (parts written by different
+    processes can overlap)."""
+    if df.empty or "id" not in df.columns:
+        return df
+    df = df.drop_duplicates("id").sort_values("id", kind="stable")
+    df.index = pd.RangeIndex(1, len(df) + 1)
+    return df
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on path, shared by all processes on this machine."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RecordsCache:
+    def __init__(self, client, cache_dir="cache/user_records", table="user_records",
+                 page_size=1000, min_interval=5.0):
+        self.client = client
+        self.cache_dir = cache_dir
+        self.table = table
+        self.page_size = page_size
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._frame = None
+        self._last_sync = 0.0
+        self.version = 0
+        self.rows_fetched = 0
+        self.requests = 0
+
+    @property
+    def last_id(self):
+        if self._frame is None or self._frame.empty or "id" not in self._frame.columns:
+            return None
+        return int(self._frame["id"].max())
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.cache_dir, "part-*.parquet")))
+
+    def _dir_lock(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return file_lock(os.path.join(self.cache_dir, ".lock"))
+
+    def _read_parts(self):
+        return unique_records(concat_records([pd.read_parquet(path) for path in self._parts()]))
+
+    def _load_local(self):
+        with self._dir_lock():
+            self._frame = self._read_parts()
+        self.version += 1
+
+    def _fetch_new(self):
+        """All rows above last_id, fetched page by page."""
+        rows = []
+        last_id = self.last_id
+        while True:
+            params = {"select": "*", "order": "id.asc"}
+            if last_id is not None:
+                params["id"] = f"gt.{last_id}"
+            page = self.client.select(self.table, params, headers={
+                "Range-Unit": "items",
+                "Range": f"0-{self.page_size - 1}",
+            })
+            self.requests += 1
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            last_id = page[-1]["id"]
+
+    def _write_part(self, df):
+        first, last = int(df["id"].min()), int(df["id"].max())
+        path = os.path.join(self.cache_dir, f"part-{first:012d}-{last:012d}.parquet")
+        with self._dir_lock():
+            tmp = f"{path}.{os.getpid()}.tmp"
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+
+            parts = self._parts()
+            if len(parts) > MAX_PARTS:
+                # From the parts on disk, which may hold rows other processes fetched
+                merged = self._read_parts()
+                last = int(merged["id"].max())
+                compacted = os.path.join(self.cache_dir, f"part-{0:012d}-{last:012d}.parquet")
+                merged.to_parquet(compacted + ".tmp", index=False)
+                os.replace(compacted + ".tmp", compacted)
+                for old in parts:
+                    if old != compacted:
+                        os.remove(old)
+
+    def sync(self, force=False):
+        """Bring the local copy up to date and return it.
+
+        The returned DataFrame is shared between sessions and must not be
+        modified in place.
+        """
+        with self._lock:
+            if self._frame is None:
+                self._load_local()
+            now = time.monotonic()
+            if not force and now - self._last_sync < self.min_interval:
+                return self._frame
+
+            rows = self._fetch_new()
+            self._last_sync = now
+            if rows:
+                new = normalize_records(rows)
+                self.rows_fetched += len(new)
+                self._frame = concat_records([self._frame, new])
+                self.version += 1
+                if "id" in new.columns:
+                    self._write_part(new)
+            return self._frame
+
+    def stats(self):
+        frame = self._frame
+        return {
+            "rows": 0 if frame is None else len(frame),
+            "memory_bytes": 0 if frame is None else int(frame.memory_usage(deep=True).sum()),
+            "version": self.version,
+            "rows_fetched": self.rows_fetched,
+            "requests": self.requests,
+            "parts": len(self._parts()),
+        }
+
+
+# ================================
+# Chart Aggregates
+# ================================
+# The dashboard charts only need small group-by count tables. They are
+# computed where the data lives, by the dashboard_counts() SQL function
+# (sql/002_dashboard_counts.sql) called through PostgREST RPC, so the rows
+# themselves never leave the database. The function returns long-format rows
+# {chart, a, b, count}; b is only set for two-way charts.
+
+DASHBOARD_COUNTS_RPC = "dashboard_counts"
+
+DASHBOARD_CHARTS = {
+    "risk": ("predicted_risk",),
+    "gender": ("gender",),
+    "pressure_risk": ("academic_pressure", "predicted_risk"),
+    "depression": ("depression",),
+    "suicidal_thoughts": ("suicidal_thoughts",),
+}
+
+INTEGER_GROUPS = {"academic_pressure"}
+
+
+def _label(col, value):
+    return LEGACY_LABELS.get(col, {}).get(value, value)
+
+
+def dashboard_counts_rows(records):
+    """Pure-Python equivalent of the dashboard_counts() SQL function."""
+    counter = Counter()
+    for record in records:
+        for chart, cols in DASHBOARD_CHARTS.items():
+            if all(record.get(col) is not None for col in cols):
+                counter[(chart,) + tuple(str(_label(col, record[col])) for col in cols)] += 1
+    return [
+        {"chart": key[0], "a": key[1], "b": key[2] if len(key) > 2 else None, "count": n}
+        for key, n in counter.items()
+    ]
+
+
+def dashboard_counts_frame(df):
+    """The same count rows, computed from the local typed records cache."""
+    rows = []
+    for chart, cols in DASHBOARD_CHARTS.items():
+        if df.empty or not all(col in df.columns for col in cols):
+            continue
+        counts = df.groupby(list(cols), observed=True).size()
+        for key, n in counts.items():
+            key = key if isinstance(key, tuple) else (key,)
+            rows.append({"chart": chart, "a": str(key[0]),
+                         "b": str(key[1]) if len(key) > 1 else None, "count": int(n)})
+    return rows
+
+
+def counts_to_frames(rows):
+    """Split long-format count rows into one small DataFrame per chart."""
+    frames = {}
+    for chart, cols in DASHBOARD_CHARTS.items():
+        chart_rows = [r for r in rows if r["chart"] == chart]
+        if not chart_rows:
+            continue
+        data = {col: [r["a" if i == 0 else "b"] for r in chart_rows] for i, col in enumerate(cols)}
+        data["count"] = [int(r["count"]) for r in chart_rows]
+        frame = pd.DataFrame(data)
+        for col in cols:
+            if col in INTEGER_GROUPS:
+                frame[col] = pd.to_numeric(frame[col], errors="coerce")
+        sort_by = ["count"] if len(cols) == 1 else list(cols)
+        frames[chart] = frame.sort_values(sort_by, ascending=len(cols) > 1, ignore_index=True)
+    return frames
+
+
+class DashboardAggregates:
+    """Chart count tables from Supabase RPC, or from the local cache as a fallback."""
+
+    def __init__(self, client, records_cache=None):
+        self.client = client
+        self.records_cache = records_cache
+        self.source = None
+
+    def data_version(self):
+        """(row count, latest timestamp) of user_records, from one tiny request."""
+        response = self.client.request(
+            "GET", "user_records",
+            params={"select": "timestamp", "order": "timestamp.desc.nullslast", "limit": 1},
+            headers={"Prefer": "count=exact"},
+        )
+        total = response.headers.get("Content-Range", "*/*").rsplit("/", 1)[-1]
+        rows = response.json()
+        return (int(total) if total.isdigit() else len(rows), rows[0]["timestamp"] if rows else None)
+
+    def counts(self):
+        try:
+            rows = self.client.rpc(DASHBOARD_COUNTS_RPC)
+            self.source = "rpc"
+        except SupabaseError as e:
+            # Function not deployed yet (PostgREST answers 404)
+            if e.status_code != 404 or self.records_cache is None:
+                raise
+            rows = dashboard_counts_frame(self.records_cache.sync())
+            self.source = "local"
+        return counts_to_frames(rows)
+
+
+# ================================
+# Records Table
+# ================================
+# The records table shows one page at a time. Filters, sort and paging are
+# applied by PostgREST and only the visible rows are transferred (Range
+# header). Turning to the next or previous page continues from the last or
+# first row shown (keyset pagination on the sort column and id), so it costs
+# the same however deep into the table it is; jumping to a page number uses
+# an offset. The exact match count is asked for once per filter set and
+# data version and remembered after that.
+# sql/003_user_records_indexes.sql adds the indexes these queries use.
+
+SORTABLE_COLUMNS = ["timestamp", "id", "age", "academic_pressure", "financial_stress", "predicted_risk"]
+
+# Remembered exact counts, across filter sets and data versions
+MAX_COUNTS = 256
+
+
+def _legacy_codes(col, labels):
+    """Labels plus any legacy codes that normalize to them."""
+    codes = [code for code, label in LEGACY_LABELS.get(col, {}).items() if label in labels]
+    return list(labels) + [str(c) for c in codes]
+
+
+def _quote(value):
+    """A value for a PostgREST logic tree (or=/and=), which may hold , . : ( )"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_filters(sort_by, descending, key):
+    """Filters for the rows after key, the (sort value, id) of a row, in the
+    order query_params() gives (nulls last descending, first ascending): one
+    list per run of rows to read in turn, nulls being a run of their own.
+    Each run is bounded on the sort column, so it is an index range scan."""
+    value, row_id = key
+    op = "lt" if descending else "gt"
+    if sort_by == "id":
+        return [[("id", f"{op}.{row_id}")]]
+    if value is None:
+        nulls = [(sort_by, "is.null"), ("id", f"{op}.{row_id}")]
+        return [nulls] if descending else [nulls, [(sort_by, "not.is.null")]]
+    same_or_beyond = [
+        (sort_by, f"{'lte' if descending else 'gte'}.{value}"),
+        ("or", f"({sort_by}.{op}.{_quote(value)},id.{op}.{row_id})"),
+    ]
+    return [same_or_beyond, [(sort_by, "is.null")]] if descending else [same_or_beyond]
+
+
+class RecordsTable:
+    def __init__(self, client, table="user_records", count="exact"):
+        self.client = client
+        self.table = table
+        # "exact" (remembered per filter set and data version), or
+        # "estimated"/"planned" (asked for every time, cheaper on very large tables)
+        self.count = count
+        self._counts = {}
+        self.count_requests = 0
+
+    def query_params(self, risk=None, gender=None, date_from=None, date_to=None,
+                     sort_by="timestamp", descending=True):
+        params = [("select", "*")]
+        if risk:
+            params.append(("predicted_risk", f"in.({','.join(risk)})"))
+        if gender:
+            params.append(("gender", f"in.({','.join(_legacy_codes('gender', gender))})"))
+        if date_from:
+            params.append(("timestamp", f"gte.{date_from.isoformat()}"))
+        if date_to:
+            # Inclusive end date
+            params.append(("timestamp", f"lt.{(date_to + timedelta(days=1)).isoformat()}"))
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        direction = "desc.nullslast" if descending else "asc.nullsfirst"
+        # id as a tie-breaker keeps page boundaries stable
+        params.append(("order", f"{sort_by}.{direction},id.{'desc' if descending else 'asc'}"))
+        return params
+
+    def _get(self, params, offset, limit, count=False):
+        """(rows, total matching rows or None)"""
+        headers = {"Range-Unit": "items", "Range": f"{offset}-{offset + limit - 1}"}
+        if count:
+            headers["Prefer"] = f"count={self.count}"
+            self.count_requests += 1
+        response = self.client.request("GET", self.table, params=params, headers=headers)
+        total = response.headers.get("Content-Range", "*/*").rsplit("/", 1)[-1]
+        return response.json(), int(total) if total.isdigit() else None
+
+    def page(self, page=1, page_size=50, after=None, before=None, data_version=None, **filters):
+        """Return (rows DataFrame, total matching rows, (first key, last key))
+        for a 1-based page.
+
+        after / before: the last key of the page before this one, or the first
+        key of the page after it, from an earlier call with the same filters.
+        Given one, the page is read on from there instead of by offset.
+        data_version: anything that changes when user_records does; the exact
+        count is only asked for again when it or the filters change.
+        """
+        page = max(page, 1)
+        sort_by = filters.get("sort_by", "timestamp")
+        descending = filters.get("descending", True)
+        params = self.query_params(**filters)
+        matching = [p for p in params if p[0] not in ("select", "order")]
+        count_key = (tuple(matching), data_version)
+        remember = self.count == "exact" and data_version is not None
+        total = self._counts.get(count_key) if remember else None
+
+        if after is None and before is None:
+            rows, counted = self._get(params, (page - 1) * page_size, page_size, count=total is None)
+        else:
+            if before is not None:
+                # The rows before it are the first rows of the reversed order
+                descending = not descending
+                params = self.query_params(**{**filters, "descending": descending})
+            rows = []
+            for run in keyset_filters(sort_by, descending, before if before is not None else after):
+                got, _ = self._get(params + run, 0, page_size - len(rows))
+                rows += got
+                if len(rows) >= page_size:
+                    break
+            if before is not None:
+                rows.reverse()
+            counted = None
+            if total is None:
+                # Counted on the filters alone, not from the key on
+                _, counted = self._get([("select", "id")] + matching, 0, 1, count=True)
+
+        if total is None:
+            total = counted
+            if remember and total is not None:
+                if len(self._counts) >= MAX_COUNTS:
+                    self._counts.clear()
+                self._counts[count_key] = total
+        keys = ((rows[0].get(sort_by), rows[0]["id"]), (rows[-1].get(sort_by), rows[-1]["id"])) if rows else None
+        df = normalize_records(rows) if rows else pd.DataFrame()
+        first = (page - 1) * page_size + 1
+        df.index = pd.RangeIndex(first, first + len(df))
+        return df, total, keys
@@ -0,0 +1,131 @@
+# ================================
+# Feature Encoding
+# ================================
+# One encoder shared by training and serving. The training script fits it on
+# the dataset (the same alphabetical codes LabelEncoder gave) and saves it as
+# JSON next to the model; the app loads it with the model and uses it to turn
+# form answers straight into a NumPy row in the model's column order, so the
+# codes the app sends are always the codes the model was trained on.
+#
+# Labels are compared in a normalized form (lowercase, single spaces around
+# "-"), so the dataset's "5-6 hours" / "Healthy" and the form's "5 - 6 hours"
+# / "healthy" land on the same code.
+#
+# pandas is only imported by fit() and transform(); encoding form answers
+# needs NumPy alone, so the app does not load pandas to serve a prediction.
+
+import json
+import os
+import re
+
+import numpy as np
+
+FEATURES = (
+    "Gender", "Age", "Academic_Pressure", "Study_Satisfaction",
+    "Sleep_Duration", "Dietary_Habits", "Suicidal_Thoughts",
+    "Study_Hours", "Financial_Stress",
+    "Family_History_of_Mental_Illness", "Depression",
+)
+
+CATEGORICAL = (
+    "Gender", "Sleep_Duration", "Dietary_Habits",
+    "Suicidal_Thoughts", "Family_History_of_Mental_Illness", "Depression",
+)
+
+# user_records column names -> model feature names
+RECORD_FEATURES = {
+    "gender": "Gender",
+    "age": "Age",
+    "academic_pressure": "Academic_Pressure",
+    "study_satisfaction": "Study_Satisfaction",
+    "sleep_duration": "Sleep_Duration",
+    "dietary_habits": "Dietary_Habits",
+    "suicidal_thoughts": "Suicidal_Thoughts",
+    "study_hours": "Study_Hours",
+    "financial_stress": "Financial_Stress",
+    "family_history": "Family_History_of_Mental_Illness",
+    "depression": "Depression",
+}
+
+_DASH = re.compile(r"\s*-\s*")
+
+
+def normalize_label(value):
+    return _DASH.sub(" - ", " ".join(str(value).split())).lower()
+
+
+def encoder_path(model_path):
+    """suicide_risk_model.pkl -> suicide_risk_model.encoder.json"""
+    return os.path.splitext(model_path)[0] + ".encoder.json"
+
+
+class FeatureEncoder:
+    def __init__(self, codes, features=FEATURES):
+        # codes: {column: {normalized label: code}}
+        self.codes = codes
+        self.features = tuple(features)
+        self.positions = {col: i for i, col in enumerate(self.features)}
+
+    @classmethod
+    def fit(cls, df, features=FEATURES, categorical=CATEGORICAL):
+        """Codes in sorted order of the raw labels, as LabelEncoder assigns them."""
+        import pandas as pd
+
+        codes = {}
+        for col in categorical:
+            labels = sorted(pd.unique(df[col].dropna()))
+            codes[col] = {normalize_label(label): i for i, label in enumerate(labels)}
+        return cls(codes, features)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["codes"], data["features"])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"features": list(self.features), "codes": self.codes}, f, indent=2)
+
+    def code(self, col, value):
+        try:
+            return self.codes[col][normalize_label(value)]
+        except KeyError:
+            raise ValueError(f"Unknown {col} value {value!r}") from None
+
+    def new_batch(self, n=1):
+        return np.empty((n, len(self.features)), dtype=np.float32)
+
+    def encode_row(self, values, out=None):
+        """Encode one answer dict (raw labels) into out, a row of new_batch()."""
+        if out is None:
+            out = self.new_batch(1)[0]
+        for col, i in self.positions.items():
+            value = values[col]
+            out[i] = self.code(col, value) if col in self.codes else value
+        return out
+
+    def transform(self, df, errors="raise"):
+        """Encoded copy of df's feature columns, for training and batch scoring.
+
+        With errors="coerce", unknown or missing labels and non-numeric values
+        become NaN instead of raising ValueError.
+        """
+        import pandas as pd
+
+        out = {}
+        for col in self.features:
+            if col in self.codes:
+                codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+                if errors == "coerce":
+                    known = self.codes[col]
+                    table = np.array([known.get(normalize_label(u), np.nan) if pd.notna(u) else np.nan
+                                      for u in uniques], dtype=np.float64)
+                else:
+                    table = np.array([self.code(col, u) for u in uniques], dtype=np.int64)
+                out[col] = table[codes]
+            elif errors == "coerce":
+                out[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+            else:
+                out[col] = df[col].to_numpy()
+        return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,139 @@
+# ================================
+# Flat Forest Artifact
+# ================================
+# A compact on-disk form of the compiled ForestEngine that the app can
+# memory-map instead of unpickling. The file is a small JSON header followed
+# by the node arrays at 64-byte aligned offsets:
+#
+#   feature     int16    split feature per node (0 on leaves)
+#   threshold   float32  split threshold per node
+#   children    int32    interleaved left/right child per node
+#   roots       int32    root node of every tree
+#   leaf_class  uint8/16 class index per node, when every leaf is pure
+#   leaf_value  float64  class probabilities per node, otherwise
+#
+# Loaded arrays are read-only views of one shared mapping, so every server
+# process on the machine shares a single physical copy through the page
+# cache, and loading costs a header parse rather than an unpickle.
+#
+# Thresholds are rounded down to float32. Inputs are float32 already, and for
+# a float32 x, x <= t holds exactly when x <= (largest float32 <= t), so the
+# smaller thresholds do not change any prediction.
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from forest_engine import ForestEngine
+
+MAGIC = b"TMWFRST1"
+ALIGN = 64
+
+
+def forest_path(model_path):
+    """suicide_risk_model.pkl -> suicide_risk_model.forest"""
+    return os.path.splitext(model_path)[0] + ".forest"
+
+
+def _floor_float32(values):
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _compact_arrays(engine):
+    arrays = {
+        "feature": engine.feature.astype(np.int16),
+        "threshold": _floor_float32(np.asarray(engine.threshold, dtype=np.float64)),
+        "children": engine.children.astype(np.int32),
+        "roots": engine.roots.astype(np.int32),
+    }
+    if engine.n_features > np.iinfo(np.int16).max:
+        raise ValueError("Too many features for an int16 feature array")
+
+    if engine.leaf_value is None:
+        arrays["leaf_class"] = engine.leaf_class
+        return arrays
+
+    # Leaves are the nodes that loop back to themselves
+    node_ids = np.arange(len(engine.feature))
+    is_leaf = engine.children[0::2] == node_ids
+    leaf_class = np.argmax(engine.leaf_value, axis=1)
+    one_hot = np.eye(engine.n_classes)[leaf_class]
+    if np.array_equal(engine.leaf_value[is_leaf], one_hot[is_leaf]):
+        dtype = np.uint8 if engine.n_classes <= 256 else np.uint16
+        arrays["leaf_class"] = np.where(is_leaf, leaf_class, 0).astype(dtype)
+    else:
+        arrays["leaf_value"] = engine.leaf_value.astype(np.float64)
+    return arrays
+
+
+def export_forest(model, path):
+    """Write model (a fitted forest or a ForestEngine) as a flat artifact.
+
+    The file is written next to path and renamed into place, so a running app
+    never maps a half-written artifact.
+    """
+    engine = model if isinstance(model, ForestEngine) else ForestEngine.from_sklearn(model)
+    arrays = _compact_arrays(engine)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header = json.dumps({
+        "max_depth": int(engine.max_depth),
+        "n_features": int(engine.n_features),
+        "classes": engine.classes.tolist(),
+        "feature_names": engine.feature_names,
+        "arrays": layout,
+    }).encode("utf-8")
+    # Array offsets are relative to the first aligned byte after the header
+    data_start = -(-(len(MAGIC) + 4 + len(header)) // ALIGN) * ALIGN
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+def load_forest(path):
+    """Memory-map a flat artifact as a ForestEngine with read-only arrays."""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a flat forest artifact")
+        (header_len,) = struct.unpack("<I", prefix[len(MAGIC):])
+        header = json.loads(f.read(header_len))
+
+    data_start = -(-(len(MAGIC) + 4 + header_len) // ALIGN) * ALIGN
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        start = data_start + spec["offset"]
+        arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count, offset=start).reshape(spec["shape"])
+
+    return ForestEngine(
+        feature=arrays["feature"],
+        threshold=arrays["threshold"],
+        children=arrays["children"],
+        leaf_value=arrays.get("leaf_value"),
+        roots=arrays["roots"],
+        max_depth=header["max_depth"],
+        classes=np.array(header["classes"]),
+        n_features=header["n_features"],
+        feature_names=header["feature_names"],
+        leaf_class=arrays.get("leaf_class"),
+    )
@@ -0,0 +1,134 @@
+# ================================
+# Array-based RandomForest Inference
+# ================================
+# Flattens a fitted sklearn RandomForestClassifier into contiguous NumPy node
+# arrays and walks every tree at once, for a single row or a whole batch.
+# Predictions match model.predict bit for bit: inputs are rounded to float32
+# exactly like sklearn does, leaf probabilities are summed tree by tree in
+# estimator order, and the mean is taken the same way.
+
+import numpy as np
+
+# Upper bound on (trees x rows) node indices held at once while walking;
+# small enough for the working set to stay in cache
+CHUNK_ELEMENTS = 1 << 17
+
+
+class ForestEngine:
+    def __init__(self, feature, threshold, children, leaf_value, roots,
+                 max_depth, classes, n_features, feature_names=None, leaf_class=None):
+        self.feature = feature
+        self.threshold = threshold
+        # children[2 * node + went_right] is the next node
+        self.children = children
+        # Per-node class probabilities, or for forests whose leaves are all
+        # pure just the leaf's class index (leaf_value is then None)
+        self.leaf_value = leaf_value
+        self.leaf_class = leaf_class
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes = classes
+        self.feature_names = feature_names
+        self.n_features = n_features
+        self.n_trees = len(roots)
+        self.n_classes = len(classes)
+        self._one_hot = np.eye(self.n_classes, dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Compile a fitted RandomForestClassifier into flat node arrays."""
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests are supported")
+
+        n_classes = int(forest.n_classes_)
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(offset, offset + n, dtype=np.int32)
+
+            # Leaves point back at themselves and always go "left", so every
+            # tree can be walked for max_depth steps without any branching.
+            left = np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.int32)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.int32)
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+            threshold = np.where(is_leaf, np.inf, tree.threshold).astype(np.float64)
+
+            value = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            totals = value.sum(axis=1)
+            if not np.allclose(totals[totals > 0], 1.0):
+                # Older sklearn stores weighted counts and normalizes at predict time
+                totals[totals == 0.0] = 1.0
+                value /= totals[:, np.newaxis]
+
+            features.append(feature)
+            thresholds.append(threshold)
+            children.append(np.stack([left, right], axis=1).ravel())
+            values.append(value)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, int(tree.max_depth))
+
+        feature_names = getattr(forest, "feature_names_in_", None)
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            children=np.ascontiguousarray(np.concatenate(children)),
+            leaf_value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            n_features=int(forest.n_features_in_),
+            feature_names=None if feature_names is None else list(feature_names),
+        )
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns"):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        return X
+
+    def _leaves(self, X):
+        """Leaf node index reached in every tree, shape (n_trees, n_rows)."""
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int32) * n_features)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            values = flat.take(row_offset + self.feature.take(nodes))
+            went_right = values > self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + went_right)
+        return nodes
+
+    def predict_proba(self, X):
+        X = self._as_matrix(X)
+        proba = np.empty((X.shape[0], self.n_classes), dtype=np.float64)
+        chunk = max(1, CHUNK_ELEMENTS // max(self.n_trees, 1))
+
+        for start in range(0, X.shape[0], chunk):
+            leaves = self._leaves(X[start:start + chunk])
+            if self.leaf_value is not None:
+                values = self.leaf_value.take(leaves, axis=0)
+            else:
+                # Pure leaves: each tree votes 1.0 for its class, exactly the
+                # one-hot probabilities sklearn stores for them
+                values = self._one_hot.take(self.leaf_class.take(leaves), axis=0)
+            # Reducing over the tree axis adds one tree at a time in estimator
+            # order, the same summation sklearn performs
+            np.add.reduce(values, axis=0, out=proba[start:start + chunk])
+
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
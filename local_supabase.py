@@ -0,0 +1,336 @@
+# ================================
+# Local Supabase Stand-in
+# ================================
+# A small in-memory imitation of the PostgREST endpoints the app uses, for
+# exercising the client, the spool replayer and the pages without a real
+# Supabase project. It supports:
+#   GET  /rest/v1/<table>  select, col=eq./neq./gt./gte./lt./lte./in./ilike./is.,
+#                          not., or=(...)/and=(...), order, limit, offset,
+#                          Range header, Prefer count=exact/estimated/planned
+#   POST /rest/v1/<table>  one record or a JSON array, on_conflict with
+#                          Prefer resolution=ignore-duplicates
+#   POST /rest/v1/rpc/<fn> Python stand-ins for the SQL functions in sql/
+# Latency and failures can be injected to simulate a slow or flaky backend.
+#
+# Usage: python local_supabase.py [--port 54321] [--latency 0.05] [--fail-rate 0.1]
+# then point SUPABASE_URL at http://127.0.0.1:<port>.
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from appointment_store import normalize_name
+from dashboard_data import DASHBOARD_COUNTS_RPC, dashboard_counts_rows
+
+# Stand-ins for generated columns defined in sql/
+GENERATED_COLUMNS = {
+    "appointments": {"name_key": lambda row: normalize_name(row.get("name"))},
+}
+
+
+def sample_user_records(n, seed=1):
+    """n random user_records rows (raw answers and a risk level) for seeding."""
+    rng = random.Random(seed)
+    return [{
+        "gender": rng.choice(["Male", "Female"]),
+        "age": rng.randint(18, 34),
+        "academic_pressure": rng.randint(1, 5),
+        "study_satisfaction": rng.randint(1, 5),
+        "sleep_duration": rng.choice(["less than 5 hours", "5 - 6 hours", "7 - 8 hours", "more than 8 hours"]),
+        "dietary_habits": rng.choice(["unhealthy", "moderate", "healthy"]),
+        "suicidal_thoughts": rng.choice(["yes", "no"]),
+        "study_hours": rng.randint(0, 12),
+        "financial_stress": rng.randint(1, 5),
+        "family_history": rng.choice(["yes", "no"]),
+        "depression": rng.choice(["yes", "no"]),
+        "predicted_risk": rng.choice(["Low", "Medium", "High"]),
+        "timestamp": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00",
+    } for _ in range(n)]
+
+
+def _coerce(value):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _split_terms(text):
+    """The top-level comma-separated terms of a logic tree, e.g. a,and(b,c),d"""
+    terms, depth, quoted, escaped, start = [], 0, False, False, 0
+    for i, ch in enumerate(text):
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = quoted
+        elif ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            terms.append(text[start:i])
+            start = i + 1
+    terms.append(text[start:])
+    return terms
+
+
+def _filter(row, column, expression):
+    """One query parameter: col=op.value, or or=(...)/and=(...) of such terms."""
+    if column in ("or", "and"):
+        results = (_filter(row, *_term(term)) for term in _split_terms(expression[1:-1]))
+        return any(results) if column == "or" else all(results)
+    return _matches(row, column, expression)
+
+
+def _term(term):
+    if term.startswith(("or(", "and(")):
+        op, _, rest = term.partition("(")
+        return op, "(" + rest
+    column, _, expression = term.partition(".")
+    return column, expression
+
+
+def _matches(row, column, expression):
+    op, _, raw = expression.partition(".")
+    if op == "not":
+        return not _matches(row, column, raw)
+    if len(raw) > 1 and raw[0] == raw[-1] == '"':
+        raw = raw[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    value = row.get(column)
+    if op == "is":
+        return value is None if raw == "null" else value == (raw == "true")
+    target = _coerce(raw)
+    if op == "eq":
+        return value == target or str(value) == raw
+    if op == "neq":
+        return not (value == target or str(value) == raw)
+    if op == "in":
+        options = raw.strip("()").split(",")
+        return str(value) in options
+    if op == "ilike":
+        pattern = raw.replace("*", "%").lower().strip("%")
+        return value is not None and pattern in str(value).lower()
+    if value is None:
+        return False
+    try:
+        if op == "gt":
+            return value > target
+        if op == "gte":
+            return value >= target
+        if op == "lt":
+            return value < target
+        if op == "lte":
+            return value <= target
+    except TypeError:
+        value, target = str(value), raw
+        return {"gt": value > target, "gte": value >= target,
+                "lt": value < target, "lte": value <= target}[op]
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class LocalSupabase:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.tables = {}
+        self.request_count = 0
+        self._ids = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.rpcs = {
+            DASHBOARD_COUNTS_RPC: lambda args: dashboard_counts_rows(self.snapshot("user_records")),
+        }
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ---------- table operations ----------
+    def snapshot(self, table):
+        with self._lock:
+            return list(self.tables.get(table, []))
+
+    def insert(self, table, rows, on_conflict=None, ignore_duplicates=False):
+        with self._lock:
+            data = self.tables.setdefault(table, [])
+            seen = {r.get(on_conflict) for r in data} if on_conflict else set()
+            inserted = []
+            for row in rows:
+                row = dict(row)
+                if on_conflict and row.get(on_conflict) in seen:
+                    if ignore_duplicates:
+                        continue
+                    raise KeyError(f"duplicate key value violates unique constraint on {on_conflict}")
+                for column, compute in GENERATED_COLUMNS.get(table, {}).items():
+                    row[column] = compute(row)
+                if "id" not in row:
+                    self._ids[table] = self._ids.get(table, 0) + 1
+                    row["id"] = self._ids[table]
+                data.append(row)
+                inserted.append(row)
+                if on_conflict:
+                    seen.add(row.get(on_conflict))
+            return inserted
+
+    def select(self, table, filters=(), order=None, offset=0, limit=None):
+        with self._lock:
+            rows = [r for r in self.tables.get(table, [])
+                    if all(_filter(r, col, expr) for col, expr in filters)]
+        if order:
+            # Stable sorts from the last key to the first, like ORDER BY a, b
+            for part in reversed(order.split(",")):
+                column, _, direction = part.partition(".")
+                present = [r for r in rows if r.get(column) is not None]
+                missing = [r for r in rows if r.get(column) is None]
+                present.sort(key=lambda r: r[column], reverse=direction.startswith("desc"))
+                rows = missing + present if "nullsfirst" in direction else present + missing
+        total = len(rows)
+        end = total if limit is None else offset + limit
+        return rows[offset:end], total
+
+    # ---------- HTTP ----------
+    def _handler_class(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=None, headers=None):
+                payload = b"" if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _start(self):
+                with store._lock:
+                    store.request_count += 1
+                if store.latency:
+                    time.sleep(store.latency)
+                if store.fail_rate and store._random.random() < store.fail_rate:
+                    self._send(503, {"message": "injected failure"})
+                    return None
+                parts = urlsplit(self.path)
+                if not parts.path.startswith("/rest/v1/"):
+                    self._send(404, {"message": "not found"})
+                    return None
+                return parts.path[len("/rest/v1/"):], parse_qsl(parts.query)
+
+            def do_GET(self):
+                started = self._start()
+                if started is None:
+                    return
+                table, query = started
+                filters, order, offset, limit = [], None, 0, None
+                for key, value in query:
+                    if key == "select":
+                        continue
+                    elif key == "order":
+                        order = value
+                    elif key == "offset":
+                        offset = int(value)
+                    elif key == "limit":
+                        limit = int(value)
+                    else:
+                        filters.append((key, value))
+
+                range_header = self.headers.get("Range")
+                if range_header:
+                    first, _, last = range_header.split("=")[-1].partition("-")
+                    offset = int(first)
+                    limit = int(last) - offset + 1 if last else None
+
+                try:
+                    rows, total = store.select(table, filters, order, offset, limit)
+                except ValueError as e:
+                    self._send(400, {"message": str(e)})
+                    return
+                end = offset + len(rows) - 1
+                count = str(total) if "count=" in self.headers.get("Prefer", "") else "*"
+                content_range = f"{offset}-{end}/{count}" if rows else f"*/{count}"
+                self._send(200, rows, {"Content-Range": content_range})
+
+            def do_POST(self):
+                started = self._start()
+                if started is None:
+                    return
+                table, query = started
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"null")
+                except ValueError:
+                    self._send(400, {"message": "invalid JSON"})
+                    return
+                if table.startswith("rpc/"):
+                    function = store.rpcs.get(table[len("rpc/"):])
+                    if function is None:
+                        self._send(404, {"code": "PGRST202", "message": f"Could not find function {table}"})
+                    else:
+                        self._send(200, function(body or {}))
+                    return
+
+                rows = body if isinstance(body, list) else [body]
+                params = dict(query)
+                prefer = self.headers.get("Prefer", "")
+                try:
+                    inserted = store.insert(
+                        table, rows, on_conflict=params.get("on_conflict"),
+                        ignore_duplicates="resolution=ignore-duplicates" in prefer,
+                    )
+                except KeyError as e:
+                    self._send(409, {"message": str(e)})
+                    return
+                if "return=representation" in prefer:
+                    self._send(201, inserted)
+                else:
+                    self._send(201)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local PostgREST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = LocalSupabase(args.host, args.port, args.latency, args.fail_rate)
+    print(f"Local Supabase stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
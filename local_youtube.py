@@ -0,0 +1,120 @@
+# ================================
+# Local YouTube Search Stand-in
+# ================================
+# Answers GET /youtube/v3/search like the YouTube Data API does for the
+# playlist page (items[].id.videoId), without an API key or quota, so the
+# app and YouTubeSearch can be exercised offline. Each query always returns
+# the same videos. Latency and failures can be injected, and a quota can be
+# set after which every call gets the API's 403 quotaExceeded answer.
+#
+# Usage: python local_youtube.py [--port 54322] [--latency 0.2] [--quota 100]
+# then point YOUTUBE_SEARCH_URL at http://127.0.0.1:<port>/youtube/v3/search.
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_PATH = "/youtube/v3/search"
+
+
+def video_ids(query, n):
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    return [f"{digest[:8]}{i:03d}" for i in range(n)]
+
+
+class LocalYouTube:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_rate=0.0, quota=None, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.quota = quota
+        self.request_count = 0
+        self.queries = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path != SEARCH_PATH:
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                query = parse_qs(parts.query)
+                q = query.get("q", [""])[0]
+                with api._lock:
+                    api.request_count += 1
+                    api.queries[q] = api.queries.get(q, 0) + 1
+                    over_quota = api.quota is not None and api.request_count > api.quota
+                if api.latency:
+                    time.sleep(api.latency)
+                if over_quota:
+                    self._send(403, {"error": {"errors": [{"reason": "quotaExceeded"}],
+                                               "message": "quotaExceeded"}})
+                    return
+                if api.fail_rate and api._random.random() < api.fail_rate:
+                    self._send(503, {"error": {"message": "injected failure"}})
+                    return
+                n = int(query.get("maxResults", ["5"])[0])
+                self._send(200, {"items": [{"id": {"kind": "youtube#video", "videoId": vid}}
+                                           for vid in video_ids(q, n)]})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local YouTube search stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54322)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--quota", type=int, default=None, help="requests before quotaExceeded")
+    args = parser.parse_args()
+
+    server = LocalYouTube(args.host, args.port, args.latency, args.fail_rate, args.quota)
+    print(f"Local YouTube stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
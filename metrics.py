@@ -0,0 +1,225 @@
+# ================================
+# Hot-path Metrics
+# ================================
+# Timers and counters for the steps a rerun spends its time in (page runs,
+# model load and predict, Supabase calls, YouTube searches, chart building),
+# shared by all sessions of the server process and exported in the
+# Prometheus text format:
+#
+#   with metrics.span("predict"):
+#       ...
+#   metrics.inc("records_submitted")
+#
+# A span costs two perf_counter() calls, a bisect and one short lock, so the
+# instrumentation can stay on in production. Spans that exit with an
+# Exception also count an error; Streamlit's rerun/stop signals derive from
+# BaseException and are not errors. Collectors export the counters the
+# caches already keep (hits, misses, ...) when the metrics are scraped.
+#
+# serve_metrics() exposes GET /metrics on a local port for Prometheus.
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "tellmewai"
+
+# Upper bounds (seconds) of the span histogram buckets
+SPAN_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_key(labels):
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, buckets=SPAN_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf overflow
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Span:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        error = exc_type is not None and issubclass(exc_type, Exception)
+        self.metrics.observe(self.name, time.perf_counter() - self.start, error=error, **self.labels)
+        return False
+
+
+class Metrics:
+    def __init__(self, buckets=SPAN_BUCKETS, prefix=PREFIX):
+        self.buckets = buckets
+        self.prefix = prefix
+        self._histograms = {}   # (span, label key) -> Histogram
+        self._errors = {}       # (span, label key) -> count
+        self._counters = {}     # (name, label key) -> value
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def span(self, name, **labels):
+        """Context manager timing one step into the span histogram."""
+        return Span(self, name, labels)
+
+    def observe(self, name, seconds, error=False, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+            if error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_collector(self, name, collect, counters=()):
+        """Export collect() (e.g. a cache's stats()) when metrics are scraped.
+
+        Numeric values become <prefix>_<name>_<key>; keys listed in counters
+        are monotonically increasing and exported as <prefix>_<name>_<key>_total.
+        """
+        with self._lock:
+            self._collectors.append((name, collect, frozenset(counters)))
+
+    def summary(self):
+        """Per span: count, errors, mean and bucket-estimated p50/p99 (seconds)."""
+        with self._lock:
+            items = [(key, h.count, h.sum, h.quantile(0.5), h.quantile(0.99), self._errors.get(key, 0))
+                     for key, h in self._histograms.items()]
+        return [{
+            "span": name,
+            "labels": dict(labels),
+            "count": count,
+            "errors": errors,
+            "mean": total / count,
+            "p50": p50,
+            "p99": p99,
+        } for (name, labels), count, total, p50, p99, errors in sorted(items)]
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = [(key, list(h.counts), h.count, h.sum) for key, h in sorted(self._histograms.items())]
+            errors = sorted(self._errors.items())
+            counters = sorted(self._counters.items())
+            collectors = list(self._collectors)
+
+        family = f"{self.prefix}_span_seconds"
+        lines = [f"# HELP {family} Time spent in instrumented app steps.",
+                 f"# TYPE {family} histogram"]
+        for (name, labels), counts, count, total in histograms:
+            key = (("span", name),) + labels
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(f"{family}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{family}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{family}_count{_format_labels(key)} {count}")
+
+        family = f"{self.prefix}_span_errors_total"
+        lines += [f"# HELP {family} Instrumented steps that raised an exception.",
+                  f"# TYPE {family} counter"]
+        for (name, labels), n in errors:
+            lines.append(f"{family}{_format_labels((('span', name),) + labels)} {n}")
+
+        names = []
+        for (name, _), _ in counters:
+            if name not in names:
+                names.append(name)
+        for name in names:
+            family = f"{self.prefix}_{name}_total"
+            lines += [f"# TYPE {family} counter"]
+            lines += [f"{family}{_format_labels(labels)} {_format_value(value)}"
+                      for (n, labels), value in counters if n == name]
+
+        for name, collect, counter_keys in collectors:
+            try:
+                values = collect()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if key in counter_keys:
+                    family, kind = f"{self.prefix}_{name}_{key}_total", "counter"
+                else:
+                    family, kind = f"{self.prefix}_{name}_{key}", "gauge"
+                lines += [f"# TYPE {family} {kind}", f"{family} {_format_value(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, host="127.0.0.1", port=9464):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,320 @@
+# ================================
+# Versioned Model Deployment
+# ================================
+# Trained models are published into models/<version>/ (flat artifact and
+# encoder) and listed in models/manifest.json, whose "current" entry
+# is the version to serve. `python "suicide risk.py" --publish` publishes a
+# new version; `python model_deploy.py list|promote <version>` inspects the
+# manifest or rolls back.
+#
+# ModelDeployment serves the current version with the same get()/stats()
+# interface as ModelRegistry. A background thread polls the manifest; when
+# "current" changes it loads the new version off the request path, checks
+# it on the holdout sample in models/holdout.csv (macro-F1 must reach
+# min_macro_f1 and not drop more than max_f1_drop below the served
+# version), warms it up, and only then replaces the served model with a
+# single reference assignment. Requests never wait on a load, and a version
+# that fails validation is never served: a process that starts while the
+# manifest's "current" is a bad version serves the newest earlier version
+# that passes instead.
+#
+# `promote` also stamps the manifest with "promoted_at". Running processes
+# take that as an operator's decision: they retry the version even if they
+# rejected it before, and only hold it to the min_macro_f1 floor, so rolling
+# back to an older, slightly weaker version is not blocked by max_f1_drop.
+#
+# build_registry() is the one place that decides what is served: the app,
+# the scoring service and batch scoring all go through it.
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from feature_encoding import RECORD_FEATURES, FeatureEncoder, encoder_path
+from forest_artifact import export_forest, forest_path, load_forest
+from forest_engine import ForestEngine
+from model_registry import LoadedModel, ModelRegistry, rss_bytes
+
+MODEL_PATH = "suicide_risk_model.pkl"
+MODELS_DIR = "models"
+MANIFEST = "manifest.json"
+HOLDOUT = "holdout.csv"
+TARGET = "Risk_Level"
+
+
+def manifest_path(models_dir=MODELS_DIR):
+    return os.path.join(models_dir, MANIFEST)
+
+
+def read_manifest(models_dir=MODELS_DIR):
+    with open(manifest_path(models_dir), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, models_dir=MODELS_DIR):
+    """Replace the manifest atomically, so readers never see half of it."""
+    path = manifest_path(models_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def publish(model, encoder, models_dir=MODELS_DIR, metrics=None, holdout=None, make_current=True):
+    """Write a new model version and (by default) make it the served one.
+
+    holdout: raw answers plus Risk_Level codes, saved as models/holdout.csv
+    the first time a version is published.
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    staging = os.path.join(models_dir, ".staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    export_forest(model, os.path.join(staging, "model.forest"))
+    encoder.save(os.path.join(staging, "model.encoder.json"))
+
+    with open(os.path.join(staging, "model.forest"), "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    version = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S") + "-" + digest[:8]
+    os.replace(staging, os.path.join(models_dir, version))
+
+    if holdout is not None and not os.path.exists(os.path.join(models_dir, HOLDOUT)):
+        holdout.to_csv(os.path.join(models_dir, HOLDOUT), index=False)
+
+    try:
+        manifest = read_manifest(models_dir)
+    except FileNotFoundError:
+        manifest = {"current": None, "versions": []}
+    manifest["versions"].append({
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "sha256": digest,
+        "metrics": metrics or {},
+    })
+    if make_current:
+        manifest["current"] = version
+    write_manifest(manifest, models_dir)
+    return version
+
+
+def load_version(models_dir, version):
+    """Load one published version as a LoadedModel (version = version id)."""
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    path = os.path.join(models_dir, version, "model.forest")
+    engine = load_forest(path)
+    encoder = FeatureEncoder.load(os.path.join(models_dir, version, "model.encoder.json"))
+    if engine.feature_names is not None and list(engine.feature_names) != list(encoder.features):
+        raise ValueError(f"Model {version}: encoder columns do not match the model")
+    elapsed = time.perf_counter() - start
+    rss_after = rss_bytes()
+    memory = None if rss_before is None or rss_after is None else max(rss_after - rss_before, 0)
+    return LoadedModel(engine, path, version, elapsed, memory, encoder=encoder)
+
+
+def macro_f1(y_true, y_pred):
+    """sklearn's f1_score(average="macro"), without importing sklearn in the app."""
+    y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+    scores = []
+    for label in np.union1d(y_true, y_pred):
+        tp = np.sum((y_true == label) & (y_pred == label))
+        wrong = np.sum((y_true == label) != (y_pred == label))
+        scores.append(2 * tp / (2 * tp + wrong))
+    return float(np.mean(scores))
+
+
+def holdout_score(loaded, holdout):
+    """Macro-F1 of loaded on the holdout answers (through its own encoder)."""
+    answers = holdout.rename(columns=RECORD_FEATURES)
+    X = loaded.encoder.transform(answers).to_numpy(dtype=np.float32)
+    return macro_f1(holdout[TARGET], loaded.predictor.predict(X))
+
+
+class ModelDeployment:
+    def __init__(self, models_dir=MODELS_DIR, poll_interval=30.0, min_macro_f1=0.8,
+                 max_f1_drop=0.02, watch=True):
+        self.models_dir = models_dir
+        self.poll_interval = poll_interval
+        self.min_macro_f1 = min_macro_f1
+        self.max_f1_drop = max_f1_drop
+        self._holdout = None
+        self._manifest_mtime = None
+
+        self.swaps = 0
+        self.rejected = {}          # version -> reason
+        self.last_error = None
+        self.last_check = None
+        self.current_f1 = None
+
+        manifest = read_manifest(models_dir)
+        self._promoted_at = manifest.get("promoted_at")
+        self._current, self.current_f1 = self._load_first(manifest)
+        self.load_count = 1
+
+        if watch:
+            threading.Thread(target=self._watch, name="model-watcher", daemon=True).start()
+
+    def _load_first(self, manifest):
+        """(LoadedModel, holdout macro-F1) of the newest servable version.
+
+        The manifest's current version stays current after running processes
+        reject it, so it is validated here too, falling back to the versions
+        published before it, newest first.
+        """
+        current = manifest["current"]
+        versions = [entry["version"] for entry in manifest["versions"]]
+        older = versions[:versions.index(current)] if current in versions else []
+        for version in [current] + older[::-1]:
+            try:
+                loaded = load_version(self.models_dir, version)
+                return loaded, self._validate(loaded)
+            except Exception as e:
+                self.rejected[version] = str(e)
+                self.last_error = f"{version}: {e}"
+        # None passes: serving the current version beats serving nothing
+        self.rejected.pop(current, None)
+        loaded = load_version(self.models_dir, current)
+        return loaded, self._validate(loaded, gate=False)
+
+    def get(self):
+        """The served LoadedModel; a plain attribute read, never blocks."""
+        return self._current
+
+    @property
+    def model(self):
+        return self._current.model
+
+    @property
+    def predictor(self):
+        return self._current.predictor
+
+    def _holdout_frame(self):
+        path = os.path.join(self.models_dir, HOLDOUT)
+        if self._holdout is None and os.path.exists(path):
+            self._holdout = pd.read_csv(path)
+        return self._holdout
+
+    def _validate(self, candidate, gate=True, relative=True):
+        holdout = self._holdout_frame()
+        if holdout is None:
+            # Still make sure the model answers, and page its arrays in
+            candidate.predictor.predict(np.zeros((1, len(candidate.encoder.features)), dtype=np.float32))
+            return None
+        score = holdout_score(candidate, holdout)
+        if gate:
+            if score < self.min_macro_f1:
+                raise ValueError(f"holdout macro-F1 {score:.3f} below {self.min_macro_f1}")
+            if relative and self.current_f1 is not None and score < self.current_f1 - self.max_f1_drop:
+                raise ValueError(f"holdout macro-F1 {score:.3f} vs {self.current_f1:.3f} served")
+        return score
+
+    def check(self):
+        """Load, validate and swap in the manifest's current version if it changed."""
+        self.last_check = time.time()
+        try:
+            mtime = os.stat(manifest_path(self.models_dir)).st_mtime_ns
+            if mtime == self._manifest_mtime:
+                return False
+            manifest = read_manifest(self.models_dir)
+            version = manifest["current"]
+            self._manifest_mtime = mtime
+        except (OSError, ValueError, KeyError) as e:
+            self.last_error = f"manifest: {e}"
+            return False
+
+        promoted = manifest.get("promoted_at") != self._promoted_at
+        if promoted:
+            # Explicitly promoted: try it again even if it was rejected before
+            self._promoted_at = manifest.get("promoted_at")
+            self.rejected.pop(version, None)
+        if version == self._current.version or version in self.rejected:
+            return False
+        try:
+            candidate = load_version(self.models_dir, version)
+            score = self._validate(candidate, relative=not promoted)
+        except Exception as e:
+            self.rejected[version] = str(e)
+            self.last_error = f"{version}: {e}"
+            return False
+
+        self._current = candidate
+        self.current_f1 = score
+        self.load_count += 1
+        self.swaps += 1
+        return True
+
+    def _watch(self):
+        while True:
+            self.check()
+            time.sleep(self.poll_interval)
+
+    def stats(self):
+        current = self._current
+        return {
+            "path": current.path,
+            "loaded": True,
+            "version": current.version,
+            "load_seconds": current.load_seconds,
+            "memory_bytes": current.memory_bytes,
+            "loaded_at": current.loaded_at,
+            "load_count": self.load_count,
+            "holdout_macro_f1": self.current_f1,
+            "swaps": self.swaps,
+            "rejected": dict(self.rejected),
+            "last_error": self.last_error,
+        }
+
+
+def load_encoder(model_path):
+    return FeatureEncoder.load(encoder_path(model_path))
+
+
+def build_registry(model_path=MODEL_PATH, models_dir=MODELS_DIR, **options):
+    """The served model, behind get()/stats(): the published versions if
+    models_dir has a manifest (options go to ModelDeployment), else the flat
+    .forest artifact next to model_path, else the pickle compiled into the
+    same flat arrays."""
+    if os.path.exists(manifest_path(models_dir)):
+        return ModelDeployment(models_dir, **options)
+    if os.path.exists(forest_path(model_path)):
+        return ModelRegistry(forest_path(model_path), loader=load_forest, encoder_loader=load_encoder)
+    return ModelRegistry(model_path, compiler=ForestEngine.from_sklearn, encoder_loader=load_encoder)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or roll back published models")
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    promote = sub.add_parser("promote", help="serve an already published version")
+    promote.add_argument("version")
+    args = parser.parse_args(argv)
+
+    manifest = read_manifest(args.models_dir)
+    if args.command == "list":
+        for entry in manifest["versions"]:
+            mark = "*" if entry["version"] == manifest["current"] else " "
+            print(f"{mark} {entry['version']}  {entry['created_at']}  {entry.get('metrics', {})}")
+        return 0
+
+    if args.version not in {e["version"] for e in manifest["versions"]}:
+        print(f"Unknown version {args.version}", file=sys.stderr)
+        return 1
+    manifest["current"] = args.version
+    manifest["promoted_at"] = datetime.now(timezone.utc).isoformat()
+    write_manifest(manifest, args.models_dir)
+    print(f"✅ {args.version} is now current; running apps switch after validating it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# ================================
+# Process-wide Model Registry
+# ================================
+# Streamlit re-executes app.py on every widget change, so the model must not
+# be loaded at script level. The registry keeps one loaded copy per process,
+# shared read-only by every session, and only reloads when the artifact file
+# on disk changes (different mtime or size).
+
+import os
+import threading
+import time
+
+
+class LoadedModel:
+    """A loaded artifact plus the bookkeeping about how it was loaded."""
+
+    def __init__(self, model, path, version, load_seconds, memory_bytes, engine=None, encoder=None):
+        self.model = model
+        self.engine = engine
+        self.encoder = encoder
+        self.path = path
+        self.version = version
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.loaded_at = time.time()
+
+    @property
+    def predictor(self):
+        """The compiled engine if one was built, otherwise the raw model."""
+        return self.engine if self.engine is not None else self.model
+
+    @property
+    def version_id(self):
+        """Printable version: the published version id, or file name and mtime."""
+        if isinstance(self.version, str):
+            return self.version
+        return f"{os.path.basename(self.path)}@{self.version[0]}"
+
+
+def rss_bytes():
+    """Current resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def load_pickle(path):
+    # joblib is only imported when a pickle is actually loaded
+    import joblib
+    return joblib.load(path)
+
+
+def file_version(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ModelRegistry:
+    def __init__(self, path, loader=load_pickle, compiler=None, encoder_loader=None):
+        self.path = path
+        self.loader = loader
+        # Optional callable turning the loaded model into a faster predictor
+        self.compiler = compiler
+        # Optional callable loading the feature encoder saved with the model;
+        # it is reloaded together with the model so the two never mismatch
+        self.encoder_loader = encoder_loader
+        self._lock = threading.Lock()
+        self._current = None
+        self.load_count = 0
+
+    def _load(self, version):
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        model = self.loader(self.path)
+        engine = self.compiler(model) if self.compiler is not None else None
+        encoder = self.encoder_loader(self.path) if self.encoder_loader is not None else None
+        elapsed = time.perf_counter() - start
+        rss_after = rss_bytes()
+
+        memory = None
+        if rss_before is not None and rss_after is not None:
+            memory = max(rss_after - rss_before, 0)
+
+        self.load_count += 1
+        return LoadedModel(model, self.path, version, elapsed, memory, engine, encoder)
+
+    def get(self):
+        """Return the current LoadedModel, reloading if the file changed."""
+        version = file_version(self.path)
+        current = self._current
+        if current is not None and current.version == version:
+            return current
+
+        with self._lock:
+            # Another session may have reloaded while we waited for the lock
+            current = self._current
+            if current is None or current.version != version:
+                current = self._load(version)
+                self._current = current
+            return current
+
+    @property
+    def model(self):
+        return self.get().model
+
+    @property
+    def predictor(self):
+        return self.get().predictor
+
+    def stats(self):
+        current = self._current
+        if current is None:
+            return {"path": self.path, "loaded": False, "load_count": self.load_count}
+        return {
+            "path": self.path,
+            "loaded": True,
+            "version": current.version,
+            "load_seconds": current.load_seconds,
+            "memory_bytes": current.memory_bytes,
+            "loaded_at": current.loaded_at,
+            "load_count": self.load_count,
+        }
@@ -0,0 +1,198 @@
+# ================================
+# Hyperparameter Search
+# ================================
+# Cross-validated search over RandomForest size, depth and class weighting,
+# used by `python "suicide risk.py" --search`. Every (config, fold) fit is an
+# independent task on a process pool sized to the machine, and its macro-F1
+# is written to the cache directory, so a rerun (or a run after a crash)
+# only fits what is missing. Cache entries are keyed by a hash of the
+# training data and the CV settings, so new data never reuses old scores.
+#
+# Workers are forked after the training data and folds are stored in a
+# module global, so they inherit them and never re-run the training script;
+# each task only carries a fold number and a config. Where fork is
+# unavailable (Windows) the fits run in this process instead.
+#
+# Each config's fold-0 forest is also exported as a flat artifact; after the
+# pool finishes, single-row latency is measured on it sequentially, with the
+# same ForestEngine the app serves from and without other fits competing for
+# the CPU. The chosen config is the most accurate one on the Pareto front of
+# macro-F1 against latency that fits the latency budget.
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from forest_artifact import export_forest, load_forest
+
+GRID = {
+    "n_estimators": [25, 50, 100, 200],
+    "max_depth": [None, 6, 10],
+    "class_weight": ["balanced", "balanced_subsample", None],
+}
+
+N_FOLDS = 5
+RANDOM_STATE = 42
+
+# (X, y, folds) of the running search, inherited by the forked workers
+_data = None
+
+
+def grid_configs(grid=GRID):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def config_key(config):
+    return "-".join(f"{k}={config[k]}" for k in sorted(config))
+
+
+def data_key(X, y, n_folds=N_FOLDS, random_state=RANDOM_STATE):
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    digest.update(f"{n_folds}/{random_state}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _fit_fold(X, y, train_idx, test_idx, config, result_path, forest_file):
+    """One CV fit; runs in a pool worker and writes its own cache entry."""
+    start = time.perf_counter()
+    model = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=1, **config)
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - start
+    score = f1_score(y[test_idx], model.predict(X[test_idx]), average="macro")
+    if forest_file:
+        export_forest(model, forest_file)
+
+    result = {"macro_f1": float(score), "fit_seconds": fit_seconds}
+    tmp = result_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, result_path)
+    return result
+
+
+def _fit_task(k, config, result_path, forest_file):
+    X, y, folds = _data
+    train_idx, test_idx = folds[k]
+    return _fit_fold(X, y, train_idx, test_idx, config, result_path, forest_file)
+
+
+def single_row_latency(forest_file, X, repeats=300):
+    """Median seconds for one single-row predict on the flat forest."""
+    engine = load_forest(forest_file)
+    rows = X[:repeats].astype(np.float32)
+    engine.predict(rows[:1])
+    timings = []
+    for i in range(repeats):
+        row = rows[i % len(rows)][np.newaxis, :]
+        start = time.perf_counter()
+        engine.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def pareto_front(results):
+    """Results not beaten by another on both macro-F1 and latency."""
+    front = []
+    for r in results:
+        dominated = any(
+            o["macro_f1"] >= r["macro_f1"] and o["latency_seconds"] <= r["latency_seconds"]
+            and (o["macro_f1"] > r["macro_f1"] or o["latency_seconds"] < r["latency_seconds"])
+            for o in results
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r["latency_seconds"])
+
+
+def choose(results, latency_budget):
+    """Most accurate Pareto config within budget (fastest one if none fits)."""
+    front = pareto_front(results)
+    within = [r for r in front if r["latency_seconds"] <= latency_budget]
+    if not within:
+        return front[0]
+    return max(within, key=lambda r: (r["macro_f1"], -r["latency_seconds"]))
+
+
+def _report(done, total, start, log):
+    for i, _ in enumerate(done, 1):
+        if i % 20 == 0 or i == total:
+            log(f"  {i}/{total} fits ({time.perf_counter() - start:.0f}s)")
+
+
+def search(X, y, cache_dir="cache/model_search", grid=GRID, workers=None,
+           latency_budget=0.002, n_folds=N_FOLDS, log=print):
+    """Run (or resume) the search; returns (chosen result, all results)."""
+    global _data
+    X = np.asarray(X)
+    y = np.asarray(y)
+    run_dir = os.path.join(cache_dir, data_key(X, y, n_folds))
+    folds = list(StratifiedKFold(n_folds, shuffle=True, random_state=RANDOM_STATE).split(X, y))
+    configs = grid_configs(grid)
+
+    tasks = []
+    for config in configs:
+        config_dir = os.path.join(run_dir, config_key(config))
+        os.makedirs(config_dir, exist_ok=True)
+        for k in range(n_folds):
+            result_path = os.path.join(config_dir, f"fold{k}.json")
+            forest_file = os.path.join(config_dir, "fold0.forest") if k == 0 else None
+            if not os.path.exists(result_path) or (forest_file and not os.path.exists(forest_file)):
+                tasks.append((k, config, result_path, forest_file))
+
+    total = len(configs) * n_folds
+    log(f"Search: {len(configs)} configs x {n_folds} folds, "
+        f"{total - len(tasks)} cached, {len(tasks)} to fit")
+    if tasks:
+        start = time.perf_counter()
+        _data = (X, y, folds)
+        try:
+            if "fork" in multiprocessing.get_all_start_methods():
+                with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                         mp_context=multiprocessing.get_context("fork")) as pool:
+                    futures = [pool.submit(_fit_task, *task) for task in tasks]
+                    done = (future.result() for future in as_completed(futures))
+                    _report(done, len(tasks), start, log)
+            else:
+                _report((_fit_task(*task) for task in tasks), len(tasks), start, log)
+        finally:
+            _data = None
+
+    results = []
+    for config in configs:
+        config_dir = os.path.join(run_dir, config_key(config))
+        scores = []
+        for k in range(n_folds):
+            with open(os.path.join(config_dir, f"fold{k}.json")) as f:
+                scores.append(json.load(f)["macro_f1"])
+        results.append({
+            "config": config,
+            "macro_f1": float(np.mean(scores)),
+            "macro_f1_std": float(np.std(scores)),
+            "latency_seconds": single_row_latency(os.path.join(config_dir, "fold0.forest"), X),
+        })
+
+    return choose(results, latency_budget), results
+
+
+def format_results(results, chosen):
+    front = {config_key(r["config"]) for r in pareto_front(results)}
+    lines = [f"{'config':<58} {'macro-F1':>15} {'latency':>10}"]
+    for r in sorted(results, key=lambda r: -r["macro_f1"]):
+        key = config_key(r["config"])
+        mark = "*" if r is chosen else ("P" if key in front else " ")
+        lines.append(f"{mark} {key:<56} {r['macro_f1']:.3f} ± {r['macro_f1_std']:.3f} "
+                     f"{r['latency_seconds'] * 1e6:8.0f}us")
+    lines.append("(* chosen, P other Pareto-optimal configs)")
+    return "\n".join(lines)
@@ -0,0 +1,188 @@
+# ================================
+# Write-behind Record Writer
+# ================================
+# Submitting an assessment or booking should not wait on a Supabase
+# round-trip, and should not be lost when Supabase is down. Records are
+# committed to the local Spool first and acknowledged to the user straight
+# away. A background replayer drains the spool into PostgREST bulk inserts
+# (one POST with a JSON array per table), sending once batch_size records
+# are waiting or max_wait seconds after the first one arrived. Each record
+# carries an idempotency key and inserts ignore duplicates on that key, so
+# replaying a batch after a timeout or a restart never double-writes.
+#
+# Only records Supabase rejects as invalid are moved to the spool's dead
+# letters, one at a time: a rejected batch is split in halves and resent
+# until the offending record is isolated. Auth, missing table/column and
+# server errors say nothing about the records, so they are kept and retried
+# with backoff until the key or schema is fixed.
+
+import atexit
+import threading
+import time
+
+from supabase_client import SupabaseError
+
+# Not about the payload: bad/rotated key, table or function missing, timeouts
+RETRY_STATUSES = {401, 403, 404, 408, 429}
+
+# Schema mismatches (unknown column, undefined table/column, no unique
+# constraint for on_conflict): the records come from this app, so the
+# database is missing a migration
+SCHEMA_ERROR_CODES = {"PGRST204", "PGRST205", "42P01", "42703", "42P10"}
+
+
+class RecordWriter:
+    def __init__(self, client, spool, batch_size=50, max_wait=1.0,
+                 retry_backoff=1.0, max_backoff=60.0, idle_interval=30.0):
+        self.client = client
+        self.spool = spool
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.idle_interval = idle_interval
+
+        self._wake = threading.Event()
+        self._full = threading.Event()
+        self._stopping = threading.Event()
+        self._kick = threading.Event()
+        self._unsent = 0
+        self._backoff = 0.0
+
+        self.submitted = 0
+        self.sent = 0
+        self.batches = 0
+        self.failed_attempts = 0
+        self.last_error = None
+        self.last_lag_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="record-writer", daemon=True)
+        self._thread.start()
+        if self.spool.stats()["depth"]:
+            # Left over from a previous run or outage
+            self._wake.set()
+        atexit.register(self.close)
+
+    def submit(self, table, record):
+        """Durably queue a record for `table` and return its idempotency key."""
+        key = self.spool.append(table, record)
+        self.submitted += 1
+        self._unsent += 1
+        if self._unsent >= self.batch_size:
+            self._full.set()
+        self._wake.set()
+        return key
+
+    def flush(self, timeout=None):
+        """Send everything spooled so far; True once the spool is empty."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Skip any running backoff once; further failures back off as usual
+        self._kick.set()
+        while self.spool.stats()["depth"]:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._full.set()
+            self._wake.set()
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=10):
+        if self._thread.is_alive():
+            self._stopping.set()
+            self._kick.set()
+            self._full.set()
+            self._wake.set()
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if self._backoff:
+                # Supabase is failing: new submissions only go to the spool
+                # until the backoff runs out (or flush/close cut it short)
+                self._kick.wait(self._backoff)
+                self._kick.clear()
+            else:
+                self._wake.wait(self.idle_interval)
+                if self._unsent < self.batch_size:
+                    # Give the batch a chance to fill up before sending it
+                    self._full.wait(self.max_wait)
+            if self._stopping.is_set():
+                break
+            self._wake.clear()
+            self._full.clear()
+            self._unsent = 0
+            self._replay_guarded()
+        # Last attempt on shutdown; anything still unsent stays in the spool
+        if self._backoff == 0.0:
+            self._replay_guarded()
+
+    def _replay_guarded(self):
+        # Nothing may kill the replayer thread: an unexpected error (e.g. the
+        # spool database locked by another process) is retried with backoff
+        try:
+            self.replay()
+        except Exception as e:
+            self._failed(f"{type(e).__name__}: {e}")
+
+    def replay(self):
+        """Drain the spool once. Stops at the first transient failure."""
+        for table in self.spool.targets():
+            while True:
+                entries = self.spool.pending(table, self.batch_size)
+                if not entries:
+                    break
+                if not self._send(table, entries):
+                    return False
+        self._backoff = 0.0
+        return True
+
+    def _failed(self, error):
+        self.last_error = error
+        self.failed_attempts += 1
+        self._backoff = min(self.max_backoff, max(self.retry_backoff, self._backoff * 2))
+
+    def _send(self, table, entries):
+        ids = [e.id for e in entries]
+        try:
+            self.client.insert(
+                table, [e.record for e in entries],
+                prefer="resolution=ignore-duplicates,return=minimal",
+                on_conflict="idempotency_key",
+            )
+        except SupabaseError as e:
+            status = e.status_code
+            if (status is None or status >= 500 or status in RETRY_STATUSES
+                    or e.code in SCHEMA_ERROR_CODES):
+                self.spool.retry_later(ids, str(e))
+                self._failed(str(e))
+                return False
+            # Supabase rejected the payload (400/409/422, ...): find the bad
+            # records so the rest of the batch still gets through
+            self.last_error = str(e)
+            self.failed_attempts += 1
+            if len(entries) > 1:
+                half = len(entries) // 2
+                return self._send(table, entries[:half]) and self._send(table, entries[half:])
+            self.spool.bury(ids, self.last_error)
+            return True
+
+        self.spool.ack(ids)
+        self.sent += len(ids)
+        self.batches += 1
+        self.last_lag_seconds = time.time() - min(e.created_at for e in entries)
+        return True
+
+    def stats(self):
+        spool_stats = self.spool.stats()
+        return {
+            "pending": spool_stats["depth"],
+            "dead": spool_stats["dead"],
+            "oldest_pending_seconds": spool_stats["oldest_age_seconds"],
+            "last_lag_seconds": self.last_lag_seconds,
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "batches": self.batches,
+            "failed_attempts": self.failed_attempts,
+            "retry_in_seconds": self._backoff,
+            "last_error": self.last_error,
+        }
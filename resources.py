@@ -0,0 +1,163 @@
+# ================================
+# Shared App Resources
+# ================================
+# Process-wide singletons used by the pages in views/. Each getter imports
+# its module when it is first called rather than at the top of this file,
+# so a page only pays for the clients it actually uses: the intro page never
+# loads requests, pandas or plotly, and the model is only loaded on Submit.
+
+import streamlit as st
+
+
+# ================================
+# Metrics
+# ================================
+# Span timers and counters shared by every session (see metrics.py), served
+# in the Prometheus text format on http://METRICS_HOST:METRICS_PORT/metrics.
+# With several server processes on one machine only the first gets the port;
+# set METRICS_PORT per process, or to 0 to turn the endpoint off.
+@st.cache_resource
+def get_metrics():
+    from metrics import Metrics
+    return Metrics()
+
+@st.cache_resource
+def get_metrics_endpoint():
+    """(URL of the /metrics endpoint or None, error starting it or None)."""
+    from metrics import serve_metrics
+    port = int(st.secrets.get("METRICS_PORT", 9464))
+    if not port:
+        return None, None
+    host = st.secrets.get("METRICS_HOST", "127.0.0.1")
+    try:
+        serve_metrics(get_metrics(), host, port)
+    except OSError as e:
+        return None, f"metrics endpoint not started on {host}:{port}: {e}"
+    return f"http://{host}:{port}/metrics", None
+
+
+# ================================
+# Load Model
+# ================================
+# One model per server process, shared read-only by every session and rerun.
+# Versions published to models/ (see model_deploy.py) are watched in the
+# background: a new version is loaded, validated on the holdout sample and
+# swapped in without a restart. Without a models/manifest.json the bundled
+# flat .forest artifact is memory-mapped (so all server processes share one
+# copy of it), or else the pickle is loaded and compiled into the same flat
+# arrays; either is reloaded if the file changes. The feature encoder saved
+# by the training script is loaded with the model.
+@st.cache_resource
+def get_model_registry():
+    from model_deploy import build_registry
+    registry = build_registry(poll_interval=float(st.secrets.get("MODEL_POLL_SECONDS", 30)))
+    get_metrics().add_collector("model", registry.stats, counters=("load_count", "swaps"))
+    return registry
+
+# Predictions keyed by the encoded input tuple, shared by all sessions and
+# dropped automatically whenever the registry loads a new model version.
+@st.cache_resource
+def get_prediction_cache():
+    from prediction_cache import PredictionCache
+    cache = PredictionCache(maxsize=4096)
+    get_metrics().add_collector("prediction_cache", cache.stats,
+                                counters=("hits", "misses", "evictions", "invalidations"))
+    return cache
+
+# ================================
+# Supabase Setup
+# ================================
+
+# Shared pooled client: keep-alive connections, bounded timeouts and retried
+# reads. Timeouts can be tuned with SUPABASE_CONNECT_TIMEOUT/SUPABASE_READ_TIMEOUT.
+@st.cache_resource
+def get_supabase():
+    from supabase_client import SupabaseClient
+    return SupabaseClient(
+        st.secrets["SUPABASE_URL"],
+        st.secrets["SUPABASE_KEY"],
+        timeout=(float(st.secrets.get("SUPABASE_CONNECT_TIMEOUT", 3.05)),
+                 float(st.secrets.get("SUPABASE_READ_TIMEOUT", 10))),
+        metrics=get_metrics(),
+    )
+
+# Assessment records and bookings are written behind the user's back: they
+# are committed to a local on-disk spool first, so Submit/Book never wait on
+# Supabase and nothing is lost during an outage. A background replayer drains
+# the spool as bulk inserts with idempotency keys.
+@st.cache_resource
+def get_record_writer():
+    from record_writer import RecordWriter
+    from spool import Spool
+    spool = Spool(st.secrets.get("SPOOL_PATH", "spool.db"))
+    writer = RecordWriter(get_supabase(), spool, batch_size=50, max_wait=1.0)
+    get_metrics().add_collector("record_writer", writer.stats,
+                                counters=("submitted", "sent", "batches", "failed_attempts"))
+    return writer
+
+# Appointment reads go through an indexed, per-name cached lookup that is
+# invalidated by bookings made through the same store. The store also keeps
+# the index of booked teleconsult slots used to reject double bookings.
+@st.cache_resource
+def get_appointment_store():
+    from appointment_store import AppointmentStore
+    return AppointmentStore(get_supabase(), get_record_writer())
+
+# Local Parquet-backed copy of user_records for the dashboard, synced
+# incrementally (only rows newer than the last seen id are downloaded).
+@st.cache_resource
+def get_records_cache():
+    from dashboard_data import RecordsCache
+    return RecordsCache(get_supabase(), st.secrets.get("RECORDS_CACHE_DIR", "cache/user_records"))
+
+# Chart count tables computed by the dashboard_counts() RPC in Supabase,
+# falling back to the local records cache until the function is deployed.
+@st.cache_resource
+def get_dashboard_aggregates():
+    from dashboard_data import DashboardAggregates
+    return DashboardAggregates(get_supabase(), get_records_cache())
+
+# Dashboard figures, rebuilt only when the (row count, latest timestamp)
+# version of user_records changes or staff press refresh.
+@st.cache_resource
+def get_chart_cache():
+    from dashboard_charts import ChartCache
+    return ChartCache(get_dashboard_aggregates())
+
+# Per-day risk level and answer totals for the trend panel, updated with
+# only the rows the records cache gained since the last update
+@st.cache_resource
+def get_risk_trends():
+    from risk_trends import RiskTrends
+    trends = RiskTrends(get_records_cache(), tz=st.secrets.get("TREND_TIMEZONE", "Asia/Kuala_Lumpur"))
+    get_metrics().add_collector("risk_trends", trends.stats, counters=("rows", "updates"))
+    return trends
+
+# Trend figures, rebuilt only when the trend totals change
+@st.cache_resource
+def get_trend_charts():
+    from dashboard_charts import TrendCharts
+    return TrendCharts(get_risk_trends())
+
+# Server-side paginated view of user_records for the dashboard table
+@st.cache_resource
+def get_records_table():
+    from dashboard_data import RecordsTable
+    return RecordsTable(get_supabase())
+
+# ================================
+# YouTube Setup
+# ================================
+# Mood searches are cached (TTL + LRU) across sessions and prefetched in the
+# background; stale results are served if the API quota runs out.
+@st.cache_resource
+def get_youtube_search():
+    from youtube_search import SEARCH_URL, YouTubeSearch
+    youtube = YouTubeSearch(
+        st.secrets["YOUTUBE_API_KEY"],
+        search_url=st.secrets.get("YOUTUBE_SEARCH_URL", SEARCH_URL),
+        metrics=get_metrics(),
+    )
+    get_metrics().add_collector("youtube", youtube.stats,
+                                counters=("hits", "misses", "stale_served", "api_calls", "api_errors", "prefetches"))
+    return youtube
@@ -0,0 +1,104 @@
+# ================================
+# Risk Labelling Rules
+# ================================
+# The rules that turn a student's answers into the Low / Medium / High
+# training label. assign_risk() is the original per-row version;
+# risk_levels() applies the same rules to whole columns with NumPy and is
+# what the training script uses. String columns are factorized first, so
+# the case-folding and comparisons run once per distinct value rather than
+# once per row.
+#
+# Both versions keep the original comparisons exactly, including the
+# case-sensitive Sleep_Duration match, so relabelling never changes a label.
+# That match expects the normalized labels the app stores ("5 - 6 hours",
+# "less than 5 hours"); load the training CSV through student_dataset.py,
+# or its raw "5-6 hours" / "Less than 5 hours" earn no sleep points.
+
+import numpy as np
+import pandas as pd
+
+RISK_LABELS = np.array(["Low", "Medium", "High"], dtype=object)
+
+# user_records column names -> dataset column names
+RECORD_COLUMNS = {
+    "depression": "Depression",
+    "suicidal_thoughts": "Suicidal_Thoughts",
+    "academic_pressure": "Academic_Pressure",
+    "financial_stress": "Financial_Stress",
+    "sleep_duration": "Sleep_Duration",
+    "study_satisfaction": "Study_Satisfaction",
+    "family_history": "Family_History_of_Mental_Illness",
+    "dietary_habits": "Dietary_Habits",
+}
+
+
+def assign_risk(row):
+    if row["Depression"].lower() == "no":
+        return "Low"
+
+    score = 0
+    if row["Suicidal_Thoughts"].lower() == "yes":
+        score += 3
+    if row["Academic_Pressure"] >= 4:
+        score += 1
+    if row["Financial_Stress"] >= 4:
+        score += 1
+    if row["Sleep_Duration"] == "less than 5 hours":
+        score += 2
+    elif row["Sleep_Duration"] == "5 - 6 hours":
+        score += 1
+    if row["Study_Satisfaction"] <= 2:
+        score += 1
+    if row["Family_History_of_Mental_Illness"].lower() == "yes":
+        score += 1
+    if row["Dietary_Habits"].lower() == "unhealthy":
+        score += 1
+    elif row["Dietary_Habits"].lower() == "moderate":
+        score += 0.5
+
+    return "High" if score >= 4 else "Medium"
+
+
+def _points(values, points, lower=True):
+    """Per-row points for a string column, looked up per distinct value."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    keys = pd.Index(uniques).astype(str)
+    if lower:
+        keys = keys.str.lower()
+    table = np.array([points.get(k, 0) for k in keys] + [0], dtype=np.int8)
+    # Missing values factorize to -1, which picks the trailing 0
+    return table[codes]
+
+
+def risk_scores(df):
+    """Risk score of every row in half-points (so 0.5 stays integral)."""
+    score = _points(df["Suicidal_Thoughts"], {"yes": 6})
+    score += np.where(df["Academic_Pressure"].to_numpy() >= 4, 2, 0).astype(np.int8)
+    score += np.where(df["Financial_Stress"].to_numpy() >= 4, 2, 0).astype(np.int8)
+    score += _points(df["Sleep_Duration"], {"less than 5 hours": 4, "5 - 6 hours": 2}, lower=False)
+    score += np.where(df["Study_Satisfaction"].to_numpy() <= 2, 2, 0).astype(np.int8)
+    score += _points(df["Family_History_of_Mental_Illness"], {"yes": 2})
+    score += _points(df["Dietary_Habits"], {"unhealthy": 2, "moderate": 1})
+    return score
+
+
+def risk_codes(df):
+    """0 = Low, 1 = Medium, 2 = High for every row, as int8."""
+    not_depressed = _points(df["Depression"], {"no": 1}).astype(bool)
+    codes = np.where(risk_scores(df) >= 8, 2, 1).astype(np.int8)
+    codes[not_depressed] = 0
+    return codes
+
+
+def risk_levels(df, columns=None):
+    """Risk_Level labels for df, identical to df.apply(assign_risk, axis=1).
+
+    columns maps df's column names to the dataset's, e.g. RECORD_COLUMNS
+    for user_records exports.
+    """
+    if columns:
+        df = df.rename(columns=columns)
+    return pd.Series(RISK_LABELS[risk_codes(df)], index=df.index, name="Risk_Level")
@@ -0,0 +1,238 @@
+# ================================
+# Risk Trends
+# ================================
+# Per-day totals of user_records for the Staff Dashboard's trend panel:
+# assessments per risk level, and the answers behind them (academic
+# pressure, financial stress, short sleep). The totals are kept in memory
+# and only ever added to. Each update takes the rows the local records
+# cache (dashboard_data.RecordsCache) has gained since the last one, found
+# by binary search on its id-ordered frame, and folds their per-day sums
+# in, so an update costs O(new rows) however large the table grows.
+# Records arriving late for an earlier day simply add to that day.
+#
+# Daily and weekly tables (with shares and means) are derived from the
+# per-day totals, which are one small row per calendar day, and cached
+# until the next update adds rows. alert() flags a spike in the share of
+# High risk assessments over the most recent days against the weeks
+# before them.
+
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+RISK_LEVELS = ("Low", "Medium", "High")
+SHORT_SLEEP = ("less than 5 hours", "5 - 6 hours")
+
+# Per-day sums; means and shares are derived from them
+SUMS = (
+    "records", "Low", "Medium", "High",
+    "academic_pressure_sum", "academic_pressure_n",
+    "financial_stress_sum", "financial_stress_n",
+    "short_sleep", "sleep_n",
+)
+
+
+def _is_in(values, labels):
+    """Boolean array: which values are one of labels (missing values are not)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        table = np.append(np.isin(values.cat.categories.astype(str), labels), False)
+        # Missing values have code -1, which picks the trailing False
+        return table[values.cat.codes.to_numpy()]
+    return np.isin(values.to_numpy(dtype=object), labels)
+
+
+def day_sums(df, tz=None):
+    """(days, sums): the distinct calendar days of df's rows (as days since
+    1970-01-01) and a row of SUMS for each. Rows without a timestamp are skipped."""
+    timestamps = df["timestamp"]
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(tz or "UTC").dt.tz_localize(None)
+    days = timestamps.to_numpy().astype("datetime64[D]")
+    valid = ~np.isnat(days)
+
+    columns = [np.ones(len(df))]
+    columns += [_is_in(df["predicted_risk"], [level]) for level in RISK_LEVELS]
+    for col in ("academic_pressure", "financial_stress"):
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+        answered = ~np.isnan(values)
+        columns += [np.where(answered, values, 0.0), answered]
+    columns.append(_is_in(df["sleep_duration"], SHORT_SLEEP))
+    columns.append(df["sleep_duration"].notna().to_numpy())
+
+    days = days[valid].astype(np.int64)
+    if not len(days):
+        return days, np.empty((0, len(SUMS)))
+    first = days.min()
+    span = int(days.max() - first) + 1
+    if span <= 4 * len(days) + 366:
+        # Bin by offset from the first day: no sort, O(rows)
+        day_numbers = first + np.arange(span)
+        position = days - first
+    else:
+        # A few dates far apart (e.g. a bad timestamp): bin by distinct day
+        day_numbers, position = np.unique(days, return_inverse=True)
+        span = len(day_numbers)
+    sums = np.empty((span, len(SUMS)))
+    for i, column in enumerate(columns):
+        sums[:, i] = np.bincount(position, weights=np.asarray(column, dtype=np.float64)[valid], minlength=span)
+    present = sums[:, 0] > 0
+    return day_numbers[present], sums[present]
+
+
+def with_rates(sums):
+    """sums with shares and means added (NaN where nothing was answered)."""
+    v = {col: sums[col].to_numpy() for col in SUMS}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = {
+            "high_share": v["High"] / v["records"],
+            "academic_pressure": v["academic_pressure_sum"] / v["academic_pressure_n"],
+            "financial_stress": v["financial_stress_sum"] / v["financial_stress_n"],
+            "short_sleep_share": v["short_sleep"] / v["sleep_n"],
+        }
+    return pd.DataFrame({**v, **rates}, index=sums.index)
+
+
+def _rolling_sum(values, window):
+    total = np.cumsum(values)
+    total[window:] = total[window:] - total[:-window]
+    return total
+
+
+class RiskTrends:
+    def __init__(self, records_cache, tz="Asia/Kuala_Lumpur", recent_days=1, baseline_days=28,
+                 min_records=10, z_threshold=3.0, min_increase=0.10):
+        self.records_cache = records_cache
+        # Days are calendar days in tz for timezone-aware timestamps;
+        # naive ones are taken as already local
+        self.tz = tz
+        self.recent_days = recent_days
+        self.baseline_days = baseline_days
+        self.min_records = min_records
+        self.z_threshold = z_threshold
+        self.min_increase = min_increase
+        self._lock = threading.Lock()
+        self._days = {}     # day (days since 1970-01-01) -> np.array of SUMS
+        self._last_id = None
+        self._tables = {}
+        self.version = 0
+        self.rows = 0
+        self.updates = 0
+        self.last_added = 0
+
+    def add(self, df):
+        """Fold the rows of df (typed user_records, not seen before) into the totals."""
+        with self._lock:
+            self._add(df)
+
+    def _add(self, df):
+        if df.empty:
+            return
+        for day, values in zip(*day_sums(df, self.tz)):
+            current = self._days.get(day)
+            self._days[day] = values if current is None else current + values
+        self.rows += len(df)
+        self.last_added = len(df)
+        self._tables = {}
+        self.version += 1
+
+    def update(self, force=False):
+        """Sync the records cache and add the rows it gained since the last update."""
+        frame = self.records_cache.sync(force=force)
+        with self._lock:
+            self.updates += 1
+            if frame.empty or "id" not in frame.columns:
+                return self.version
+            # The cache's frame is in id order (it is fetched by id.asc)
+            ids = frame["id"].to_numpy()
+            start = 0 if self._last_id is None else int(np.searchsorted(ids, self._last_id, side="right"))
+            if start < len(frame):
+                self._add(frame.iloc[start:])
+                self._last_id = int(ids[-1])
+            return self.version
+
+    def sums(self, period="D"):
+        """SUMS per day ("D", every calendar day, gaps as zeros) or week ("W", from Monday)."""
+        with self._lock:
+            table = self._tables.get(("sums", period))
+            if table is None:
+                table = self._tables[("sums", period)] = self._sums(period)
+            return table
+
+    def _sums(self, period):
+        name = "day" if period == "D" else "week"
+        if not self._days:
+            return pd.DataFrame(columns=list(SUMS), index=pd.DatetimeIndex([], name=name), dtype=np.float64)
+        days = np.fromiter(self._days, dtype=np.int64, count=len(self._days))
+        first, last = int(days.min()), int(days.max())
+        if period == "W":
+            # Back to Monday (day 0, 1970-01-01, was a Thursday)
+            first -= (first + 3) % 7
+        dense = np.zeros((last - first + 1, len(SUMS)))
+        dense[days - first] = np.array(list(self._days.values()))
+        if period == "W":
+            dense = np.add.reduceat(dense, np.arange(0, len(dense), 7))
+        index = pd.date_range(np.datetime64(first, "D"), periods=len(dense), freq="D" if period == "D" else "7D", name=name)
+        return pd.DataFrame(dense, index=index, columns=list(SUMS))
+
+    def table(self, period="D"):
+        """Counts per risk level, High share, mean pressure/stress and short-sleep
+        share per day or week; daily tables also get a rolling 7-day High share."""
+        with self._lock:
+            cached = self._tables.get(("table", period))
+            version = self.version
+        if cached is not None:
+            return cached
+        sums = self.sums(period)
+        table = with_rates(sums)
+        if period == "D":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                table["high_share_7d"] = (_rolling_sum(table["High"].to_numpy(), 7)
+                                          / _rolling_sum(table["records"].to_numpy(), 7))
+        with self._lock:
+            # Not if an update landed meanwhile
+            if self.version == version:
+                self._tables[("table", period)] = table
+        return table
+
+    def alert(self):
+        """High risk share of the last recent_days days (up to the latest record)
+        if it spiked against the baseline_days before them, else None.
+
+        A spike needs min_records assessments in both windows, a rise of at
+        least min_increase, and a z-score of at least z_threshold under the
+        baseline share.
+        """
+        sums = self.sums("D")
+        if len(sums) == 0:
+            return None
+        recent = sums.iloc[-self.recent_days:]
+        baseline = sums.iloc[-(self.recent_days + self.baseline_days):-self.recent_days]
+        n, n0 = recent["records"].sum(), baseline["records"].sum()
+        if n < self.min_records or n0 < self.min_records:
+            return None
+        share, base_share = recent["High"].sum() / n, baseline["High"].sum() / n0
+        # Floor the variance so an all-Low/all-High baseline still gives a finite z
+        variance = max(base_share * (1 - base_share), 1 / n0) / n
+        z = (share - base_share) / math.sqrt(variance)
+        if share - base_share < self.min_increase or z < self.z_threshold:
+            return None
+        return {
+            "share": float(share),
+            "baseline_share": float(base_share),
+            "records": int(n),
+            "baseline_records": int(n0),
+            "z": float(z),
+            "start": recent.index[0].date(),
+            "end": recent.index[-1].date(),
+        }
+
+    def stats(self):
+        return {
+            "rows": self.rows,
+            "days": len(self._days),
+            "version": self.version,
+            "updates": self.updates,
+            "last_added": self.last_added,
+        }
@@ -0,0 +1,233 @@
+# ================================
+# Risk Scoring Service
+# ================================
+# Headless HTTP scoring for other services (e.g. the chatbot), using the same
+# model artifact and feature encoder as the predictor page:
+#
+#   python scoring_service.py --port 8502 --max-batch 64 --max-wait-ms 5
+#
+#   POST /score   {"gender": "Female", "age": 20, ..., "depression": "yes"}
+#                 or a list of such objects; dataset column names work too
+#   GET  /stats   latency percentiles, latency and batch-size histograms
+#   GET  /healthz model version
+#
+# Concurrent requests are coalesced by a MicroBatcher: the first request
+# waits at most max_wait for others to join, then the whole batch is encoded
+# into one preallocated array and scored with a single vectorized predict.
+# Set SCORING_API_KEY to require a matching X-API-Key header.
+
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+from feature_encoding import RECORD_FEATURES
+from model_deploy import build_registry
+from risk_labels import RISK_LABELS
+
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, float("inf"))
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS, window=10000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        # Recent samples for percentiles
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.recent.append(ms)
+            for i, bound in enumerate(self.buckets):
+                if ms <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def percentile(self, q):
+        with self._lock:
+            ordered = sorted(self.recent)
+        if not ordered:
+            return None
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total * 1000 / self.count if self.count else None,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "buckets_ms": {("+Inf" if b == float("inf") else str(b)): c
+                           for b, c in zip(self.buckets, self.counts)},
+        }
+
+
+class MicroBatcher:
+    def __init__(self, registry, max_batch=64, max_wait=0.005):
+        self.registry = registry
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._buffer = None
+        self.batch_sizes = Counter()
+        self.batches = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, answers):
+        """Queue one answer dict; the Future resolves to (class, probabilities, model version)."""
+        future = Future()
+        self._queue.put((answers, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, batch):
+        loaded = self.registry.get()
+        encoder = loaded.encoder
+        if self._buffer is None or self._buffer.shape != (self.max_batch, len(encoder.features)):
+            self._buffer = encoder.new_batch(self.max_batch)
+
+        ok = []
+        for answers, future in batch:
+            try:
+                encoder.encode_row(answers, out=self._buffer[len(ok)])
+            except KeyError as e:
+                future.set_exception(ValueError(f"Missing answer {e}"))
+                continue
+            except (ValueError, TypeError) as e:
+                future.set_exception(ValueError(str(e)))
+                continue
+            ok.append(future)
+        if not ok:
+            return
+
+        predictor = loaded.predictor
+        proba = predictor.predict_proba(self._buffer[:len(ok)])
+        codes = predictor.classes.take(np.argmax(proba, axis=1))
+        for future, code, p in zip(ok, codes, proba):
+            future.set_result((int(code), p.tolist(), loaded.version_id))
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            self.batches += 1
+            self.batch_sizes[len(batch)] += 1
+            try:
+                self._score(batch)
+            except Exception as e:
+                self.errors += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self._queue.qsize(),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
+
+
+def _normalize_answers(payload):
+    if not isinstance(payload, dict):
+        raise ValueError("Each item must be a JSON object of answers")
+    if "Gender" not in payload:
+        payload = {RECORD_FEATURES.get(k, k): v for k, v in payload.items()}
+    return payload
+
+
+def create_app(registry=None, max_batch=64, max_wait=0.005, api_key=None, timeout=10.0):
+    registry = registry or build_registry()
+    batcher = MicroBatcher(registry, max_batch=max_batch, max_wait=max_wait)
+    latency = LatencyHistogram()
+    app = Flask(__name__)
+    app.config["batcher"] = batcher
+    app.config["latency"] = latency
+
+    @app.before_request
+    def check_key():
+        if api_key and request.path == "/score" and request.headers.get("X-API-Key") != api_key:
+            return jsonify({"error": "invalid API key"}), 401
+
+    @app.post("/score")
+    def score():
+        start = time.perf_counter()
+        payload = request.get_json(silent=True)
+        single = not isinstance(payload, list)
+        try:
+            items = [_normalize_answers(p) for p in ([payload] if single else payload)]
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        futures = [batcher.submit(answers) for answers in items]
+        results = []
+        for future in futures:
+            try:
+                code, proba, version = future.result(timeout=timeout)
+            except ValueError as e:
+                results.append({"error": str(e)})
+                continue
+            results.append({
+                "risk": RISK_LABELS[code],
+                "probabilities": dict(zip(RISK_LABELS.tolist(), proba)),
+                "model_version": version,
+            })
+        latency.observe(time.perf_counter() - start)
+        if single:
+            body = results[0]
+            return jsonify(body), 400 if "error" in body else 200
+        return jsonify(results)
+
+    @app.get("/stats")
+    def stats():
+        return jsonify({"latency": latency.snapshot(), "batcher": batcher.stats(),
+                        "model": {k: v for k, v in registry.stats().items() if k != "loaded_at"}})
+
+    @app.get("/healthz")
+    def healthz():
+        return jsonify({"ok": True, "model_version": registry.get().version_id})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching risk scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = create_app(max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+                     api_key=os.environ.get("SCORING_API_KEY"))
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
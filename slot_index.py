@@ -0,0 +1,119 @@
+# ================================
+# Teleconsult Slot Index
+# ================================
+# In-memory index of booked teleconsultation slots. Every booking occupies
+# slot_minutes from its start time; per date the start minutes are kept in a
+# sorted list, so "is this slot free" is one bisect and "next N free slots"
+# walks the opening-hours grid a day at a time. The AppointmentStore keeps it
+# in sync incrementally from the appointments table and adds its own
+# bookings as they are made.
+
+import bisect
+import threading
+from datetime import date as date_cls, time as time_cls, timedelta
+
+
+class SlotConflict(Exception):
+    def __init__(self, day, start, suggestions=()):
+        super().__init__(f"The slot on {day} at {start} is already booked")
+        self.day = day
+        self.start = start
+        self.suggestions = list(suggestions)
+
+
+def _parse_day(day):
+    if isinstance(day, date_cls):
+        return day
+    return date_cls.fromisoformat(str(day)[:10])
+
+
+def _parse_minute(start):
+    if isinstance(start, time_cls):
+        return start.hour * 60 + start.minute
+    hour, minute = str(start).split(":")[:2]
+    return int(hour) * 60 + int(minute)
+
+
+def _as_time(minute):
+    return time_cls(minute // 60, minute % 60)
+
+
+class SlotIndex:
+    def __init__(self, slot_minutes=30, open_time=time_cls(9, 0), close_time=time_cls(17, 0)):
+        self.slot_minutes = slot_minutes
+        self.open_minute = _parse_minute(open_time)
+        self.close_minute = _parse_minute(close_time)
+        self._lock = threading.Lock()
+        self._starts = {}       # date -> sorted list of booked start minutes
+        self._keys = set()      # bookings already indexed (id or idempotency key)
+        self.size = 0
+
+    def add(self, day, start, key=None):
+        """Index one booking; returns False if key was already indexed."""
+        day, minute = _parse_day(day), _parse_minute(start)
+        with self._lock:
+            if key is not None:
+                if key in self._keys:
+                    return False
+                self._keys.add(key)
+            bisect.insort(self._starts.setdefault(day, []), minute)
+            self.size += 1
+        return True
+
+    def add_rows(self, rows):
+        for row in rows:
+            if row.get("date") and row.get("time"):
+                key = row.get("idempotency_key") or row.get("id")
+                self.add(row["date"], row["time"], key)
+
+    def _free(self, starts, minute):
+        # Any booking starting within slot_minutes either side overlaps
+        i = bisect.bisect_left(starts, minute - self.slot_minutes + 1)
+        return i == len(starts) or starts[i] >= minute + self.slot_minutes
+
+    def is_free(self, day, start):
+        day, minute = _parse_day(day), _parse_minute(start)
+        with self._lock:
+            return self._free(self._starts.get(day, ()), minute)
+
+    def next_free(self, day, start=None, n=5, max_days=60):
+        """Up to n free (date, time) slots on the opening-hours grid from day/start on."""
+        day = _parse_day(day)
+        first_minute = _parse_minute(start) if start is not None else self.open_minute
+        found = []
+        with self._lock:
+            for offset in range(max_days):
+                current = day + timedelta(days=offset)
+                starts = self._starts.get(current, ())
+                minute = self.open_minute
+                if offset == 0 and first_minute > minute:
+                    # Round up to the next grid slot
+                    steps = -(-(first_minute - self.open_minute) // self.slot_minutes)
+                    minute = self.open_minute + steps * self.slot_minutes
+                while minute + self.slot_minutes <= self.close_minute:
+                    if self._free(starts, minute):
+                        found.append((current, _as_time(minute)))
+                        if len(found) == n:
+                            return found
+                    minute += self.slot_minutes
+        return found
+
+    def check(self, day, start, n_suggestions=3):
+        """Raise SlotConflict (with nearby free slots) if the slot is taken."""
+        if not self.is_free(day, start):
+            suggestions = self.next_free(day, start, n=n_suggestions)
+            raise SlotConflict(_parse_day(day), _as_time(_parse_minute(start)), suggestions)
+
+    def booked_on(self, day):
+        with self._lock:
+            return [_as_time(m) for m in self._starts.get(_parse_day(day), ())]
+
+    def prune_before(self, day):
+        """Forget dates before day; past slots can no longer conflict."""
+        day = _parse_day(day)
+        with self._lock:
+            for old in [d for d in self._starts if d < day]:
+                self.size -= len(self._starts.pop(old))
+
+    def stats(self):
+        return {"bookings": self.size, "dates": len(self._starts)}
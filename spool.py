@@ -0,0 +1,113 @@
+# ================================
+# Durable Local Spool
+# ================================
+# Write-ahead storage for records that still have to reach Supabase. Every
+# record is committed to a local SQLite file first, tagged with a unique
+# idempotency key, and only removed once Supabase has acknowledged it, so
+# nothing is lost if Supabase is slow or down or the process restarts.
+# Records that Supabase rejects outright (4xx) are parked as "dead" with
+# the error so they stop blocking the queue.
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    dead INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS spool_pending ON spool (dead, target, id);
+"""
+
+
+class SpoolEntry:
+    def __init__(self, id, target, key, record, created_at, attempts):
+        self.id = id
+        self.target = target
+        self.key = key
+        self.record = record
+        self.created_at = created_at
+        self.attempts = attempts
+
+
+class Spool:
+    def __init__(self, path="spool.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def append(self, target, record, key=None):
+        """Durably store a record for `target` and return its idempotency key."""
+        key = key or record.get("idempotency_key") or str(uuid.uuid4())
+        record = dict(record, idempotency_key=key)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO spool (target, idempotency_key, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (target, key, json.dumps(record), time.time()),
+            )
+        return key
+
+    def pending(self, target=None, limit=100):
+        """Oldest live entries first, optionally for one target table."""
+        sql = "SELECT id, target, idempotency_key, payload, created_at, attempts FROM spool WHERE dead = 0"
+        params = []
+        if target is not None:
+            sql += " AND target = ?"
+            params.append(target)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [SpoolEntry(r[0], r[1], r[2], json.loads(r[3]), r[4], r[5]) for r in rows]
+
+    def targets(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT target FROM spool WHERE dead = 0").fetchall()
+        return [r[0] for r in rows]
+
+    def ack(self, ids):
+        with self._lock:
+            self._conn.executemany("DELETE FROM spool WHERE id = ?", [(i,) for i in ids])
+
+    def retry_later(self, ids, error):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE spool SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                [(error, i) for i in ids],
+            )
+
+    def bury(self, ids, error):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE spool SET attempts = attempts + 1, last_error = ?, dead = 1 WHERE id = ?",
+                [(error, i) for i in ids],
+            )
+
+    def stats(self):
+        with self._lock:
+            depth, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM spool WHERE dead = 0"
+            ).fetchone()
+            dead = self._conn.execute("SELECT COUNT(*) FROM spool WHERE dead = 1").fetchone()[0]
+        return {
+            "depth": depth,
+            "dead": dead,
+            "oldest_age_seconds": time.time() - oldest if oldest is not None else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
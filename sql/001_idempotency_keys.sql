@@ -0,0 +1,31 @@
+-- ================================
+-- Idempotency keys for spooled writes
+-- ================================
+-- The app's write spool replays records with an idempotency_key and
+-- on_conflict=idempotency_key, so a batch resent after a timeout or restart
+-- is ignored instead of inserted twice. PostgREST needs a unique constraint
+-- on the column for that upsert to work.
+
+-- Safe to re-run: the constraints are only added where they are missing.
+
+alter table public.user_records
+    add column if not exists idempotency_key uuid;
+alter table public.appointments
+    add column if not exists idempotency_key uuid;
+
+do $$
+begin
+    if not exists (select 1 from pg_constraint
+                   where conname = 'user_records_idempotency_key_key'
+                     and conrelid = 'public.user_records'::regclass) then
+        alter table public.user_records
+            add constraint user_records_idempotency_key_key unique (idempotency_key);
+    end if;
+    if not exists (select 1 from pg_constraint
+                   where conname = 'appointments_idempotency_key_key'
+                     and conrelid = 'public.appointments'::regclass) then
+        alter table public.appointments
+            add constraint appointments_idempotency_key_key unique (idempotency_key);
+    end if;
+end
+$$;
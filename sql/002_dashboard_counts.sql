@@ -0,0 +1,52 @@
+-- ================================
+-- Dashboard chart aggregates
+-- ================================
+-- The Staff Dashboard charts only need small group-by count tables, so they
+-- are computed here and fetched with POST /rest/v1/rpc/dashboard_counts
+-- instead of downloading every user_records row. Rows come back in long
+-- format: chart name, first group value (a), second group value (b, only
+-- for two-way charts) and the count. Legacy 0/1 and lowercase yes/no
+-- answers are mapped to the labels the dashboard uses.
+
+create or replace function public.dashboard_counts()
+returns table (chart text, a text, b text, count bigint)
+language sql
+stable
+as $$
+    with normalized as (
+        select
+            predicted_risk::text as predicted_risk,
+            case gender::text when '0' then 'Male' when '1' then 'Female' else gender::text end as gender,
+            academic_pressure::text as academic_pressure,
+            case lower(depression::text)
+                when '0' then 'No' when 'no' then 'No'
+                when '1' then 'Yes' when 'yes' then 'Yes'
+                else depression::text end as depression,
+            case lower(suicidal_thoughts::text)
+                when '0' then 'No' when 'no' then 'No'
+                when '1' then 'Yes' when 'yes' then 'Yes'
+                else suicidal_thoughts::text end as suicidal_thoughts
+        from public.user_records
+    )
+    select 'risk', predicted_risk, null, count(*)
+    from normalized where predicted_risk is not null
+    group by predicted_risk
+    union all
+    select 'gender', gender, null, count(*)
+    from normalized where gender is not null
+    group by gender
+    union all
+    select 'pressure_risk', academic_pressure, predicted_risk, count(*)
+    from normalized where academic_pressure is not null and predicted_risk is not null
+    group by academic_pressure, predicted_risk
+    union all
+    select 'depression', depression, null, count(*)
+    from normalized where depression is not null
+    group by depression
+    union all
+    select 'suicidal_thoughts', suicidal_thoughts, null, count(*)
+    from normalized where suicidal_thoughts is not null
+    group by suicidal_thoughts
+$$;
+
+grant execute on function public.dashboard_counts() to anon, authenticated;
@@ -0,0 +1,23 @@
+-- ================================
+-- Indexes for the dashboard records table
+-- ================================
+-- The Staff Dashboard pages through user_records with filters on risk
+-- level, gender and date range, sorted by timestamp (or another column)
+-- with id as a tie-breaker. These indexes keep each page an index range
+-- scan instead of a sort over the whole table. Next/previous page turns
+-- start the scan at the last row shown (keyset pagination), so nulls sort
+-- last here as they do in the dashboard's "timestamp.desc.nullslast" order.
+-- Re-running this file replaces indexes created with the default nulls-first order.
+
+drop index if exists public.user_records_timestamp_idx;
+drop index if exists public.user_records_risk_timestamp_idx;
+drop index if exists public.user_records_gender_timestamp_idx;
+
+create index if not exists user_records_timestamp_idx
+    on public.user_records (timestamp desc nulls last, id desc);
+
+create index if not exists user_records_risk_timestamp_idx
+    on public.user_records (predicted_risk, timestamp desc nulls last, id desc);
+
+create index if not exists user_records_gender_timestamp_idx
+    on public.user_records (gender, timestamp desc nulls last, id desc);
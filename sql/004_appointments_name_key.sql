@@ -0,0 +1,14 @@
+-- ================================
+-- Normalized, indexed appointment names
+-- ================================
+-- "View My Appointments" looks bookings up by name. name_key holds the name
+-- trimmed, with inner whitespace collapsed and lowercased (the same rule as
+-- appointment_store.normalize_name), and is indexed so the lookup stays an
+-- index scan as the appointments table grows.
+
+alter table public.appointments
+    add column if not exists name_key text
+    generated always as (lower(regexp_replace(btrim(name), '\s+', ' ', 'g'))) stored;
+
+create index if not exists appointments_name_key_idx
+    on public.appointments (name_key);
@@ -0,0 +1,13 @@
+-- ================================
+-- Model version of each prediction
+-- ================================
+-- The app records which model version produced predicted_risk: the
+-- published version id from models/manifest.json, or "<file>@<mtime>" for
+-- an unversioned model file. Apply before deploying the app version that
+-- writes the column, or the inserts are rejected.
+
+alter table public.user_records
+    add column if not exists model_version text;
+
+create index if not exists user_records_model_version_idx
+    on public.user_records (model_version);
@@ -0,0 +1,114 @@
+# ================================
+# Training Dataset Ingestion
+# ================================
+# Loads the student survey CSV(s) for training with compact dtypes: answer
+# columns become categoricals, the 1-5 scales and hours int8, age int16.
+# Category labels are normalized once here, to the form the app stores and
+# the risk rules compare against ("7-8 hours" -> "7 - 8 hours",
+# "Less than 5 hours" -> "less than 5 hours", "Yes" -> "yes").
+#
+# The parsed frame is cached as a Parquet snapshot named after the SHA-256
+# of the source file, so a retrain on unchanged data skips the CSV parse,
+# and editing or replacing the CSV is picked up automatically. Each source
+# file gets its own snapshot folder, keyed on its absolute path, so files
+# with the same name in different directories do not evict each other.
+#
+#   df = load_dataset()                                   # bundled dataset
+#   df = load_dataset(["2024.csv", "2025.csv"])           # merged history
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from feature_encoding import CATEGORICAL, normalize_label
+
+DATASET_PATH = "Depression Student Dataset.csv"
+SNAPSHOT_DIR = "cache/dataset"
+
+INTEGERS = {
+    "Age": "int16",
+    "Academic_Pressure": "int8",
+    "Study_Satisfaction": "int8",
+    "Study_Hours": "int8",
+    "Financial_Stress": "int8",
+}
+
+# Bump when the parsing or normalization changes, so old snapshots are not reused
+SNAPSHOT_FORMAT = 1
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_categories(values):
+    """Categorical with normalized, sorted labels; raw spellings that
+    normalize to the same label are merged."""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    normalized = [normalize_label(c) for c in values.cat.categories]
+    categories = sorted(set(normalized))
+    position = {label: i for i, label in enumerate(categories)}
+    # Missing values have code -1, which picks the trailing -1
+    lookup = np.array([position[label] for label in normalized] + [-1], dtype=np.int16)
+    codes = lookup[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=values.index, name=values.name)
+
+
+def read_dataset(path):
+    """Parse one survey CSV into compact, normalized columns."""
+    dtypes = {col: "category" for col in CATEGORICAL}
+    dtypes.update(INTEGERS)
+    df = pd.read_csv(path, dtype=dtypes)
+    for col in CATEGORICAL:
+        if col in df.columns:
+            df[col] = normalize_categories(df[col])
+    return df
+
+
+def snapshot_path(path, snapshot_dir=SNAPSHOT_DIR):
+    """<snapshot_dir>/<file name>-<path hash>/v<format>-<content hash>.parquet"""
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    folder = f"{name}-{hashlib.sha256(path.encode('utf-8')).hexdigest()[:12]}"
+    return os.path.join(snapshot_dir, folder, f"v{SNAPSHOT_FORMAT}-{file_digest(path)[:16]}.parquet")
+
+
+def load_file(path, snapshot_dir=SNAPSHOT_DIR):
+    """read_dataset(path), through the Parquet snapshot of this exact file."""
+    snapshot = snapshot_path(path, snapshot_dir)
+    if os.path.exists(snapshot):
+        return pd.read_parquet(snapshot)
+    df = read_dataset(path)
+    folder = os.path.dirname(snapshot)
+    os.makedirs(folder, exist_ok=True)
+    tmp = snapshot + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, snapshot)
+    # Snapshots of earlier versions of this file are no longer needed
+    for old in glob.glob(os.path.join(glob.escape(folder), "*.parquet")):
+        if old != snapshot:
+            os.remove(old)
+    return df
+
+
+def load_dataset(paths=DATASET_PATH, snapshot_dir=SNAPSHOT_DIR):
+    """One typed frame from one or more survey CSVs (rows in file order)."""
+    if isinstance(paths, str):
+        paths = [paths]
+    frames = [load_file(path, snapshot_dir) for path in paths]
+    if len(frames) == 1:
+        return frames[0]
+    for col in CATEGORICAL:
+        present = [f[col] for f in frames if col in f.columns]
+        if len(present) == len(frames):
+            categories = sorted(set().union(*(s.cat.categories for s in present)))
+            frames = [f.assign(**{col: f[col].cat.set_categories(categories)}) for f in frames]
+    return pd.concat(frames, ignore_index=True)
@@ -1,130 +1,153 @@
-# ===============================
-# Suicide Risk Prediction for Students
-# ===============================
-
-import pandas as pd
-import matplotlib.pyplot as plt
-import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import classification_report, confusion_matrix
-
-# -------------------------------
-# 1. Load dataset
-# -------------------------------
-df = pd.read_csv("Depression Student Dataset.csv")  # change filename to yours
-
-# Preview data
-print(df.head())
-
-# -------------------------------
-# 2. Assign Risk Levels
-# -------------------------------
-def assign_risk(row):
-    if row["Depression"].lower() == "no":
-        return "Low"
-
-    score = 0
-    if row["Suicidal_Thoughts"].lower() == "yes":
-        score += 3
-    if row["Academic_Pressure"] >= 4:
-        score += 1
-    if row["Financial_Stress"] >= 4:
-        score += 1
-    if row["Sleep_Duration"] == "less than 5 hours":
-        score += 2
-    elif row["Sleep_Duration"] == "5 - 6 hours":
-        score += 1
-    if row["Study_Satisfaction"] <= 2:
-        score += 1
-    if row["Family_History_of_Mental_Illness"].lower() == "yes":
-        score += 1
-    if row["Dietary_Habits"].lower() == "unhealthy":
-        score += 1
-    elif row["Dietary_Habits"].lower() == "moderate":
-        score += 0.5
-
-    return "High" if score >= 4 else "Medium"
-
-df["Risk_Level"] = df.apply(assign_risk, axis=1)
-print(df["Risk_Level"].value_counts())
-
-# -------------------------------
-# 3. Encode categorical variables
-# -------------------------------
-categorical_cols = ["Gender", "Sleep_Duration", "Dietary_Habits",
-                    "Suicidal_Thoughts", "Family_History_of_Mental_Illness",
-                    "Depression"]
-
-le = LabelEncoder()
-for col in categorical_cols:
-    df[col] = le.fit_transform(df[col])
-
-# Encode target
-df["Risk_Level"] = df["Risk_Level"].map({"Low": 0, "Medium": 1, "High": 2})
-
-# -------------------------------
-# 4. Features and Target
-# -------------------------------
-X = df[["Gender", "Age", "Academic_Pressure", "Study_Satisfaction",
-        "Sleep_Duration", "Dietary_Habits", "Suicidal_Thoughts",
-        "Study_Hours", "Financial_Stress",
-        "Family_History_of_Mental_Illness", "Depression"]]
-
-y = df["Risk_Level"]
-
-# -------------------------------
-# 5. Train-Test Split
-# -------------------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, stratify=y, random_state=42
-)
-
-# -------------------------------
-# 6. Train Model
-# -------------------------------
-model = RandomForestClassifier(class_weight="balanced", random_state=42)
-model.fit(X_train, y_train)
-
-# -------------------------------
-# 7. Evaluate
-# -------------------------------
-y_pred = model.predict(X_test)
-print("Classification Report:\n")
-print(classification_report(y_test, y_pred))
-print("Confusion Matrix:\n")
-print(confusion_matrix(y_test, y_pred))
-
-# -------------------------------
-# 8. Feature Importance
-# -------------------------------
-importances = model.feature_importances_
-feat_names = X.columns
-
-feat_imp = pd.DataFrame({"Feature": feat_names, "Importance": importances})
-feat_imp = feat_imp.sort_values(by="Importance", ascending=False)
-
-plt.figure(figsize=(8, 5))
-plt.barh(feat_imp["Feature"], feat_imp["Importance"])
-plt.xlabel("Importance")
-plt.title("Feature Importance in Suicide Risk Prediction")
-plt.gca().invert_yaxis()
-plt.show()
-
-# -------------------------------
-# 9. Save Predictions for Dashboard
-# -------------------------------
-results = X_test.copy()
-results["Actual_Risk"] = y_test
-results["Predicted_Risk"] = y_pred
-
-results.to_csv("student_risk_predictions.csv", index=False)
-print("✅ Predictions saved to student_risk_predictions.csv")
-
-# -------------------------------
-# 10. Save Trained Model
-# -------------------------------
-joblib.dump(model, "suicide_risk_model.pkl")
-print("✅ Model saved as suicide_risk_model.pkl")
-
+# ===============================
+# Suicide Risk Prediction for Students
+# ===============================
+
+import argparse
+
+import pandas as pd
+import matplotlib.pyplot as plt
+import joblib
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix, f1_score
+
+from feature_encoding import FeatureEncoder, encoder_path
+from forest_artifact import export_forest, forest_path
+from model_deploy import publish
+from model_search import format_results, search
+from risk_labels import risk_levels
+from student_dataset import DATASET_PATH, load_dataset
+
+# python "suicide risk.py" [--data a.csv b.csv] [--search] [--latency-budget-ms 2] [--workers N]
+parser = argparse.ArgumentParser(description="Train the suicide risk model")
+parser.add_argument("--data", nargs="+", default=[DATASET_PATH],
+                    help="survey CSV(s) to train on, merged in order")
+parser.add_argument("--search", action="store_true",
+                    help="cross-validated search over forest size, depth and class weighting")
+parser.add_argument("--latency-budget-ms", type=float, default=2.0,
+                    help="single-row inference budget used to pick the searched model")
+parser.add_argument("--workers", type=int, default=None,
+                    help="search processes (default: all cores)")
+parser.add_argument("--publish", action="store_true",
+                    help="publish as a new version in models/ for running apps to pick up")
+args = parser.parse_args()
+
+# -------------------------------
+# 1. Load dataset
+# -------------------------------
+# Typed and label-normalized (see student_dataset.py), from a cached
+# Parquet snapshot when the CSV has not changed
+df = load_dataset(args.data)
+
+# Preview data
+print(df.head())
+
+# -------------------------------
+# 2. Assign Risk Levels
+# -------------------------------
+# Rules live in risk_labels.py (vectorized; same labels as the per-row
+# assign_risk there)
+df["Risk_Level"] = risk_levels(df)
+print(df["Risk_Level"].value_counts())
+
+# -------------------------------
+# 3. Encode categorical variables
+# -------------------------------
+# Same codes LabelEncoder assigned (sorted labels), kept in a FeatureEncoder
+# that is saved next to the model and used by the app to encode form answers
+encoder = FeatureEncoder.fit(df)
+
+# Encode target
+df["Risk_Level"] = df["Risk_Level"].map({"Low": 0, "Medium": 1, "High": 2})
+
+# -------------------------------
+# 4. Features and Target
+# -------------------------------
+X = encoder.transform(df)
+
+y = df["Risk_Level"]
+
+# -------------------------------
+# 5. Train-Test Split
+# -------------------------------
+X_train, X_test, y_train, y_test = train_test_split(
+    X, y, test_size=0.3, stratify=y, random_state=42
+)
+
+# -------------------------------
+# 6. Train Model
+# -------------------------------
+params = {"class_weight": "balanced"}
+if args.search:
+    # Fold results are cached in cache/model_search, so reruns resume
+    chosen, search_results = search(X_train, y_train, workers=args.workers,
+                                    latency_budget=args.latency_budget_ms / 1000)
+    print(format_results(search_results, chosen))
+    params = chosen["config"]
+    print(f"Chosen: {params} (macro-F1 {chosen['macro_f1']:.3f}, "
+          f"{chosen['latency_seconds'] * 1e6:.0f}us per row)")
+
+model = RandomForestClassifier(random_state=42, **params)
+model.fit(X_train, y_train)
+
+# -------------------------------
+# 7. Evaluate
+# -------------------------------
+y_pred = model.predict(X_test)
+print("Classification Report:\n")
+print(classification_report(y_test, y_pred))
+print("Confusion Matrix:\n")
+print(confusion_matrix(y_test, y_pred))
+
+# -------------------------------
+# 8. Feature Importance
+# -------------------------------
+importances = model.feature_importances_
+feat_names = X.columns
+
+feat_imp = pd.DataFrame({"Feature": feat_names, "Importance": importances})
+feat_imp = feat_imp.sort_values(by="Importance", ascending=False)
+
+plt.figure(figsize=(8, 5))
+plt.barh(feat_imp["Feature"], feat_imp["Importance"])
+plt.xlabel("Importance")
+plt.title("Feature Importance in Suicide Risk Prediction")
+plt.gca().invert_yaxis()
+plt.show()
+
+# -------------------------------
+# 9. Save Predictions for Dashboard
+# -------------------------------
+results = X_test.copy()
+results["Actual_Risk"] = y_test
+results["Predicted_Risk"] = y_pred
+
+results.to_csv("student_risk_predictions.csv", index=False)
+print("✅ Predictions saved to student_risk_predictions.csv")
+
+# -------------------------------
+# 10. Save Trained Model
+# -------------------------------
+# Encoder first: the app reloads both when the model file changes
+encoder.save(encoder_path("suicide_risk_model.pkl"))
+joblib.dump(model, "suicide_risk_model.pkl")
+print("✅ Model saved as suicide_risk_model.pkl (encoder in suicide_risk_model.encoder.json)")
+
+# Flat, memory-mappable copy the app loads instead of the pickle
+export_forest(model, forest_path("suicide_risk_model.pkl"))
+print("✅ Flat model exported as suicide_risk_model.forest")
+
+# -------------------------------
+# 11. Publish Versioned Model
+# -------------------------------
+if args.publish:
+    # The test split's raw answers become the holdout running apps use to
+    # validate every later version before swapping it in
+    holdout = df.loc[X_test.index, list(encoder.features) + ["Risk_Level"]]
+    version = publish(model, encoder, metrics={
+        "test_macro_f1": round(f1_score(y_test, y_pred, average="macro"), 4),
+        "params": {k: v for k, v in model.get_params().items() if k in ("n_estimators", "max_depth", "class_weight")},
+        "rows": len(df),
+    }, holdout=holdout)
+    print(f"✅ Published model version {version} (models/manifest.json)")
+
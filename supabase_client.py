@@ -0,0 +1,157 @@
+# ================================
+# Supabase (PostgREST) Client
+# ================================
+# One pooled requests.Session per process instead of a bare requests.post /
+# requests.get per call: connections are kept alive and reused, every call
+# is bounded by a (connect, read) timeout, idempotent reads are retried with
+# exponential backoff, and per-endpoint latency is recorded (and, given a
+# Metrics instance, observed as the "supabase" span).
+
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SupabaseError(Exception):
+    def __init__(self, message, status_code=None, code=None):
+        super().__init__(message)
+        self.status_code = status_code
+        # PostgREST/Postgres error code from the response body, e.g. "PGRST204"
+        self.code = code
+
+
+def _error_code(response):
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body.get("code") if isinstance(body, dict) else None
+
+
+class LatencyStats:
+    """Call count, errors and latency for one (method, table) endpoint."""
+
+    def __init__(self, window=500):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds, ok, retries):
+        self.count += 1
+        self.retries += retries
+        if not ok:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": 1000 * self.total_seconds / self.count if self.count else 0.0,
+            "p50_ms": 1000 * self.percentile(0.50),
+            "p95_ms": 1000 * self.percentile(0.95),
+            "max_ms": 1000 * self.max_seconds,
+        }
+
+
+class SupabaseClient:
+    def __init__(self, url, key, timeout=(3.05, 10), retries=3, backoff=0.3, pool_size=10, metrics=None):
+        self.base_url = f"{url.rstrip('/')}/rest/v1"
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+        })
+
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self.metrics = metrics
+
+    def _record(self, method, path, seconds, ok, retries):
+        endpoint = f"{method} {path}"
+        with self._stats_lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = LatencyStats()
+            stats.record(seconds, ok, retries)
+        if self.metrics is not None:
+            self.metrics.observe("supabase", seconds, error=not ok, endpoint=endpoint)
+
+    def request(self, method, path, params=None, body=None, headers=None, idempotent=None):
+        """Send one PostgREST request and return the response.
+
+        Reads (GET/HEAD) are retried on connection errors, timeouts and 5xx/429
+        responses; writes are sent exactly once. Every failure, including a
+        connection dropped mid-response, is raised as SupabaseError.
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        attempts = 1 + (self.retries if idempotent else 0)
+        data = json.dumps(body) if body is not None else None
+
+        start = time.perf_counter()
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(
+                    method, f"{self.base_url}/{path}", params=params, data=data,
+                    headers=headers, timeout=self.timeout,
+                )
+            except requests.RequestException as e:
+                if last_attempt:
+                    self._record(method, path, time.perf_counter() - start, False, attempt)
+                    raise SupabaseError(f"{method} {path} failed: {e}") from e
+            else:
+                if response.status_code in RETRY_STATUSES and not last_attempt:
+                    response.close()
+                else:
+                    ok = response.status_code < 400
+                    self._record(method, path, time.perf_counter() - start, ok, attempt)
+                    if not ok:
+                        raise SupabaseError(response.text, response.status_code, _error_code(response))
+                    return response
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def select(self, table, params=None, headers=None):
+        params = dict(params or {})
+        params.setdefault("select", "*")
+        return self.request("GET", table, params=params, headers=headers).json()
+
+    def insert(self, table, rows, prefer="return=minimal", on_conflict=None):
+        """Insert one record (dict) or many (list, sent as one bulk insert)."""
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        return self.request("POST", table, params=params, body=rows, headers={"Prefer": prefer})
+
+    def rpc(self, function, args=None, read_only=True):
+        """Call a Postgres function exposed by PostgREST."""
+        return self.request("POST", f"rpc/{function}", body=args or {}, idempotent=read_only).json()
+
+    def stats(self):
+        with self._stats_lock:
+            return {endpoint: stats.as_dict() for endpoint, stats in self._stats.items()}
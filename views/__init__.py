@@ -0,0 +1,6 @@
+# ================================
+# App Pages
+# ================================
+# One module per page, each with a render() function. app.py imports a page
+# module the first time that page is shown, so the dependencies of the other
+# pages (pandas, plotly, requests, pytz) are never loaded for it.
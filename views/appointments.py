@@ -0,0 +1,52 @@
+# ================================
+# Step 5: View My Appointments (Users)
+# ================================
+import pandas as pd
+import streamlit as st
+
+from appointment_store import HIDDEN_COLUMNS as HIDDEN_APPOINTMENT_COLUMNS
+from resources import get_appointment_store
+from supabase_client import SupabaseError
+from views.common import back_to_mainpage
+
+
+def fetch_appointments(name):
+    try:
+        return get_appointment_store().lookup(name)
+    except SupabaseError as e:
+        st.error(f"Error fetching appointments: {e}")
+        return []
+
+
+def render():
+    st.header("📅 My Appointments")
+
+    user_name = st.text_input("Enter your Name (as used during booking):")
+
+    if st.button("Check"):
+        if not user_name.strip():
+            st.warning("⚠️ Please enter your name before checking.")
+        else:
+            try:
+                df_appointments = pd.DataFrame(fetch_appointments(user_name) or [])
+
+                if df_appointments.empty:
+                    st.warning("❌ No appointments found under this name.")
+                else:
+                    st.subheader("📋 Your Appointment(s)")
+
+                    # Drop internal columns ('id', 'timestamp', keys) if they exist
+                    for col in HIDDEN_APPOINTMENT_COLUMNS:
+                        if col in df_appointments.columns:
+                            df_appointments = df_appointments.drop(columns=[col])
+
+                    # Reset index starting from 1
+                    df_appointments.index = df_appointments.index + 1
+
+                    st.dataframe(df_appointments, use_container_width=True)
+
+            except Exception as e:
+                st.error(f"Unexpected error fetching appointments: {e}")
+
+    if st.button("⬅ Back to Main Page"):
+        back_to_mainpage()
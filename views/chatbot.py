@@ -0,0 +1,32 @@
+# ================================
+# Step 4A: AI Consultant Chatbot
+# ================================
+import streamlit as st
+
+from views.common import back_to_mainpage, back_to_result
+
+
+def render():
+    st.header("🤖 AI Consultant")
+
+    st.markdown(
+        """
+        <a href="https://mental-health-chatbot-2zpe.onrender.com/" target="_blank">
+            <button style="padding:10px 20px; font-size:16px; border-radius:8px; background:#008080; color:white; border:none;">
+                🚀 Open AI Consultant Chatbot
+            </button>
+        </a>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("###")  # creates vertical space
+
+    # Navigation buttons
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("⬅ Back to Results"):
+            back_to_result()
+    with col2:
+        if st.button("🏠 Back to Main Page"):
+            back_to_mainpage()
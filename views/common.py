@@ -0,0 +1,95 @@
+# ================================
+# Shared Page Helpers
+# ================================
+import streamlit as st
+
+# Injected once per rerun by app.py; built here once per process
+CUSTOM_CSS = """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Open+Sans&display=swap');
+
+    .stApp {
+        background-color: var(--background-color);
+        color: var(--text-color);
+        font-family: 'Open Sans', sans-serif;
+    }
+
+    html, body, [class*="css"] {
+        font-family: 'Open Sans', sans-serif;
+        color: var(--text-color);
+    }
+
+    h1, h2, h3, h4 {
+        color: #008080 !important;
+        font-weight: 700;
+    }
+
+    .subtitle {
+        color: #56A1A4 !important;
+        text-align: center;
+        font-style: italic;
+        font-size: 16px;
+    }
+
+    .stButton > button {
+        background-color: #008080;
+        color: #FFFFFF;
+        border-radius: 10px;
+        border: none;
+        font-weight: bold;
+        padding: 0.5em 1em;
+        margin: 0.3em;
+        width: 100%;
+    }
+
+    .stButton > button:hover {
+        background-color: #006666;
+        color: #FFFFFF;
+        transform: scale(1.02);
+        cursor: pointer;
+    }
+
+    .step-tracker {
+        color: #008080;              
+        text-align: center;
+        font-size: 18px;
+        margin-bottom: 20px;
+    }
+
+    .current-step {
+        font-weight: bold;
+        color: #008080;
+    }
+    </style>
+    """
+
+STEPS = ["1️⃣ Introduction", "2️⃣ Assessment", "3️⃣ Result"]
+STEP_NAMES = ["intro", "predictor", "result"]
+
+
+def back_to_result():
+    st.session_state.solution = None
+    st.session_state.step = "result"
+
+def back_to_intro():
+    st.session_state.solution = None
+    st.session_state.step = "intro"
+
+def back_to_mainpage():
+    st.session_state.step = "intro"
+    st.session_state.solution = None
+
+def show_step_tracker():
+    current = st.session_state.step
+    display = ""
+
+    for step, step_name in zip(STEP_NAMES, STEPS):
+        if current == step:
+            display += f"<span class='current-step'>{step_name}</span> → "
+        else:
+            display += f"{step_name} → "
+
+    st.markdown(
+        f"<p class='step-tracker'>{display.rstrip(' → ')}</p>",
+        unsafe_allow_html=True
+    )
@@ -0,0 +1,175 @@
+# ================================
+# 📊 Staff Dashboard
+# ================================
+import pandas as pd
+import streamlit as st
+
+from dashboard_data import SORTABLE_COLUMNS
+from resources import (get_chart_cache, get_metrics, get_metrics_endpoint, get_model_registry,
+                       get_prediction_cache, get_record_writer, get_records_table, get_risk_trends,
+                       get_supabase, get_trend_charts)
+from views.common import back_to_mainpage
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+GENDERS = ["Male", "Female"]
+PAGE_SIZE = 50
+TREND_PERIODS = {"Daily": "D", "Weekly": "W"}
+
+
+def turn_page(step):
+    # A callback runs before the rerun, while the Page box can still be set
+    st.session_state.records_page += step
+    st.session_state.records_nav["step"] = step
+
+
+def render():
+    st.header("📊 Staff Dashboard")
+
+    # Always show login form first
+    if "dashboard_logged_in" not in st.session_state or st.session_state.dashboard_logged_in is False:
+        password = st.text_input("Enter Staff Password:", type="password")
+        if st.button("Login"):
+            if password == "tellmewai":
+                st.session_state.dashboard_logged_in = True
+            else:
+                st.error("❌ Incorrect password")
+    else:
+        metrics = get_metrics()
+        try:
+            refresh = st.button("🔄 Refresh Charts")
+            with metrics.span("chart_figures"):
+                data_version, figures = get_chart_cache().figures(refresh=refresh)
+
+            if not data_version[0]:
+                st.warning("No user records found.")
+            else:
+                # Records table: filtered, sorted and paged by Supabase, so only
+                # the visible rows are transferred
+                st.subheader("📋 User Records")
+                fcol1, fcol2, fcol3 = st.columns(3)
+                risk_filter = fcol1.multiselect("Risk Level", RISK_LEVELS)
+                gender_filter = fcol2.multiselect("Gender", GENDERS)
+                date_range = fcol3.date_input("Date Range", value=())
+
+                scol1, scol2, scol3 = st.columns(3)
+                sort_by = scol1.selectbox("Sort by", SORTABLE_COLUMNS)
+                descending = scol2.checkbox("Descending", value=True)
+
+                # Previous/Next continue from the rows shown last (keyset paging);
+                # any other page change starts from an offset, and new filters
+                # or sort order from page 1
+                query = (tuple(risk_filter), tuple(gender_filter), tuple(date_range), sort_by, descending)
+                nav = st.session_state.get("records_nav")
+                if nav is None or nav["query"] != query:
+                    nav = st.session_state.records_nav = {"query": query, "page": None, "keys": None, "step": 0}
+                    st.session_state.records_page = 1
+                # Set through session state only, since turn_page changes it
+                st.session_state.setdefault("records_page", 1)
+                page = int(scol3.number_input("Page", min_value=1, step=1, key="records_page"))
+                keys = nav["keys"] if nav["step"] and page == (nav["page"] or 0) + nav["step"] else None
+
+                with metrics.span("records_page"):
+                    records, total, nav["keys"] = get_records_table().page(
+                        page=page,
+                        page_size=PAGE_SIZE,
+                        after=keys[1] if keys and nav["step"] > 0 else None,
+                        before=keys[0] if keys and nav["step"] < 0 else None,
+                        data_version=data_version,
+                        risk=risk_filter,
+                        gender=gender_filter,
+                        date_from=date_range[0] if len(date_range) > 0 else None,
+                        date_to=date_range[1] if len(date_range) > 1 else None,
+                        sort_by=sort_by,
+                        descending=descending,
+                    )
+                if records.empty:
+                    st.info("No records match these filters on this page.")
+                else:
+                    st.dataframe(records, use_container_width=True)
+                    pages = -(-total // PAGE_SIZE) if total is not None else "?"
+                    st.caption(f"Rows {records.index[0]}–{records.index[-1]} of {total} (page {page} of {pages})")
+                nav.update(page=page, step=0)
+                pcol1, pcol2 = st.columns(2)
+                pcol1.button("◀ Previous", on_click=turn_page, args=(-1,), disabled=page <= 1)
+                pcol2.button("Next ▶", on_click=turn_page, args=(1,),
+                             disabled=len(records) < PAGE_SIZE or (total is not None and page * PAGE_SIZE >= total))
+
+                # Charts: built from server-side counts, cached per data version
+                # and shared by all staff sessions
+                with metrics.span("chart_render"):
+                    if "risk" in figures:
+                        st.plotly_chart(figures["risk"], use_container_width=True)
+
+                    col1, col2 = st.columns(2)
+                    if "gender" in figures: col1.plotly_chart(figures["gender"], use_container_width=True)
+                    if "pressure_risk" in figures: col2.plotly_chart(figures["pressure_risk"], use_container_width=True)
+
+                    col3, col4 = st.columns(2)
+                    if "depression" in figures: col3.plotly_chart(figures["depression"], use_container_width=True)
+                    if "suicidal_thoughts" in figures: col4.plotly_chart(figures["suicidal_thoughts"], use_container_width=True)
+
+                st.caption(f"📈 Charts for {data_version[0]} records (latest {data_version[1] or 'n/a'})")
+
+                # Trends: per-day totals kept up to date with only the new
+                # records, shared by all staff sessions
+                st.subheader("📈 Risk Trends")
+                period = st.radio("Period", list(TREND_PERIODS), horizontal=True)
+                with metrics.span("risk_trends"):
+                    trends = get_risk_trends()
+                    table, trend_figures = get_trend_charts().figures(TREND_PERIODS[period], refresh=refresh)
+                    alert = trends.alert()
+                if alert:
+                    st.error(f"🚨 High risk share {alert['share']:.0%} of {alert['records']} assessments "
+                             f"on {alert['start']}" + (f" to {alert['end']}" if alert['end'] != alert['start'] else "")
+                             + f", up from {alert['baseline_share']:.0%} over the {trends.baseline_days} days before")
+                if not trend_figures:
+                    st.info("No dated records yet.")
+                else:
+                    st.plotly_chart(trend_figures["risk_counts"], use_container_width=True)
+                    col5, col6 = st.columns(2)
+                    col5.plotly_chart(trend_figures["high_share"], use_container_width=True)
+                    col6.plotly_chart(trend_figures["short_sleep"], use_container_width=True)
+                    st.plotly_chart(trend_figures["factors"], use_container_width=True)
+                    unit = "day" if period == "Daily" else "week"
+                    st.caption(f"🗓️ {len(table)} {unit}{'s' if len(table) != 1 else ''} "
+                               f"from {trends.stats()['rows']} records")
+
+        except Exception as e:
+            st.error(f"Unexpected error: {e}")
+
+        # Model load stats for this server process
+        model_stats = get_model_registry().stats()
+        if model_stats["loaded"]:
+            memory_mb = (model_stats["memory_bytes"] or 0) / 1e6
+            st.caption(f"🧠 Model {get_model_registry().get().version_id} loaded in {model_stats['load_seconds']:.2f}s "
+                       f"(~{memory_mb:.1f} MB, {model_stats['load_count']} load(s) in this process)")
+        if model_stats.get("last_error"):
+            st.caption(f"⚠️ Model update not deployed: {model_stats['last_error']}")
+        cache_stats = get_prediction_cache().stats()
+        st.caption(f"⚡ Prediction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                   f"{cache_stats['evictions']} evictions ({cache_stats['hit_rate']:.0%} hit rate)")
+        with st.expander("⏱️ Supabase call latency"):
+            st.dataframe(pd.DataFrame(get_supabase().stats()).T, use_container_width=True)
+            writer_stats = get_record_writer().stats()
+            st.caption(f"📝 Write spool: {writer_stats['pending']} pending "
+                       f"(oldest {writer_stats['oldest_pending_seconds']:.0f}s, "
+                       f"last lag {writer_stats['last_lag_seconds']:.1f}s), {writer_stats['sent']} sent "
+                       f"in {writer_stats['batches']} batches, {writer_stats['dead']} rejected")
+        with st.expander("⏱️ Hot path timings (this server process)"):
+            rows = [{
+                "step": entry["span"] + "".join(f" {k}={v}" for k, v in entry["labels"].items()),
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "mean_ms": 1000 * entry["mean"],
+                "p50_ms ≤": 1000 * entry["p50"],
+                "p99_ms ≤": 1000 * entry["p99"],
+            } for entry in metrics.summary()]
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
+            endpoint, error = get_metrics_endpoint()
+            if endpoint:
+                st.caption(f"📡 Prometheus metrics at {endpoint}")
+            elif error:
+                st.caption(f"⚠️ {error}")
+
+    if st.button("⬅ Logout"):
+        back_to_mainpage()
@@ -0,0 +1,68 @@
+# ================================
+# Step 1: Introduction Page
+# ================================
+import io
+
+import streamlit as st
+from PIL import Image
+
+from views.common import show_step_tracker
+
+LOGO_PATH = "Tell Me WAI logo.png"
+LOGO_WIDTH = 300
+
+
+def _logo_png(path, width):
+    # The same bilinear resize st.image would otherwise redo on every rerun;
+    # an image already at the display width is sent through untouched
+    image = Image.open(path)
+    height = int(1.0 * image.height * width / image.width)
+    buffer = io.BytesIO()
+    image.resize((width, height), resample=Image.BILINEAR).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+LOGO_PNG = _logo_png(LOGO_PATH, LOGO_WIDTH)
+
+
+def render():
+    show_step_tracker()
+    st.markdown(
+        "<h2 style='text-align: center; color: #008080;'>Tell Me WAI: Your Personal AI Mental Wellness Companion</h2>",
+        unsafe_allow_html=True)
+
+    # Introductory description
+    st.markdown(
+        """
+        <div style='text-align: justify; font-size: 14px; color: #008080; font-style: italic;'>
+        <b>Tell Me WAI</b> is a personalized AI-powered mental wellness companion 
+        designed to help students and individuals reflect on their emotional well-being. 
+        It provides a quick <b>screening</b> based on lifestyle and mental health indicators, 
+        and connects users to supportive resources such as music therapy, AI consultation, 
+        and teleconsultation with professionals.  
+        <br><br>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Add disclaimer
+    st.markdown(
+        "<p style='text-align: center; color: #FF0000; font-weight: bold;'>"
+        "⚠️ Disclaimer: This tool is for educational and informational purposes only. "
+        "It is not a medical diagnostic tool and cannot replace professional mental health advice.</p>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.image(LOGO_PNG, width=LOGO_WIDTH)
+
+    if st.button("Start"):
+        st.session_state.step = "predictor"
+
+    if st.button("📋 View My Appointments"):
+        st.session_state.step = "appointments"
+
+    if st.button("📊 Staff Dashboard"):
+        st.session_state.step = "dashboard"
@@ -0,0 +1,71 @@
+# ================================
+# Step 4B: Music Therapy
+# ================================
+import streamlit as st
+
+from resources import get_metrics, get_youtube_search
+from views.common import back_to_mainpage, back_to_result
+
+# Mood keywords for dynamic YouTube search ("Stress" first, as the default)
+MOOD_SEARCH_TERMS = {
+    "Stress": ["stress relief music", "nature sounds", "ambient calm music"],
+    "Sad": ["uplifting music", "happy songs", "songs to feel better"],
+    "Anxious": ["calm instrumental", "relaxing piano", "meditation music"],
+    "Low Energy": ["energetic songs playlist", "motivational music", "pop upbeat"]
+}
+MOOD_OPTIONS = list(MOOD_SEARCH_TERMS)
+
+
+def render():
+    st.header("🎵 Music Therapy")
+    st.markdown(
+        "<p class='subtitle'>Select how you're feeling right now and we'll recommend calming songs for you 💆‍♀️✨</p>",
+        unsafe_allow_html=True
+    )
+
+    mood = st.selectbox("💙 How are you feeling?", MOOD_OPTIONS, index=0)
+
+    if mood:
+        # initialize playlist_index for mood
+        if mood not in st.session_state.playlist_index:
+            st.session_state.playlist_index[mood] = 0
+
+        # pick a search term (rotate)
+        search_terms = MOOD_SEARCH_TERMS[mood]
+        term_index = st.session_state.playlist_index[mood] % len(search_terms)
+        search_query = search_terms[term_index]
+
+        # fetch videos (cached per query and shared by all sessions)
+        youtube = get_youtube_search()
+        with get_metrics().span("youtube_search"):
+            videos = youtube.search(search_query, max_results=10)
+
+        # warm the cache for the next refresh and for the other moods
+        next_queries = [search_terms[(term_index + 1) % len(search_terms)]]
+        for other_mood, other_terms in MOOD_SEARCH_TERMS.items():
+            if other_mood != mood:
+                other_index = st.session_state.playlist_index.get(other_mood, 0)
+                next_queries.append(other_terms[other_index % len(other_terms)])
+        youtube.prefetch(next_queries, max_results=10)
+
+        if videos:
+            # rotate through videos
+            video_index = st.session_state.playlist_index[mood] % len(videos)
+            video_url = videos[video_index]
+            st.video(video_url)
+        else:
+            st.warning("⚠️ No playable video found for this mood right now. Please try again or refresh the playlist.")
+
+        # Refresh button rotates search term or video
+        if st.button("🔄 Refresh Playlist"):
+            st.session_state.playlist_index[mood] += 1
+            st.rerun()
+
+    # Back buttons
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("⬅ Back to Results"):
+            back_to_result()
+    with col2:
+        if st.button("🏠 Back to Main Page"):
+            back_to_mainpage()
@@ -0,0 +1,89 @@
+# ================================
+# Step 2: Predictor Page
+# ================================
+import sqlite3
+from datetime import datetime
+
+import streamlit as st
+
+from resources import get_metrics, get_model_registry, get_prediction_cache, get_record_writer
+from views.common import show_step_tracker
+
+GENDERS = ["Male", "Female"]
+SLEEP_DURATIONS = ["less than 5 hours", "5 - 6 hours", "7 - 8 hours", "more than 8 hours"]
+DIETARY_HABITS = ["unhealthy", "moderate", "healthy"]
+YES_NO = ["yes", "no"]
+RISK_MAP = {0: "Low", 1: "Medium", 2: "High"}
+
+
+def insert_user_record(record):
+    try:
+        get_record_writer().submit("user_records", record)
+    except sqlite3.Error as e:
+        st.error(f"Error saving record: {e}")
+    else:
+        st.success("✅ Your assessment has been saved successfully!")
+
+
+def render():
+    show_step_tracker()
+    st.header("🌱 How are things going for you right now?")
+
+    gender = st.selectbox("Gender", GENDERS)
+    age = st.number_input("Age", min_value=10, max_value=100, value=20)
+    academic_pressure = st.slider("Academic Pressure (1-5)", 1, 5, 3)
+    study_satisfaction = st.slider("Study Satisfaction (1-5)", 1, 5, 3)
+    sleep_duration = st.selectbox("Sleep Duration", SLEEP_DURATIONS)
+    dietary_habits = st.selectbox("Dietary Habits", DIETARY_HABITS)
+    suicidal_thoughts = st.selectbox("Suicidal Thoughts", YES_NO)
+    study_hours = st.number_input("Study Hours per Day", min_value=0, max_value=24, value=5)
+    financial_stress = st.slider("Financial Stress (1-5)", 1, 5, 3)
+    family_history = st.selectbox("Family History of Mental Illness", YES_NO)
+    depression = st.selectbox("Depression", YES_NO)
+
+    if st.button("Submit"):
+        # 1️⃣ Encode with the encoder saved alongside the model and predict
+        metrics = get_metrics()
+        with metrics.span("model_get"):
+            loaded = get_model_registry().get()
+        row = loaded.encoder.encode_row({
+            "Gender": gender,
+            "Age": age,
+            "Academic_Pressure": academic_pressure,
+            "Study_Satisfaction": study_satisfaction,
+            "Sleep_Duration": sleep_duration,
+            "Dietary_Habits": dietary_habits,
+            "Suicidal_Thoughts": suicidal_thoughts,
+            "Study_Hours": study_hours,
+            "Financial_Stress": financial_stress,
+            "Family_History_of_Mental_Illness": family_history,
+            "Depression": depression
+        })
+        def predict():
+            with metrics.span("predict"):
+                return int(loaded.predictor.predict(row[None, :])[0])
+
+        prediction = get_prediction_cache().get_or_compute(tuple(row.tolist()), loaded.version, predict)
+        st.session_state.risk = RISK_MAP[prediction]
+        metrics.inc("assessments", risk=st.session_state.risk)
+        st.session_state.step = "result"
+
+        # 2️⃣ Raw answers in lowercase Supabase columns
+        record = {
+            "gender": gender,
+            "age": int(age),
+            "academic_pressure": int(academic_pressure),
+            "study_satisfaction": int(study_satisfaction),
+            "sleep_duration": sleep_duration,
+            "dietary_habits": dietary_habits,
+            "suicidal_thoughts": suicidal_thoughts,
+            "study_hours": int(study_hours),
+            "financial_stress": int(financial_stress),
+            "family_history": family_history,
+            "depression": depression,
+            "predicted_risk": st.session_state.risk,
+            "model_version": loaded.version_id,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        insert_user_record(record)
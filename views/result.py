@@ -0,0 +1,23 @@
+# ================================
+# Step 3: Result Page
+# ================================
+import streamlit as st
+
+from views.common import back_to_mainpage, show_step_tracker
+
+
+def render():
+    show_step_tracker()
+    risk = st.session_state.risk
+    if risk == "Low":
+        st.success("🟢 You seem to be doing well right now. Keep taking care of yourself 💚")
+    elif risk == "Medium":
+        st.info("🟤 You may be under some stress. Small steps can really help 💛")
+    elif risk == "High":
+        st.error("🔴 You may need extra support. Reaching out is a brave step ❤️")
+
+    st.markdown("<p class='subtitle'>💙 It's okay to ask for help. Here are some solutions you can explore:</p>", unsafe_allow_html=True)
+    if st.button("🎵 Music Therapy"): st.session_state.solution = "playlist"
+    if st.button("🤖 AI Consultant"): st.session_state.solution = "chatbot"
+    if st.button("📅 Teleconsultant"): st.session_state.solution = "teleconsult"
+    if st.button("⬅ Back to Main Page"): back_to_mainpage()
@@ -0,0 +1,74 @@
+# ================================
+# Step 4C: Teleconsultant Booking
+# ================================
+import sqlite3
+from datetime import datetime
+
+import pytz
+import streamlit as st
+
+from resources import get_appointment_store, get_metrics
+from slot_index import SlotConflict
+from supabase_client import SupabaseError
+from views.common import back_to_mainpage, back_to_result
+
+MALAYSIA_TZ = pytz.timezone("Asia/Kuala_Lumpur")
+
+
+def insert_appointment(record):
+    store = get_appointment_store()
+    metrics = get_metrics()
+    try:
+        with metrics.span("sync_slots"):
+            store.sync_slots()
+    except SupabaseError as e:
+        # Still check against the slots already indexed
+        st.warning(f"Could not refresh booked slots: {e}")
+    try:
+        store.book(record)
+    except SlotConflict as e:
+        metrics.inc("bookings", result="conflict")
+        st.error(f"❌ {e}. Please choose another time.")
+        if e.suggestions:
+            st.info("Next available slots: " + ", ".join(
+                f"{day:%d %b} {start:%H:%M}" for day, start in e.suggestions))
+        return False
+    except sqlite3.Error as e:
+        metrics.inc("bookings", result="error")
+        st.error(f"Error booking appointment: {e}")
+        return False
+    metrics.inc("bookings", result="booked")
+    return True
+
+
+def render():
+    st.header("📅 Book a Teleconsultation")
+
+    # Input fields
+    name = st.text_input("Your Name")
+    contact_number = st.text_input("Your Contact Number")
+    email = st.text_input("Email Address")
+    date = st.date_input("Preferred Date", min_value=datetime.today())
+    time = st.time_input("Preferred Time")
+
+    if st.button("Book Appointment"):
+        if name and email:
+            timestamp_malaysia = datetime.now(MALAYSIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+            # Prepare record for Supabase
+            appointment_record = {
+                "name": name,
+                "contact_number": contact_number,
+                "email": email,
+                "date": str(date),
+                "time": str(time),
+                "timestamp": timestamp_malaysia
+            }
+
+            # Insert into Supabase
+            if insert_appointment(appointment_record):
+                st.success(f"✅ Appointment booked for {name} on {date} at {time}. "
+                       f"You will also be notified via WhatsApp for reconfirmation 📲.")
+
+    if st.button("⬅ Back to Results"): back_to_result()
+    if st.button("🏠 Back to Main Page"): back_to_mainpage()
@@ -0,0 +1,145 @@
+# ================================
+# YouTube Search with Caching
+# ================================
+# Music Therapy only ever searches a dozen fixed mood queries, so results are
+# kept in a process-wide TTL + LRU cache keyed by query. The playlist page
+# also prefetches the queries a user is likely to need next on a small
+# thread pool, so switching moods or refreshing is served from memory. When
+# the API fails (quota exhausted, network error) the last known results are
+# served even if they are past their TTL.
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+
+# After a quotaExceeded answer, don't call the API again for this long
+QUOTA_BACKOFF_SECONDS = 600
+
+
+class YouTubeSearch:
+    def __init__(self, api_key, ttl=6 * 3600, maxsize=64, timeout=(3.05, 5),
+                 search_url=SEARCH_URL, workers=2, metrics=None):
+        self.api_key = api_key
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.search_url = search_url
+        self.session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="youtube-prefetch")
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (fetched_at, videos)
+        self._inflight = {}             # key -> Future
+        self._quota_blocked_until = 0.0
+        self.metrics = metrics
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.api_calls = 0
+        self.api_errors = 0
+        self.prefetches = 0
+
+    def _fetch(self, query, max_results):
+        if time.monotonic() < self._quota_blocked_until:
+            raise RuntimeError("YouTube API quota exhausted")
+        self.api_calls += 1
+        response = self.session.get(self.search_url, params={
+            "part": "snippet",
+            "maxResults": max_results,
+            "q": query,
+            "type": "video",
+            "key": self.api_key,
+        }, timeout=self.timeout)
+        if response.status_code != 200:
+            if response.status_code == 403 and "quotaExceeded" in response.text:
+                self._quota_blocked_until = time.monotonic() + QUOTA_BACKOFF_SECONDS
+            raise RuntimeError(f"YouTube search failed ({response.status_code})")
+
+        videos = []
+        for item in response.json().get("items", []):
+            vid_id = item.get("id", {}).get("videoId")
+            if vid_id:
+                videos.append(f"https://www.youtube.com/watch?v={vid_id}")
+        return videos
+
+    def _refresh(self, key):
+        """Fetch key from the API and store it; keep stale results on failure."""
+        start = time.perf_counter()
+        try:
+            videos = self._fetch(*key)
+        except (requests.RequestException, RuntimeError, ValueError):
+            self.api_errors += 1
+            self._observe(start, error=True)
+            with self._lock:
+                entry = self._entries.get(key)
+            return entry[1] if entry else None
+        else:
+            self._observe(start, error=False)
+            with self._lock:
+                self._entries[key] = (time.monotonic(), videos)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return videos
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _observe(self, start, error):
+        if self.metrics is not None:
+            self.metrics.observe("youtube_api", time.perf_counter() - start, error=error)
+
+    def _fresh(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def search(self, query, max_results=10):
+        """Video URLs for query, from the cache when fresh."""
+        key = (query, max_results)
+        with self._lock:
+            if self._fresh(key):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][1]
+            self.misses += 1
+            future = self._inflight.get(key)
+            stale = self._entries.get(key)
+
+        if future is not None:
+            # A prefetch for this query is already running; wait for it
+            videos = future.result()
+        else:
+            videos = self._refresh(key)
+
+        if videos is None:
+            return []
+        if stale is not None and videos is stale[1] and not self._fresh(key):
+            self.stale_served += 1
+        return videos
+
+    def prefetch(self, queries, max_results=10):
+        """Warm the cache for queries in the background."""
+        for query in queries:
+            key = (query, max_results)
+            with self._lock:
+                if self._fresh(key) or key in self._inflight:
+                    continue
+                self.prefetches += 1
+                self._inflight[key] = self._executor.submit(self._refresh, key)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "api_calls": self.api_calls,
+            "api_errors": self.api_errors,
+            "prefetches": self.prefetches,
+            "quota_blocked": time.monotonic() < self._quota_blocked_until,
+        }